@@ -0,0 +1,54 @@
+"""Run idle script control servers in a child process so benchmarks measure real cross-process gRPC."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import tempfile
+from typing import Iterator, List
+
+from puppemon_py_script import ScriptServicer, start_server
+from puppemon_py_script.pausable import PausableController
+
+
+def _serve(addresses: List[str], targets: "mp.Queue", stop: "mp.Event") -> None:
+    async def _main():
+        idle = asyncio.create_task(asyncio.Event().wait())
+        servers = []
+        for address in addresses:
+            servicer = ScriptServicer(PausableController(), idle, None, kill_on_stop=False)
+            server, port = await start_server(servicer, address)
+            targets.put(address if address.startswith("unix:") else f"127.0.0.1:{port}")
+            servers.append(server)
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        await asyncio.gather(*(s.stop(0) for s in servers))
+
+    # Keep the servicer's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_main())
+
+
+@contextlib.contextmanager
+def idle_servers(n_servers: int, unix: bool = False) -> Iterator[List[str]]:
+    """Start `n_servers` control servers (no user tasks) in one child process and yield their targets.
+
+    With `unix=True` the servers listen on Unix domain sockets in a temporary directory instead of TCP.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if unix:
+            addresses = [f"unix:{os.path.join(tmp, f'script-{i}.sock')}" for i in range(n_servers)]
+        else:
+            addresses = ["127.0.0.1:0"] * n_servers
+        targets: mp.Queue = mp.Queue()
+        stop = mp.Event()
+        proc = mp.Process(target=_serve, args=(addresses, targets, stop), daemon=True)
+        proc.start()
+        try:
+            yield [targets.get(timeout=30) for _ in range(n_servers)]
+        finally:
+            stop.set()
+            proc.join(timeout=10)
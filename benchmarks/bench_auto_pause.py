@@ -0,0 +1,123 @@
+"""Overhead per await of automatic pause points (`pause_points`) against manual `maybe_pause()` calls.
+
+One task runs `--awaits` awaits of a step, no pause pending, as:
+
+* `none`: the bare awaits, no pause point (the baseline)
+* `coarse`: one manual `maybe_pause()` per 10 awaits, like a pause point after a sequence of moves
+* `manual`: a manual `maybe_pause()` before every await
+* `auto`: the same loop decorated with `@p.pause_points`, every await a pause point
+* `auto-interval`: `@p.pause_points(min_interval=--min-interval)`
+
+Steps are `coro` (a coroutine that returns at once, the worst case for relative overhead) or `sleep0`
+(`asyncio.sleep(0)`, one round trip through the event loop). `--journal-hits` journals every pause point,
+which is where `min_interval` pays off.
+
+```bash
+uv run python benchmarks/bench_auto_pause.py --awaits 200000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from _stats import write_results
+from puppemon_py_script.journal import EventJournal
+from puppemon_py_script.pausable import Pausable, PausableController
+
+MODES = ("none", "coarse", "manual", "auto", "auto-interval")
+
+
+async def _coro_step() -> int:
+    return 1
+
+
+def _sleep0_step():
+    return asyncio.sleep(0)
+
+
+async def _run(
+    mode: str, step_kind: str, awaits: int, min_interval: float, journal: Optional[EventJournal]
+) -> Dict[str, Any]:
+    controller = PausableController()
+    controller.attach_journal(journal, record_hits=journal is not None)
+    step = _coro_step if step_kind == "coro" else _sleep0_step
+    with Pausable.use_controller(controller):
+        p = Pausable(name="bench")
+
+    async def bare():
+        for _ in range(awaits):
+            await step()
+
+    async def coarse():
+        for _ in range(awaits // 10):
+            for _ in range(10):
+                await step()
+            await p.maybe_pause()
+
+    async def manual():
+        for _ in range(awaits):
+            await p.maybe_pause()
+            await step()
+
+    runs = {
+        "none": bare,
+        "coarse": coarse,
+        "manual": manual,
+        "auto": p.pause_points(bare),
+        "auto-interval": p.pause_points(bare, min_interval=min_interval),
+    }
+    t0 = time.perf_counter_ns()
+    await runs[mode]()
+    elapsed = time.perf_counter_ns() - t0
+    hits = p._record.hits
+    p.close()
+    return {"ns_per_await": elapsed / awaits, "pause_points": hits}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--awaits", type=int, default=200_000, help="Awaits per run")
+    parser.add_argument("--steps", nargs="+", default=["coro", "sleep0"], choices=("coro", "sleep0"))
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--min-interval", type=float, default=0.001, help="Seconds, for auto-interval")
+    parser.add_argument("--journal-hits", action="store_true", help="Journal every pause point")
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of repetitions")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = EventJournal(os.path.join(tmp, "bench.journal")) if args.journal_hits else None
+        print(f"{'step':>6} {'mode':>14} {'ns/await':>9} {'overhead':>9} {'pause points':>13}")
+        for step_kind in args.steps:
+            baseline = None
+            for mode in args.modes:
+                best = min(
+                    (
+                        asyncio.run(_run(mode, step_kind, args.awaits, args.min_interval, journal))
+                        for _ in range(args.repeat)
+                    ),
+                    key=lambda r: r["ns_per_await"],
+                )
+                if baseline is None:
+                    baseline = best["ns_per_await"]
+                overhead = best["ns_per_await"] - baseline
+                rows.append({"step": step_kind, "mode": mode, "overhead_ns": overhead, **best})
+                print(
+                    f"{step_kind:>6} {mode:>14} {best['ns_per_await']:>9.0f} {overhead:>+9.0f}"
+                    f" {best['pause_points']:>13}"
+                )
+        if journal is not None:
+            journal.close()
+    if args.output:
+        write_results(args.output, "auto_pause", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
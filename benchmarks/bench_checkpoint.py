@@ -0,0 +1,105 @@
+"""Cost per pause point of `await p.checkpoint(state)` against a plain `await p.maybe_pause()`.
+
+One task runs `--calls` pause points back to back, each a checkpoint of a state of the given kind:
+
+* `int`: a step counter, pickled
+* `dict`: a small dict of a dozen fields, pickled
+* `bytes`: a raw `--bytes` byte buffer, written as is
+
+Modes: `maybe_pause` (no checkpoint, the baseline), `memory` (`persist="pause"`: the state is only kept until
+the task parks), `log` (`persist="pause_point"`: one append per pause point) and `fsync` (`log` plus an fsync
+per record). The log lives in `--dir` (default: a temporary directory, often tmpfs); point it at the disk the
+script would use to see real fsync costs.
+
+```bash
+uv run python benchmarks/bench_checkpoint.py --calls 100000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from _stats import write_results
+from puppemon_py_script.checkpoint import CheckpointLog
+from puppemon_py_script.pausable import Pausable, PausableController
+
+MODES = ("maybe_pause", "memory", "log", "fsync")
+
+
+def _states(kind: str, n_bytes: int):
+    if kind == "int":
+        return lambda i: i
+    if kind == "dict":
+        return lambda i: {
+            "step": i, "pallet": i // 40, "slot": i % 40, "x": 0.5 * i, "y": 1.5, "z": -2.0,
+            "rx": 0.0, "ry": 0.0, "rz": 90.0, "gripper": True, "tool": "suction", "ok": True,
+        }  # fmt: skip
+    payload = os.urandom(n_bytes)
+    return lambda i: payload
+
+
+async def _run(mode: str, make_state, calls: int, directory: str) -> Dict[str, Any]:
+    controller = PausableController()
+    log: Optional[CheckpointLog] = None
+    if mode != "maybe_pause":
+        log = CheckpointLog(os.path.join(directory, f"{mode}.checkpoint"), fsync=mode == "fsync")
+        controller.attach_checkpoints(log, persist="pause" if mode == "memory" else "pause_point")
+    states = [make_state(i) for i in range(min(calls, 1000))]
+    with Pausable.use_controller(controller):
+        p = Pausable(name="bench")
+    t0 = time.perf_counter_ns()
+    if mode == "maybe_pause":
+        for _ in range(calls):
+            await p.maybe_pause()
+    else:
+        for i in range(calls):
+            await p.checkpoint(states[i % len(states)])
+    elapsed = time.perf_counter_ns() - t0
+    # close() outside a `with` block keeps the last checkpoint, as a stopped task would
+    p.close()
+    size = 0
+    if log is not None:
+        controller.attach_checkpoints(None)
+        size = log.size
+        log.close()
+        os.unlink(log.path)
+    return {"ns_per_op": elapsed / calls, "log_bytes": size}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000, help="Pause points per run")
+    parser.add_argument("--states", nargs="+", default=["int", "dict", "bytes"], choices=("int", "dict", "bytes"))
+    parser.add_argument("--bytes", type=int, default=4096, help="Size of the raw bytes state")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--fsync-calls", type=int, default=2000, help="Pause points per fsync run")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions")
+    parser.add_argument("--dir", default=None, help="Directory of the checkpoint log")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print(f"{'state':>6} {'mode':>12} {'ns/op':>12} {'log KiB':>9}")
+        for kind in args.states:
+            make_state = _states(kind, args.bytes)
+            for mode in args.modes:
+                calls = args.fsync_calls if mode == "fsync" else args.calls
+                best = min(
+                    (asyncio.run(_run(mode, make_state, calls, tmp)) for _ in range(args.repeat)),
+                    key=lambda r: r["ns_per_op"],
+                )
+                rows.append({"state": kind, "mode": mode, "calls": calls, **best})
+                print(f"{kind:>6} {mode:>12} {best['ns_per_op']:>12.0f} {best['log_bytes'] / 1024:>9.1f}")
+    if args.output:
+        write_results(args.output, "checkpoint", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-command latency: a fresh channel per call vs the persistent-channel `ScriptClient`.
+
+Both modes send no-op Resume commands to an idle control server running in a child process, so only the
+transport cost differs. `SyncScriptClient` is included to show the overhead of the blocking wrapper.
+
+```bash
+uv run python benchmarks/bench_client.py --iterations 500
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+
+import grpc
+from google.protobuf import empty_pb2
+
+from _servers import idle_servers
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptClient, SyncScriptClient, script_pb2_grpc
+
+
+async def _fresh_channel(target: str, iterations: int) -> List[float]:
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        async with grpc.aio.insecure_channel(target) as channel:
+            await script_pb2_grpc.ScriptStub(channel).Resume(empty_pb2.Empty())
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+async def _persistent(target: str, iterations: int) -> List[float]:
+    samples = []
+    async with ScriptClient(target) as client:
+        await client.connect(timeout=5.0)
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            await client.resume()
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _sync(target: str, iterations: int) -> List[float]:
+    samples = []
+    with SyncScriptClient(target) as client:
+        client.connect(timeout=5.0)
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            client.resume()
+            samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    with idle_servers(1) as (target,):
+        metrics = {
+            "fresh_channel_ms": summarize(asyncio.run(_fresh_channel(target, args.iterations))),
+            "persistent_ms": summarize(asyncio.run(_persistent(target, args.iterations))),
+            "sync_wrapper_ms": summarize(_sync(target, args.iterations)),
+        }
+    print(f"{'mode':>18} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, s in metrics.items():
+        print(f"{name:>18} {s['p50']:>9.3f} {s['p99']:>9.3f} {s['max']:>9.3f}")
+    if args.output:
+        write_results(args.output, "client", vars(args), [metrics])
+
+
+if __name__ == "__main__":
+    main()
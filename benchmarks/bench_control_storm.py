@@ -0,0 +1,183 @@
+"""Many concurrent Pause/Resume RPCs against one script: throughput, status mix and final state consistency.
+
+A child process runs a script with `--tasks` pausable tasks behind its control server. `--clients` clients
+(one channel each) fire `--calls` RPCs in total, keeping the given number of them in flight, each a Pause
+with a `--pause-timeout` or a Resume picked at random (`--resume-ratio`). Concurrent Pauses join the pause
+already in flight, a Resume aborts it, and a timed-out Pause only rolls back what no later pause took over.
+
+After the storm the script must still be controllable and consistent: a final Pause succeeds with every task
+parked, and after a final Resume the state is RUNNING with no task parked and no group paused.
+
+```bash
+uv run python benchmarks/bench_control_storm.py --calls 5000 1 64 256
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing as mp
+import random
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import grpc
+
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptClient
+from puppemon_py_script.generated import script_pb2
+
+
+def _serve(n_tasks: int, targets: "mp.Queue", stop: "mp.Event") -> None:
+    from puppemon_py_script import ScriptServicer, start_server
+    from puppemon_py_script.pausable import Pausable, PausableController
+
+    async def _main():
+        controller = PausableController()
+        Pausable.set_controller(controller)
+
+        async def task(i: int):
+            with Pausable(name=f"task-{i}") as p:
+                while True:
+                    await p.sleep(0.001)
+
+        main = asyncio.create_task(asyncio.wait([asyncio.ensure_future(task(i)) for i in range(n_tasks)]))
+        servicer = ScriptServicer(controller, main, None, kill_on_stop=False)
+        server, port = await start_server(servicer, "127.0.0.1:0")
+        targets.put(f"127.0.0.1:{port}")
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        main.cancel()
+        await server.stop(0)
+
+    # Keep the servicer's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_main())
+
+
+async def _storm(target: str, args, concurrency: int) -> Dict:
+    rng = random.Random(args.seed)
+    clients = [ScriptClient(target) for _ in range(args.clients)]
+    for client in clients:
+        await client.connect(timeout=30.0)
+    latencies: Dict[str, List[float]] = {"pause": [], "resume": []}
+    codes: Counter = Counter()
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        client = clients[i % len(clients)]
+        kind = "resume" if rng.random() < args.resume_ratio else "pause"
+        async with slots:
+            t0 = time.perf_counter()
+            try:
+                if kind == "pause":
+                    await client.pause(args.pause_timeout, deadline=30.0)
+                else:
+                    await client.resume(deadline=30.0)
+                code = grpc.StatusCode.OK
+            except grpc.aio.AioRpcError as e:
+                code = e.code()
+            latencies[kind].append((time.perf_counter() - t0) * 1e3)
+            codes[f"{kind}:{code.name}"] += 1
+
+    try:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.calls)))
+        elapsed = time.perf_counter() - t0
+
+        # Consistency: the storm left nothing half-paused that blocks or leaks into the next commands
+        probe = clients[0]
+        await probe.pause(10.0, deadline=30.0)
+        paused = await _reaches(
+            probe, lambda s: s.state == script_pb2.ScriptState.PAUSED and all(t.parked for t in s.tasks)
+        )
+        await probe.resume(deadline=30.0)
+        running = await _reaches(
+            probe,
+            lambda s: s.state == script_pb2.ScriptState.RUNNING
+            and not any(t.parked for t in s.tasks)
+            and not s.paused_groups,
+        )
+        metrics = await probe.get_metrics(deadline=30.0)
+    finally:
+        for client in clients:
+            await client.close()
+
+    consistent = paused and running
+    return {
+        "calls_per_second": args.calls / elapsed,
+        "pause_ms": summarize(latencies["pause"]),
+        "resume_ms": summarize(latencies["resume"]),
+        "codes": dict(sorted(codes.items())),
+        "pauses_coalesced": metrics.pauses_coalesced,
+        "generations": metrics.generation,
+        "consistent": consistent,
+    }
+
+
+async def _reaches(client: ScriptClient, predicate: Callable[[script_pb2.ScriptState], bool]) -> bool:
+    """Whether the script state satisfies `predicate` within a second; parked tasks leave asynchronously."""
+
+    async def _watch() -> bool:
+        async for state in client.watch_state():
+            if predicate(state):
+                return True
+        return False
+
+    try:
+        return await asyncio.wait_for(_watch(), timeout=1.0)
+    except asyncio.TimeoutError:
+        return False
+
+
+def _run(args, concurrency: int) -> Dict:
+    spawn = mp.get_context("spawn")
+    targets = spawn.Queue()
+    stop = spawn.Event()
+    proc = spawn.Process(target=_serve, args=(args.tasks, targets, stop))
+    proc.start()
+    try:
+        target = targets.get(timeout=60)
+        return asyncio.run(_storm(target, args, concurrency))
+    finally:
+        stop.set()
+        proc.join(timeout=30)
+        if proc.is_alive():
+            proc.terminate()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="RPCs in total")
+    parser.add_argument("concurrency", type=int, nargs="*", default=[1, 16, 64], help="RPCs in flight")
+    parser.add_argument("--clients", type=int, default=8, help="Clients, one channel each")
+    parser.add_argument("--tasks", type=int, default=20, help="Pausable tasks in the script")
+    parser.add_argument("--resume-ratio", type=float, default=0.5, help="Share of the RPCs that are Resumes")
+    parser.add_argument("--pause-timeout", type=float, default=0.5, help="Server-side timeout of each Pause")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    print(
+        f"{'in flight':>9} {'calls/s':>9} {'pause p50':>10} {'pause p99':>10} {'coalesced':>10} {'consistent':>10}"
+    )
+    for concurrency in args.concurrency:
+        result = _run(args, concurrency)
+        rows.append({"concurrency": concurrency, **result})
+        print(
+            f"{concurrency:>9} {result['calls_per_second']:>9.0f} {result['pause_ms']['p50']:>10.2f}"
+            f" {result['pause_ms']['p99']:>10.2f} {result['pauses_coalesced']:>10}"
+            f" {str(result['consistent']):>10}"
+        )
+        print(f"{'':>9} {result['codes']}")
+    if args.output:
+        write_results(args.output, "control_storm", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Memory and throughput of PausableController bookkeeping with many short-lived Pausables.
+
+Phases, each timed separately:
+
+* register: construct N Pausables (one controller handle + finalizer each)
+* pause: one task per Pausable parks at `maybe_pause()` until `wait_all_paused` fires
+* resume: release every parked task and let it finish
+* unregister: drop all Pausables so their finalizers unregister them
+
+Memory is measured in a separate pass under tracemalloc (so it does not skew the timings), as the
+allocation delta of constructing N Pausables divided by N.
+
+```bash
+uv run python benchmarks/bench_controller_scale.py --count 100000 --generations 3
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import List
+
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+def _ms(t0: int) -> float:
+    return (time.perf_counter_ns() - t0) / 1e6
+
+
+async def _run(count: int, generations: int) -> None:
+    controller = PausableController()
+    Pausable.set_controller(controller)
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    probe: List[Pausable] = [Pausable() for _ in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    for p in probe:
+        p.close()
+    del probe
+
+    t0 = time.perf_counter_ns()
+    pausables: List[Pausable] = [Pausable() for _ in range(count)]
+    register_ms = _ms(t0)
+    print(f"register   {register_ms:10.1f} ms  {(current - base) / count:8.1f} B/instance")
+    assert controller.task_count == count
+
+    for generation in range(1, generations + 1):
+        released = asyncio.Event()
+
+        async def worker(p: Pausable) -> None:
+            await released.wait()
+            await p.maybe_pause()
+
+        tasks = [asyncio.create_task(worker(p)) for p in pausables]
+        await asyncio.sleep(0)
+
+        t0 = time.perf_counter_ns()
+        controller.pause()
+        released.set()
+        assert await controller.wait_all_paused(timeout=None)
+        pause_ms = _ms(t0)
+
+        t0 = time.perf_counter_ns()
+        controller.resume()
+        await asyncio.gather(*tasks)
+        resume_ms = _ms(t0)
+        print(f"gen {generation:<3} pause {pause_ms:10.1f} ms  resume {resume_ms:10.1f} ms")
+        del tasks
+
+    t0 = time.perf_counter_ns()
+    pausables.clear()
+    gc.collect()
+    unregister_ms = _ms(t0)
+    print(f"unregister {unregister_ms:10.1f} ms  remaining={controller.task_count}")
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Number of Pausable instances")
+    parser.add_argument("--generations", type=int, default=3, help="Pause/resume cycles")
+    args = parser.parse_args(argv)
+    asyncio.run(_run(args.count, args.generations))
+
+
+if __name__ == "__main__":
+    main()
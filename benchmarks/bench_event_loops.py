@@ -0,0 +1,109 @@
+"""Pause-point throughput and control-RPC latency on each available event loop (stdlib asyncio, uvloop).
+
+For every loop kind the same workload runs end to end inside one loop created by `new_event_loop`: worker
+tasks spin on `maybe_pause()`, then a script server is started with `start_server` and driven by a
+persistent `ScriptClient` over TCP loopback, as `run_script(..., loop=...)` would run it. Loops that are
+not installed are skipped.
+
+```bash
+uv run python benchmarks/bench_event_loops.py --iterations 1000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from typing import List, Optional
+
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptClient, ScriptServicer, start_server
+from puppemon_py_script.pausable import Pausable, PausableController
+from puppemon_py_script.util import new_event_loop
+
+
+async def _maybe_pause_ns(n_tasks: int, calls_per_task: int, batch: int = 1000) -> float:
+    controller = PausableController()
+    Pausable.set_controller(controller)
+    pausables = [Pausable(name=f"bench-{i}") for i in range(n_tasks)]
+
+    async def worker(p: Pausable) -> None:
+        remaining = calls_per_task
+        while remaining > 0:
+            step = min(batch, remaining)
+            for _ in range(step):
+                await p.maybe_pause()
+            remaining -= step
+            # Let the loop schedule the other workers, so loop overhead is part of the figure
+            await asyncio.sleep(0)
+
+    t0 = time.perf_counter_ns()
+    await asyncio.gather(*(worker(p) for p in pausables))
+    elapsed = time.perf_counter_ns() - t0
+    for p in pausables:
+        p.close()
+    return elapsed / (n_tasks * calls_per_task)
+
+
+async def _rpc_us(iterations: int) -> List[float]:
+    idle = asyncio.create_task(asyncio.Event().wait())
+    servicer = ScriptServicer(PausableController(), idle, None, kill_on_stop=False)
+    server, port = await start_server(servicer, "127.0.0.1:0")
+    client = ScriptClient(f"127.0.0.1:{port}")
+    samples = []
+    try:
+        await client.connect(timeout=5.0)
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            await client.pause()
+            await client.resume()
+            samples.append((time.perf_counter() - t0) * 1e6 / 2)
+    finally:
+        await client.close()
+        await server.stop(None)
+        idle.cancel()
+    return samples
+
+
+def _available(kind: str) -> bool:
+    try:
+        new_event_loop(kind).close()
+    except RuntimeError:
+        return False
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loops", nargs="+", default=["asyncio", "uvloop"], choices=["asyncio", "uvloop"])
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--calls", type=int, default=20000, help="maybe_pause() calls per task")
+    parser.add_argument("--iterations", type=int, default=500, help="pause + resume round trips")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    print(f"{'loop':>8} {'maybe_pause ns/op':>18} {'rpc p50 us':>11} {'rpc p99 us':>11}")
+    for kind in args.loops:
+        if not _available(kind):
+            print(f"{kind:>8} (not installed, skipped)")
+            continue
+        loop = new_event_loop(kind)
+        try:
+            ns_per_op = loop.run_until_complete(_maybe_pause_ns(args.tasks, args.calls))
+            # Keep the servicer's debug prints out of the report
+            with contextlib.redirect_stdout(io.StringIO()):
+                rpc = summarize(loop.run_until_complete(_rpc_us(args.iterations)))
+        finally:
+            loop.close()
+        rows.append({"loop": kind, "maybe_pause_ns": ns_per_op, "rpc_us": rpc})
+        print(f"{kind:>8} {ns_per_op:>18.1f} {rpc['p50']:>11.1f} {rpc['p99']:>11.1f}")
+    if args.output:
+        write_results(args.output, "event_loops", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
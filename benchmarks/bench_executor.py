@@ -0,0 +1,153 @@
+"""Control-RPC responsiveness while the script is CPU-bound, with the work inline or in thread/process pools.
+
+A child process runs a script server whose `--tasks` tasks burn CPU in chunks of `--chunk-ms`:
+
+* `inline`: each chunk runs on the event loop, with a pause point and a yield between chunks
+* `thread`: each chunk runs through `Pausable.run_in_executor` on a thread pool, polling `token.paused`
+* `process`: the same on a process pool, where the flag lives in shared memory
+
+The parent measures, over TCP loopback with a persistent `ScriptClient`, the latency of `GetMetrics` (does the
+server answer at all) and of Pause-until-all-parked and Resume round trips.
+
+```bash
+uv run python benchmarks/bench_executor.py --tasks 2 --chunk-ms 50 --iterations 50
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing as mp
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptClient, ScriptServicer, start_server
+from puppemon_py_script.pausable import Pausable, PausableController
+
+# Iterations of the inner loop between two polls of the pause flag (roughly 1 ms of work)
+_POLL_EVERY = 20_000
+
+
+def _burn_for(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        for _ in range(_POLL_EVERY):
+            pass
+
+
+def _burn_checkpointed(token, seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        for _ in range(_POLL_EVERY):
+            pass
+        if token.paused:
+            token.checkpoint()
+
+
+async def _cpu_task(p: Pausable, mode: str, chunk: float, executor: Optional[Executor]) -> None:
+    while True:
+        if mode == "inline":
+            _burn_for(chunk)
+            await p.maybe_pause()
+            # maybe_pause() does not yield while no pause is pending; let the server in between chunks
+            await asyncio.sleep(0)
+        else:
+            await p.run_in_executor(_burn_checkpointed, chunk, executor=executor)
+
+
+def _serve(mode: str, n_tasks: int, chunk: float, targets: "mp.Queue", stop: "mp.Event") -> None:
+    async def _main():
+        controller = PausableController()
+        Pausable.set_controller(controller)
+        executor: Optional[Executor] = None
+        if mode == "thread":
+            executor = ThreadPoolExecutor(n_tasks)
+        elif mode == "process":
+            executor = ProcessPoolExecutor(n_tasks, mp_context=mp.get_context("spawn"))
+        if executor is not None:
+            # Start the workers before the clock starts
+            await asyncio.gather(*(asyncio.wrap_future(executor.submit(int)) for _ in range(n_tasks)))
+        pausables = [Pausable(name=f"cpu-{i}") for i in range(n_tasks)]
+        main = asyncio.ensure_future(asyncio.gather(*(_cpu_task(p, mode, chunk, executor) for p in pausables)))
+        servicer = ScriptServicer(controller, main, None, kill_on_stop=False)
+        server, port = await start_server(servicer, "127.0.0.1:0")
+        targets.put(f"127.0.0.1:{port}")
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        main.cancel()
+        controller.resume()
+        await server.stop(0)
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # Keep the servicer's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_main())
+
+
+async def _drive(target: str, iterations: int):
+    client = ScriptClient(target)
+    metrics, pause, resume = [], [], []
+    try:
+        await client.connect(timeout=30.0)
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            await client.get_metrics()
+            t1 = time.perf_counter()
+            await client.pause(5.0, wait_full_timeout=True)
+            t2 = time.perf_counter()
+            await client.resume()
+            t3 = time.perf_counter()
+            metrics.append((t1 - t0) * 1e3)
+            pause.append((t2 - t1) * 1e3)
+            resume.append((t3 - t2) * 1e3)
+            # Let the work run again before the next probe
+            await asyncio.sleep(0.02)
+    finally:
+        await client.close()
+    return summarize(metrics), summarize(pause), summarize(resume)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["inline", "thread", "process"])
+    parser.add_argument("--tasks", type=int, default=2, help="CPU-bound tasks in the script")
+    parser.add_argument("--chunk-ms", type=float, default=50.0, help="Work per pause point / executor call")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    print(f"{'mode':>8} {'metrics p50/p99 ms':>19} {'pause p50/p99 ms':>17} {'resume p50/p99 ms':>18}")
+    for mode in args.modes:
+        targets: mp.Queue = mp.Queue()
+        stop = mp.Event()
+        # Not a daemon: the process pool mode starts children of its own
+        proc = mp.Process(target=_serve, args=(mode, args.tasks, args.chunk_ms / 1000.0, targets, stop))
+        proc.start()
+        try:
+            target = targets.get(timeout=60)
+            # Let the load settle
+            time.sleep(0.2)
+            metrics, pause, resume = asyncio.run(_drive(target, args.iterations))
+        finally:
+            stop.set()
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+        rows.append({"mode": mode, "get_metrics_ms": metrics, "pause_ms": pause, "resume_ms": resume})
+        print(
+            f"{mode:>8} {metrics['p50']:>9.2f}/{metrics['p99']:<9.2f} {pause['p50']:>8.2f}/{pause['p99']:<8.2f}"
+            f" {resume['p50']:>8.2f}/{resume['p99']:<8.2f}"
+        )
+    if args.output:
+        write_results(args.output, "executor", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
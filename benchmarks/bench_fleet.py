@@ -0,0 +1,76 @@
+"""Pause/Resume across many script servers: serial fresh-channel calls vs `ScriptFleet` fan-out.
+
+The servers run in a child process (one asyncio loop hosting N control servers, no user tasks) so the client
+side measures real cross-process gRPC. The serial mode mirrors the behave `ScriptClient`, which opens a new
+channel per command; the fleet mode keeps pooled channels and fans out with bounded concurrency.
+
+```bash
+uv run python benchmarks/bench_fleet.py --servers 10 100 --concurrency 64
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import List, Optional
+
+import grpc
+from google.protobuf import empty_pb2
+
+from _servers import idle_servers
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptFleet, script_pb2_grpc
+from puppemon_py_script.generated import script_pb2
+
+
+async def _serial_fresh_channels(targets: List[str]) -> None:
+    for target in targets:
+        async with grpc.aio.insecure_channel(target) as channel:
+            await script_pb2_grpc.ScriptStub(channel).Pause(script_pb2.PauseRequest())
+    for target in targets:
+        async with grpc.aio.insecure_channel(target) as channel:
+            await script_pb2_grpc.ScriptStub(channel).Resume(empty_pb2.Empty())
+
+
+async def _measure(targets: List[str], concurrency: int, iterations: int):
+    serial, fleet_ms = [], []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await _serial_fresh_channels(targets)
+        serial.append((time.perf_counter() - t0) * 1000)
+
+    async with ScriptFleet(targets, max_concurrency=concurrency) as fleet:
+        await fleet.resume()  # warm up the channel pool
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            paused = await fleet.pause(deadline=5.0)
+            resumed = await fleet.resume(deadline=5.0)
+            fleet_ms.append((time.perf_counter() - t0) * 1000)
+            assert all(r.ok for r in paused.values()) and all(r.ok for r in resumed.values())
+    return {"serial_fresh_channel_ms": summarize(serial), "fleet_pooled_ms": summarize(fleet_ms)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'servers':>8} {'mode':>24} {'p50 ms':>9} {'p99 ms':>9}  (one pause + resume round)")
+    for n in args.servers:
+        with idle_servers(n) as targets:
+            metrics = asyncio.run(_measure(targets, args.concurrency, args.iterations))
+        results.append({"servers": n, **metrics})
+        for name, s in metrics.items():
+            print(f"{n:>8} {name:>24} {s['p50']:>9.2f} {s['p99']:>9.2f}")
+    if args.output:
+        write_results(args.output, "fleet", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
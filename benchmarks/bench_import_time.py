@@ -0,0 +1,98 @@
+"""Cold-start import cost of the package, measured with `python -X importtime` in fresh interpreters.
+
+Each statement runs in a new subprocess `--repeat` times. The report gives the median cumulative import time
+of everything the statement pulled in (interpreter start-up modules excluded), the median wall time of the
+whole process, and the heaviest top-level imports so regressions can be traced to a module.
+
+```bash
+uv run python benchmarks/bench_import_time.py --output import.json
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from _stats import write_results
+
+STATEMENTS = [
+    "import puppemon_py_script",
+    "from puppemon_py_script import Pausable",
+    "from puppemon_py_script import ScriptClient",
+    "from puppemon_py_script import default_main",
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+
+def _importtime(statement: str) -> Tuple[Dict[str, int], float]:
+    """Return {top-level module: cumulative us} for modules imported by `statement`, and wall seconds."""
+    # Import site/encodings first so they are not attributed to the statement
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, check=True,
+    )  # fmt: skip
+    wall = time.perf_counter() - t0
+    top: Dict[str, int] = {}
+    started = False
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, module = int(m.group(2)), len(m.group(3)), m.group(4)
+        # Start-up imports (site, encodings, ...) are logged before the statement's first module
+        if module == "site":
+            started = True
+            continue
+        if started and indent == 1:
+            top[module] = cumulative
+    return top, wall
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per statement")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    results = []
+    for statement in STATEMENTS:
+        per_module: Dict[str, List[int]] = defaultdict(list)
+        totals, walls = [], []
+        for _ in range(args.repeat):
+            top, wall = _importtime(statement)
+            totals.append(sum(top.values()))
+            walls.append(wall)
+            for module, us in top.items():
+                per_module[module].append(us)
+        heaviest = sorted(
+            ((m, statistics.median(v)) for m, v in per_module.items()), key=lambda kv: -kv[1]
+        )[: args.top]
+        result = {
+            "statement": statement,
+            "import_ms": statistics.median(totals) / 1000,
+            "process_wall_ms": statistics.median(walls) * 1000,
+            "heaviest_ms": {m: us / 1000 for m, us in heaviest},
+        }
+        results.append(result)
+        print(
+            f"{statement:<48} import {result['import_ms']:7.1f} ms   "
+            f"process {result['process_wall_ms']:7.1f} ms"
+        )
+        for module, ms in result["heaviest_ms"].items():
+            print(f"    {module:<44} {ms:7.1f} ms")
+    if args.output:
+        write_results(args.output, "import_time", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Throughput of a tight async-iteration loop with a pause point per item.
+
+Compares, for a sync source (`range`) and an async generator source, items per second of:
+
+* `plain`: no pause point at all (upper bound)
+* `maybe_pause`: `await p.maybe_pause()` on every item
+* `iterate`: `async for x in p.iterate(src)`
+* `batches`: `async for batch in p.iterate_batches(src, --batch)`, items counted individually
+
+```bash
+uv run python benchmarks/bench_iterate.py --items 2000000 --batch 64
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from _stats import write_results
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+async def _agen(n: int):
+    for i in range(n):
+        yield i
+
+
+def _source(kind: str, n: int):
+    return range(n) if kind == "sync" else _agen(n)
+
+
+async def _plain(p: Pausable, src) -> None:
+    if hasattr(src, "__aiter__"):
+        async for _ in src:
+            pass
+    else:
+        for _ in src:
+            pass
+
+
+async def _maybe_pause(p: Pausable, src) -> None:
+    if hasattr(src, "__aiter__"):
+        async for _ in src:
+            await p.maybe_pause()
+    else:
+        for _ in src:
+            await p.maybe_pause()
+
+
+async def _iterate(p: Pausable, src) -> None:
+    async for _ in p.iterate(src):
+        pass
+
+
+def _batches(size: int) -> Callable:
+    async def run(p: Pausable, src) -> None:
+        async for batch in p.iterate_batches(src, size):
+            for _ in batch:
+                pass
+
+    return run
+
+
+async def _measure(variant: Callable, kind: str, n: int) -> float:
+    controller = PausableController()
+    Pausable.set_controller(controller)
+    with Pausable(name="bench") as p:
+        # Arm the fast path so the first item does not pay for it
+        await p.maybe_pause()
+        t0 = time.perf_counter()
+        await variant(p, _source(kind, n))
+        return n / (time.perf_counter() - t0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    variants: Dict[str, Callable] = {
+        "plain": _plain,
+        "maybe_pause": _maybe_pause,
+        "iterate": _iterate,
+        "batches": _batches(args.batch),
+    }
+    rows = []
+    print(f"{'source':>7} {'variant':>12} {'Mitems/s':>9} {'ns/item':>8}")
+    for kind in ("sync", "async"):
+        for name, variant in variants.items():
+            rate = max(asyncio.run(_measure(variant, kind, args.items)) for _ in range(args.repeat))
+            rows.append({"source": kind, "variant": name, "items_per_s": rate})
+            print(f"{kind:>7} {name:>12} {rate / 1e6:>9.2f} {1e9 / rate:>8.1f}")
+    if args.output:
+        write_results(args.output, "iterate", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Per-call overhead of `Pausable.maybe_pause()` when no pause is pending.
+
+Each concurrent task owns a Pausable and calls `maybe_pause()` in a tight loop, yielding to the event loop
+every `--batch` calls so that all tasks interleave. The reported figure is wall time divided by the total
+number of pause-point hits, alongside the legacy coroutine path (`controller.handle_pause`) for comparison.
+
+```bash
+uv run python benchmarks/bench_maybe_pause.py
+uv run python benchmarks/bench_maybe_pause.py --tasks 1 100 10000 --calls 200000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from puppemon_py_script.journal import EventJournal
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+async def _run(
+    n_tasks: int, calls_per_task: int, batch: int, legacy: bool, journal: Optional[EventJournal]
+) -> float:
+    controller = PausableController()
+    Pausable.set_controller(controller)
+    controller.attach_journal(journal, record_hits=True)
+    pausables = [Pausable(name=f"bench-{i}") for i in range(n_tasks)]
+    start_line = asyncio.Event()
+
+    async def worker(p: Pausable) -> None:
+        await start_line.wait()
+        remaining = calls_per_task
+        while remaining > 0:
+            step = min(batch, remaining)
+            if legacy:
+                for _ in range(step):
+                    await controller.handle_pause(p)
+            else:
+                for _ in range(step):
+                    await p.maybe_pause()
+            remaining -= step
+            await asyncio.sleep(0)
+
+    tasks = [asyncio.create_task(worker(p)) for p in pausables]
+    await asyncio.sleep(0)
+    t0 = time.perf_counter_ns()
+    start_line.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter_ns() - t0
+    for p in pausables:
+        p.close()
+    return elapsed / (n_tasks * calls_per_task)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument(
+        "--calls", type=int, default=1_000_000, help="Total pause-point hits per scenario"
+    )
+    parser.add_argument("--batch", type=int, default=100, help="Calls between loop yields")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions")
+    parser.add_argument(
+        "--journal-hits", action="store_true", help="Also measure with every hit journaled"
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = EventJournal(os.path.join(tmp, "bench.journal")) if args.journal_hits else None
+
+        def best(n_tasks: int, legacy: bool, journal: Optional[EventJournal] = None) -> float:
+            calls_per_task = max(1, args.calls // n_tasks)
+            return min(
+                asyncio.run(_run(n_tasks, calls_per_task, args.batch, legacy, journal))
+                for _ in range(args.repeat)
+            )
+
+        header = f"{'tasks':>8} {'fast ns/op':>12} {'legacy ns/op':>14}"
+        print(header + (f" {'journaled ns/op':>16}" if journal else ""))
+        for n_tasks in args.tasks:
+            row = f"{n_tasks:>8} {best(n_tasks, False):>12.1f} {best(n_tasks, True):>14.1f}"
+            if journal is not None:
+                row += f" {best(n_tasks, False, journal):>16.1f}"
+            print(row)
+        if journal is not None:
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
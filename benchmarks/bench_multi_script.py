@@ -0,0 +1,146 @@
+"""Memory of N scripts as N processes (one interpreter and gRPC server each) vs N scripts in one process.
+
+`processes` starts one fresh interpreter per script, each with its own controller, `ScriptServicer` and
+control server, as `default_main` does. `shared` starts one interpreter hosting all scripts with
+`start_scripts`: a controller and servicer per script behind one server and `ScriptRouter`. Every script
+runs `--tasks` pausable tasks. Memory is the summed proportional set size (PSS, so shared library pages are
+not counted twice) of the hosting processes, falling back to RSS where PSS is unavailable. Each script is
+then paused and resumed once through its own client to check the routing and time the round trip.
+
+```bash
+uv run python benchmarks/bench_multi_script.py --scripts 1 10 50
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing as mp
+import time
+from typing import List, Optional
+
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptClient
+
+
+def _script(n_tasks: int):
+    async def user_main():
+        from puppemon_py_script.pausable import Pausable
+
+        async def task(i: int):
+            with Pausable(name=f"task-{i}") as p:
+                while True:
+                    await p.sleep(0.01)
+
+        await asyncio.gather(*(task(i) for i in range(n_tasks)))
+
+    return user_main, None
+
+
+def _host(script_ids: List[str], n_tasks: int, targets: "mp.Queue", stop: "mp.Event") -> None:
+    from puppemon_py_script import ScriptServicer, start_scripts, start_server
+    from puppemon_py_script.pausable import Pausable, PausableController
+
+    async def _main():
+        if len(script_ids) == 1:
+            # The one-script-per-process layout of `default_main`
+            controller = PausableController()
+            Pausable.set_controller(controller)
+            user_main, _ = _script(n_tasks)
+            main = asyncio.create_task(user_main())
+            server, port = await start_server(
+                ScriptServicer(controller, main, None, kill_on_stop=False), "127.0.0.1:0"
+            )
+        else:
+            server, port, _ = await start_scripts(
+                {script_id: _script(n_tasks) for script_id in script_ids}, "127.0.0.1:0"
+            )
+        # Let every task register and settle before memory is read
+        await asyncio.sleep(0.2)
+        targets.put(f"127.0.0.1:{port}")
+        while not stop.is_set():
+            await asyncio.sleep(0.05)
+        await server.stop(0)
+
+    # Keep the servicer's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(_main())
+
+
+def _memory_kib(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    raise RuntimeError(f"Cannot read the memory of process {pid}")
+
+
+async def _round_trips(routes: List[tuple]) -> List[float]:
+    samples = []
+    for target, script_id in routes:
+        async with ScriptClient(target, script_id=script_id) as client:
+            await client.connect(timeout=30.0)
+            t0 = time.perf_counter()
+            await client.pause(5.0, wait_full_timeout=True)
+            await client.resume()
+            samples.append((time.perf_counter() - t0) * 1e3)
+    return samples
+
+
+def _measure(layout: str, n_scripts: int, n_tasks: int):
+    spawn = mp.get_context("spawn")
+    script_ids = [f"script-{i}" for i in range(n_scripts)]
+    groups = [[s] for s in script_ids] if layout == "processes" else [script_ids]
+    targets = spawn.Queue()
+    stop = spawn.Event()
+    procs = [spawn.Process(target=_host, args=(ids, n_tasks, targets, stop)) for ids in groups]
+    for proc in procs:
+        proc.start()
+    try:
+        ready = [targets.get(timeout=120) for _ in procs]
+        kib = sum(_memory_kib(proc.pid) for proc in procs)
+        if layout == "processes":
+            # A server with a single script accepts calls without a script ID
+            routes = [(target, None) for target in ready]
+        else:
+            routes = [(ready[0], script_id) for script_id in script_ids]
+        rtt = summarize(asyncio.run(_round_trips(routes)))
+    finally:
+        stop.set()
+        for proc in procs:
+            proc.join(timeout=30)
+            if proc.is_alive():
+                proc.terminate()
+    return kib, rtt
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scripts", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--tasks", type=int, default=10, help="Pausable tasks per script")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    print(f"{'scripts':>7} {'layout':>10} {'MiB':>8} {'MiB/script':>10} {'pause+resume p50 ms':>20}")
+    for n in args.scripts:
+        for layout in ("processes", "shared"):
+            kib, rtt = _measure(layout, n, args.tasks)
+            rows.append({"scripts": n, "layout": layout, "memory_kib": kib, "round_trip_ms": rtt})
+            print(f"{n:>7} {layout:>10} {kib / 1024:>8.1f} {kib / 1024 / n:>10.2f} {rtt['p50']:>20.2f}")
+    if args.output:
+        write_results(args.output, "multi_script", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""End-to-end pause latency: from sending the Pause RPC until every task is parked.
+
+For each (task count, pause-point interval) combination the script starts an in-process control server the
+same way `features/steps/common.start_server_with_tasks` does, then repeatedly pauses and resumes it over a
+long-lived gRPC channel. Per iteration it records, relative to the moment the Pause RPC is sent:
+
+* `parked_ms`: the last task reached its pause point (the point `wait_all_paused` is satisfied)
+* `callbacks_ms`: the last `pause_cb` finished
+* `rpc_ms`: the Pause response arrived back at the client
+
+`rpc_baseline_ms` is the round trip of a no-op Resume on a running script, i.e. the pure gRPC cost.
+
+`--wait` selects how workers spend the interval: `asyncio.sleep` followed by `maybe_pause()` (park at the
+next explicit pause point), or the pause-aware `Pausable.sleep` (park as soon as the pause is requested).
+
+```bash
+uv run python benchmarks/bench_pause_latency.py --tasks 1 10 100 --interval-ms 0 1 10 --output pause.json
+uv run python benchmarks/bench_pause_latency.py --tasks 100 --interval-ms 10 100 --wait maybe_pause sleep
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import grpc
+from google.protobuf import empty_pb2
+
+from _stats import summarize, write_results
+from puppemon_py_script import ScriptServicer, script_pb2_grpc
+from puppemon_py_script.generated import script_pb2
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+@dataclass
+class BenchScript:
+    server: grpc.aio.Server
+    controller: PausableController
+    main_task: asyncio.Task
+    port: int
+    stop_event: asyncio.Event
+    parked_at: List[float] = field(default_factory=list)
+    callbacks_done_at: List[float] = field(default_factory=list)
+
+
+WAITS = ("maybe_pause", "sleep")
+
+
+async def start_bench_server(
+    n_tasks: int, interval_s: float, pause_cb_s: float, wait: str = "maybe_pause"
+) -> BenchScript:
+    """Parameterized variant of `start_server_with_tasks`: n_tasks workers, one pause point per interval."""
+    controller = PausableController()
+    Pausable.set_controller(controller)
+    stop_event = asyncio.Event()
+    parked_at: List[float] = []
+    callbacks_done_at: List[float] = []
+
+    async def pause_cb():
+        parked_at.append(time.perf_counter())
+        if pause_cb_s > 0:
+            await asyncio.sleep(pause_cb_s)
+        callbacks_done_at.append(time.perf_counter())
+
+    async def task(i: int):
+        with Pausable(pause_cb=pause_cb, name=f"task-{i}") as p:
+            # De-synchronize the workers so pause points are spread over the interval
+            await asyncio.sleep(random.uniform(0, interval_s))
+            while not stop_event.is_set():
+                if wait == "sleep":
+                    await p.sleep(interval_s)
+                else:
+                    await asyncio.sleep(interval_s)
+                    await p.maybe_pause()
+
+    async def user_main():
+        await asyncio.gather(*(task(i) for i in range(n_tasks)))
+
+    main_task = asyncio.create_task(user_main())
+    server = grpc.aio.server()
+    servicer = ScriptServicer(
+        controller, main_task, user_stop_cb=lambda: stop_event.set(), kill_on_stop=False
+    )
+    script_pb2_grpc.add_ScriptServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return BenchScript(server, controller, main_task, port, stop_event, parked_at, callbacks_done_at)
+
+
+async def _measure(n_tasks: int, interval_ms: float, pause_cb_ms: float, iterations: int, wait: str):
+    script = await start_bench_server(n_tasks, interval_ms / 1000.0, pause_cb_ms / 1000.0, wait)
+    rpc, parked, callbacks, baseline = [], [], [], []
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{script.port}") as channel:
+            stub = script_pb2_grpc.ScriptStub(channel)
+            await channel.channel_ready()
+            await asyncio.sleep(interval_ms / 1000.0)
+            for _ in range(iterations):
+                t0 = time.perf_counter()
+                await stub.Resume(empty_pb2.Empty())
+                baseline.append((time.perf_counter() - t0) * 1000)
+
+                script.parked_at.clear()
+                script.callbacks_done_at.clear()
+                t0 = time.perf_counter()
+                await stub.Pause(script_pb2.PauseRequest())
+                rpc.append((time.perf_counter() - t0) * 1000)
+                # Callbacks may still be running after the RPC returned
+                while len(script.callbacks_done_at) < n_tasks:
+                    await asyncio.sleep(0.0005)
+                parked.append((max(script.parked_at) - t0) * 1000)
+                callbacks.append((max(script.callbacks_done_at) - t0) * 1000)
+
+                await stub.Resume(empty_pb2.Empty())
+                # Let the workers spread out again before the next sample
+                await asyncio.sleep(interval_ms / 1000.0 + 0.001)
+    finally:
+        script.stop_event.set()
+        script.controller.resume()
+        script.main_task.cancel()
+        await asyncio.gather(script.main_task, return_exceptions=True)
+        await script.server.stop(0)
+    return {
+        "rpc_baseline_ms": summarize(baseline),
+        "parked_ms": summarize(parked),
+        "callbacks_ms": summarize(callbacks),
+        "rpc_ms": summarize(rpc),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument(
+        "--interval-ms", type=float, nargs="+", default=[0.0, 1.0, 10.0],
+        help="Time each task spends between pause points",
+    )
+    parser.add_argument(
+        "--wait", nargs="+", choices=WAITS, default=["maybe_pause"], help="How workers wait between pause points"
+    )
+    parser.add_argument("--pause-cb-ms", type=float, default=0.0, help="Duration of every pause_cb")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    results: List[Dict[str, Any]] = []
+    header = (
+        f"{'wait':>11} {'tasks':>6} {'interval':>9} {'metric':>16} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    )
+    print(header)
+    for wait in args.wait:
+        for n_tasks in args.tasks:
+            for interval_ms in args.interval_ms:
+                # Keep the servicer's debug prints out of the report
+                with contextlib.redirect_stdout(io.StringIO()):
+                    metrics = asyncio.run(
+                        _measure(n_tasks, interval_ms, args.pause_cb_ms, args.iterations, wait)
+                    )
+                results.append({"wait": wait, "tasks": n_tasks, "interval_ms": interval_ms, **metrics})
+                for name, s in metrics.items():
+                    print(
+                        f"{wait:>11} {n_tasks:>6} {interval_ms:>9g} {name:>16} "
+                        f"{s['p50']:>9.3f} {s['p99']:>9.3f} {s['max']:>9.3f}"
+                    )
+    if args.output:
+        write_results(args.output, "pause_latency", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Fan-out throughput and pause behaviour of `PausableTaskGroup` against hand-built `asyncio.gather` concurrency.
+
+`--items` items of `--work-ms` simulated I/O each are handled with at most `--concurrency` in flight, as:
+
+* `gather`: one task per item, gated by a semaphore, each creating its own Pausable once it holds a slot
+  (the pattern of `asyncio.gather` over hand-made tasks)
+* `group`: a `PausableTaskGroup` of `--concurrency` workers over a queue
+
+Each item's work is a pause point followed by the I/O. A first run measures items/s with no pause. A second
+run pauses once a third of the items are handled, then reports the time until `wait_all_paused` returned,
+the items started while paused (dispatch that should have stopped), then resumes and checks every item was
+handled once.
+
+```bash
+uv run python benchmarks/bench_task_group.py --items 20000 --concurrency 1 16 256
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from _stats import write_results
+from puppemon_py_script.pausable import Pausable, PausableController
+from puppemon_py_script.taskgroup import PausableTaskGroup
+
+MODES = ("gather", "group")
+
+
+class _Work:
+    def __init__(self, work_s: float):
+        self.work_s = work_s
+        self.handled: List[int] = []
+        self.started_while_paused = 0
+        self.paused = False
+
+    async def handle(self, p: Pausable, item: int) -> None:
+        if self.paused:
+            self.started_while_paused += 1
+        await p.maybe_pause()
+        await asyncio.sleep(self.work_s)
+        self.handled.append(item)
+
+
+async def _gather(work: _Work, items: int, concurrency: int) -> None:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(item: int) -> None:
+        async with slots:
+            with Pausable(name=f"item-{item}") as p:
+                await work.handle(p, item)
+
+    await asyncio.gather(*(one(i) for i in range(items)))
+
+
+async def _group(work: _Work, items: int, concurrency: int) -> None:
+    async with PausableTaskGroup(work.handle, concurrency) as group:
+        for i in range(items):
+            group.put_nowait(i)
+
+
+async def _run(mode: str, items: int, concurrency: int, work_s: float, pause: bool) -> Dict[str, Any]:
+    controller = PausableController()
+    work = _Work(work_s)
+    fan_out = _gather if mode == "gather" else _group
+    with Pausable.use_controller(controller):
+        t0 = time.perf_counter()
+        runner = asyncio.ensure_future(fan_out(work, items, concurrency))
+    result: Dict[str, Any] = {}
+    if pause:
+        while len(work.handled) < items // 3:
+            await asyncio.sleep(0.001)
+        paused_at = time.perf_counter()
+        controller.pause()
+        work.paused = True
+        parked = await controller.wait_all_paused(timeout=10.0)
+        result["time_to_all_parked_ms"] = (time.perf_counter() - paused_at) * 1e3
+        result["all_parked"] = parked
+        # Anything dispatched after the pause shows up here
+        await asyncio.sleep(0.05)
+        result["started_while_paused"] = work.started_while_paused
+        work.paused = False
+        controller.resume()
+    await runner
+    elapsed = time.perf_counter() - t0
+    if not pause:
+        result["items_per_second"] = items / elapsed
+    result["handled_once"] = sorted(work.handled) == list(range(items))
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=20_000, help="Items per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 256], help="Items in flight")
+    parser.add_argument("--work-ms", type=float, default=0.0, help="Simulated I/O per item")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=MODES)
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of repetitions of the throughput run")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    rows = []
+    print(
+        f"{'mode':>7} {'in flight':>9} {'items/s':>9} {'to parked ms':>12} {'all parked':>10}"
+        f" {'started paused':>14} {'handled once':>12}"
+    )
+    for concurrency in args.concurrency:
+        items = args.items if concurrency > 1 else min(args.items, 2000)
+        for mode in args.modes:
+            throughput = max(
+                asyncio.run(_run(mode, items, concurrency, args.work_ms / 1e3, False))["items_per_second"]
+                for _ in range(args.repeat)
+            )
+            paused = asyncio.run(_run(mode, items, concurrency, args.work_ms / 1e3, True))
+            row = {"mode": mode, "concurrency": concurrency, "items": items, "items_per_second": throughput}
+            row.update(paused)
+            rows.append(row)
+            print(
+                f"{mode:>7} {concurrency:>9} {throughput:>9.0f} {paused['time_to_all_parked_ms']:>12.2f}"
+                f" {str(paused['all_parked']):>10} {paused['started_while_paused']:>14}"
+                f" {str(paused['handled_once']):>12}"
+            )
+    if args.output:
+        write_results(args.output, "task_group", vars(args), rows)
+
+
+if __name__ == "__main__":
+    main()
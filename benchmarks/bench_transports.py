@@ -0,0 +1,70 @@
+"""Control-RPC latency per transport: TCP loopback, Unix domain socket and in-process.
+
+TCP and Unix socket servers run in a child process and are reached through a persistent `ScriptClient`.
+The in-process case drives a `ScriptServicer` in the same loop through `InProcessScriptClient`.
+
+```bash
+uv run python benchmarks/bench_transports.py --iterations 1000
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from typing import List, Optional
+
+from _servers import idle_servers
+from _stats import summarize, write_results
+from puppemon_py_script import InProcessScriptClient, ScriptClient, ScriptServicer
+from puppemon_py_script.pausable import PausableController
+
+
+async def _sample(client, iterations: int) -> List[float]:
+    await client.connect(timeout=5.0)
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await client.pause()
+        await client.resume()
+        samples.append((time.perf_counter() - t0) * 1e6 / 2)
+    await client.close()
+    return samples
+
+
+async def _in_process(iterations: int) -> List[float]:
+    idle = asyncio.create_task(asyncio.Event().wait())
+    servicer = ScriptServicer(PausableController(), idle, None, kill_on_stop=False)
+    try:
+        return await _sample(InProcessScriptClient(servicer), iterations)
+    finally:
+        idle.cancel()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    args = parser.parse_args(argv)
+
+    metrics = {}
+    with idle_servers(1) as (target,):
+        metrics["tcp_us"] = summarize(asyncio.run(_sample(ScriptClient(target), args.iterations)))
+    with idle_servers(1, unix=True) as (target,):
+        metrics["unix_us"] = summarize(asyncio.run(_sample(ScriptClient(target), args.iterations)))
+    # Keep the servicer's debug prints out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        metrics["in_process_us"] = summarize(asyncio.run(_in_process(args.iterations)))
+
+    print(f"{'transport':>14} {'p50 us':>9} {'p99 us':>9} {'max us':>9}  (per control RPC)")
+    for name, s in metrics.items():
+        print(f"{name:>14} {s['p50']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f}")
+    if args.output:
+        write_results(args.output, "transports", vars(args), [metrics])
+
+
+if __name__ == "__main__":
+    main()
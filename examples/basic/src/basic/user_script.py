@@ -25,11 +25,10 @@ async def user_main():
 
     while True:
         print("Hello")
-        await asyncio.sleep(0.5)
-        await pausable1.maybe_pause()
+        # Pause-aware sleep: parks as soon as a pause is requested instead of after the full 0.5 s
+        await pausable1.sleep(0.5)
         print("World!")
-        await asyncio.sleep(0.5)
-        await pausable2.maybe_pause()
+        await pausable2.sleep(0.5)
 
 
 async def user_stop_cb():
@@ -1,11 +1,10 @@
-import asyncio
-
 # TODO try relative import
 from py_resymot_demo.user_script import user_main, user_stop_cb
-from puppemon_py_script import default_main
+from puppemon_py_script import run_script
 
 if __name__ == "__main__":
     try:
-        asyncio.run(default_main(user_main, user_stop_cb))
+        # Pass `--loop uvloop` (or loop="auto") to run on uvloop when installed
+        run_script(user_main, user_stop_cb)
     except KeyboardInterrupt:
         pass
@@ -51,8 +51,9 @@ async def user_main():
         pausable1 = Pausable(pause_cb=user_pause_cb, resume_cb=user_resume_cb)
         # pausable2 = Pausable(pause_cb=user_pause_cb_2, resume_cb=user_resume_cb_2)
 
-        while True:
-            print("Hello world!")
+        # Every await in cycle() is a pause point of pausable1: a pause parks between two moves
+        @pausable1.pause_points
+        async def cycle():
             await xyz.straight_move_to([0.4, 0.0, 0.1], feedrate)
             await xyz.straight_move_to([0.3, 0.2, 0.15], feedrate)
             normal = [0.0, 0.0, 1.0]
@@ -60,7 +61,10 @@ async def user_main():
             await xyz.straight_move_to([0.5, 0, 0.05], feedrate)
             await xyz.arc_move_to([0.4, 0, 0.1], normal, -math.pi, feedrate)
             assert await xyz.wait_complete()
-            await pausable1.maybe_pause()
+
+        while True:
+            print("Hello world!")
+            await cycle()
 
             # print("World!")
             # await asyncio.sleep(0.5)
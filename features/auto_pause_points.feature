@@ -0,0 +1,29 @@
+Feature: Automatic pause points
+
+	Background:
+		Given a pause controller without a control server
+
+	Scenario: A decorated sequence of awaited moves parks between two moves
+		Given a task running 5 awaited moves of 20 milliseconds with automatic pause points
+		When the script is paused
+		Then the task parks within 40 milliseconds
+		And no move starts while parked
+		When the script is resumed
+		Then the task finishes every move in order
+
+	Scenario: Only the awaits of the decorated function itself are pause points
+		When a task awaits a helper with 3 awaits of its own 10 times in a function with automatic pause points
+		Then it passed 10 pause points
+
+	Scenario: Awaits closer than the minimum interval are not pause points
+		When a task awaits 100 times in a function with automatic pause points at least 10 seconds apart
+		Then it passed 1 pause points
+
+	Scenario: A decorated function without a Pausable registers its own for the duration of each call
+		When a function with automatic pause points of its own is called
+		Then a task named after the function is registered during the call only
+
+	Scenario: A decorated function called inside a Pausable's block pauses through that Pausable
+		Given a task in a Pausable block calling a function with automatic pause points of its own
+		When the script is paused
+		Then every task parks and the task is registered once
@@ -0,0 +1,30 @@
+Feature: Checkpoints at pause points
+
+	Scenario: A restarted script continues from its last checkpoint
+		Given a checkpoint log
+		And a script whose task "counter" counts to 50 and checkpoints after every step
+		When the script is stopped after 20 steps
+		And the script is started again on the same checkpoint log
+		Then task "counter" continues from its last completed step
+		And task "counter" counts to 50
+
+	Scenario: Checkpoints kept for the pause are written when the task parks
+		Given a checkpoint log that only saves checkpoints on pause
+		And a script whose task "counter" counts to 50 and checkpoints after every step
+		When the script is paused after 20 steps
+		Then nothing was written to the checkpoint log before the pause
+		And the checkpoint log on disk holds the last completed step of task "counter"
+
+	Scenario: A checkpoint cut short by a crash is ignored
+		Given a checkpoint log
+		And a script whose task "counter" counts to 50 and checkpoints after every step
+		When the script is stopped after 20 steps
+		And the last checkpoint record is cut short
+		And the script is started again on the same checkpoint log
+		Then task "counter" continues from the step before its last completed step
+
+	Scenario: A task that finishes clears its checkpoint
+		Given a checkpoint log
+		And a script whose task "counter" counts to 10 and checkpoints after every step
+		When the script runs to completion
+		Then the checkpoint log on disk holds nothing for task "counter"
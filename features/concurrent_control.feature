@@ -0,0 +1,25 @@
+Feature: Concurrent control commands
+
+	Background:
+		Given a script started with an embedded gRPC control server
+		And the script defines concurrent async tasks A and B with pausable points
+
+	Scenario: Concurrent PAUSE commands share one pause
+		Given task A is executing and can reach a pausable point within 1 second
+		When 5 clients send the PAUSE command with a timeout of 5 seconds at the same time
+		Then every client receives success
+		And the pause generation advanced by 1
+		And the metrics count 4 coalesced pauses
+		And the script state is "paused"
+
+	Scenario: A timed-out group PAUSE does not undo an overlapping pause still in flight
+		Given task A reaches a pausable point every 2 seconds
+		When one client pauses group "motion" with a timeout of 1 second while another pauses groups "motion" and "telemetry" with a timeout of 5 seconds
+		Then the first client receives a timeout error and the second succeeds
+		And the paused groups are "motion,telemetry"
+
+	Scenario: RESUME aborts a PAUSE still waiting for its tasks
+		Given task A is executing and cannot reach a pausable point within 1 second
+		When a client sends the PAUSE command with a timeout of 5 seconds and another sends the RESUME command before the tasks park
+		Then the pausing client receives an aborted error without waiting for the timeout
+		And no global pause is applied (tasks continue running)
@@ -0,0 +1,24 @@
+Feature: Drain tasks before stopping
+
+	Background:
+		Given a script started with an embedded gRPC control server
+		And the script defines concurrent async tasks A and B with pausable points
+
+	Scenario: STOP with a drain timeout stops every task at its next pause point
+		Given task B is executing and can reach a pausable point within 1 second
+		When the client sends the STOP command with a drain timeout of 5 seconds
+		Then tasks A and B are reported as drained and no task as cancelled
+		And the script shuts down gracefully
+
+	Scenario: Tasks that miss the drain deadline are cancelled where they are
+		Given task A is executing and cannot reach a pausable point within 1 second
+		When the client sends the STOP command with a drain timeout of 1 second
+		Then task B is reported as drained and task A as cancelled
+		And the drain took about 1 second
+		And the script shuts down gracefully
+
+	Scenario: RESUME is refused while the script drains
+		Given task A is executing and cannot reach a pausable point within 1 second
+		When the client sends the STOP command with a drain timeout of 1 second and a RESUME command while it drains
+		Then the RESUME command is rejected with FAILED_PRECONDITION
+		And task B is reported as drained and task A as cancelled
@@ -1,19 +1,54 @@
 import asyncio
 import contextlib
 
+from puppemon_py_script.simulation import VirtualTimeEventLoop
+
 
 def before_all(context):
     context.loop = asyncio.new_event_loop()
     asyncio.set_event_loop(context.loop)
 
 
+def before_scenario(context, scenario):
+    # Steps of @virtual_time scenarios run on a virtual clock: sleeps and timeouts complete at once, exactly
+    if "virtual_time" in scenario.effective_tags:
+        context.real_loop = context.loop
+        context.loop = VirtualTimeEventLoop()
+        asyncio.set_event_loop(context.loop)
+
+
+def _close_virtual_loop(context):
+    loop, context.loop = context.loop, context.real_loop
+    context.real_loop = None
+
+    async def _cancel_leftovers():
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        loop.run_until_complete(_cancel_leftovers())
+    finally:
+        loop.close()
+        asyncio.set_event_loop(context.loop)
+
+
 def after_scenario(context, scenario):
+    if getattr(context, "real_loop", None) is not None:
+        _close_virtual_loop(context)
     loop = getattr(context, "loop", None)
     running = getattr(context, "running", None)
     if not loop or not running:
         return
 
     async def _cleanup_running():
+        # Drop any state watcher before the server goes away
+        watcher = getattr(context, "watcher_task", None)
+        if watcher is not None and not watcher.done():
+            watcher.cancel()
+            with contextlib.suppress(BaseException):
+                await watcher
         # Signal tasks to stop if still running
         try:
             if getattr(running, "stop_event", None) is not None:
@@ -41,6 +76,7 @@ def after_scenario(context, scenario):
     # Clear reference
     try:
         context.running = None
+        context.watcher_task = None
     except Exception:
         pass
 
@@ -0,0 +1,27 @@
+Feature: Event journal
+
+  Background:
+    Given a script started with an embedded gRPC control server
+    And the script defines concurrent async tasks A and B with pausable points
+
+  Scenario: Control events are journaled for post-mortem analysis
+    Given the script writes an event journal
+    And tasks A and B are executing
+    When the client sends the PAUSE command
+    And the client sends the RESUME command
+    Then the journal can be decoded without stopping the script
+    And the journal records the PAUSE request, the new generation and both tasks parking
+    And the journal records the RESUME request
+
+  Scenario: Pause point hits are journaled on request
+    Given the script writes an event journal including pause point hits
+    And tasks A and B are executing
+    Then the journal records pause point hits
+
+  Scenario: A reader never returns the slot the writer is filling in
+    Given a full journal whose writer has filled in the next slot but not yet published it
+    Then reading the journal drops the record of that slot
+
+  Scenario: A reader stays consistent while a writer laps the ring
+    Given a writer process that keeps lapping a small journal ring
+    Then every record read while it writes is one the writer wrote with that sequence number
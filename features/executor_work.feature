@@ -0,0 +1,23 @@
+Feature: Pausable work in thread and process pools
+
+	Background:
+		Given a pause controller without a control server
+
+	Scenario Outline: Blocking work in a <pool> pool parks at its next checkpoint
+		Given a task that runs 100 steps of 5 milliseconds in a <pool> pool
+		When the task has run 100 milliseconds and the script is paused
+		Then the task parks within 30 milliseconds
+		And the pause callback ran on the event loop thread
+		And the work makes no progress while paused
+		When the script is resumed
+		Then the resume callback ran on the event loop thread
+		And the task returns the work result
+
+		Examples:
+			| pool    |
+			| thread  |
+			| process |
+
+	Scenario: Process pool work that starts after its awaiting task gave up runs unpaused
+		When a process pool token is closed before the worker unpickles it
+		Then the worker's token reads not paused and its checkpoint returns at once
@@ -0,0 +1,25 @@
+Feature: Fleet control
+
+  Background:
+    Given a script started with an embedded gRPC control server
+    And the script defines concurrent async tasks A and B with pausable points
+
+  Scenario: Fleet pause reports a result per script
+    Given a fleet made of the script and an unreachable script server
+    When the operator pauses the fleet with a deadline of 1 second
+    Then the fleet reports the script as paused
+    And the fleet reports the unreachable script as failed
+    And the script state is "paused"
+
+  Scenario: Fleet resume releases the paused script
+    Given a fleet made of the script and an unreachable script server
+    And the script state is "paused"
+    When the operator resumes the fleet with a deadline of 1 second
+    Then the fleet reports the script as resumed
+    And the script state is "running"
+
+  Scenario: A script whose call fails without an RPC error does not hide the other results
+    Given a fleet made of the script and a script server whose client fails with an OSError
+    When the operator pauses the fleet with a deadline of 1 second
+    Then the fleet reports the script as paused
+    And the fleet reports the failing script as failed with the OSError
@@ -0,0 +1,36 @@
+Feature: Pause a group of tasks
+
+	Background:
+		Given a script started with an embedded gRPC control server
+		And the script defines concurrent async tasks A and B with pausable points
+		And task A is tagged "motion" and task B is tagged "telemetry"
+
+	Scenario: PAUSE with a group selector halts only the tasks of that group
+		Given tasks A and B are executing
+		When the client sends the PAUSE command for group "motion"
+		Then task A halts at its next pausable point
+		And task B keeps running
+		And the paused groups are "motion"
+
+	Scenario: RESUME with a group selector resumes only that group
+		Given tasks A and B are executing
+		When the client sends the PAUSE command for group "motion"
+		And the client sends the PAUSE command for group "telemetry"
+		And the client sends the RESUME command for group "telemetry"
+		Then task A halts at its next pausable point
+		And task B keeps running
+		And the paused groups are "motion"
+
+	Scenario: RESUME without a selector resumes every group
+		Given tasks A and B are executing
+		When the client sends the PAUSE command for group "motion"
+		And the client sends the RESUME command
+		Then tasks A and B keep running
+		And no group is paused
+
+	Scenario: A group PAUSE times out on its own tasks only
+		Given task A is executing and cannot reach a pausable point within 1 second
+		When the client sends the PAUSE command for group "motion" with a timeout of 1 second
+		Then the server responds with a timeout error
+		And no group is paused
+		And task B keeps running
@@ -0,0 +1,29 @@
+Feature: Script metrics
+
+  Background:
+    Given a script started with an embedded gRPC control server
+    And the script defines concurrent async tasks A and B with pausable points
+
+  Scenario: Metrics report pause point hits and time to park per task
+    Given tasks A and B are executing
+    When the client sends the PAUSE command
+    And the client sends the RESUME command
+    And the client requests the metrics
+    Then the metrics report pause point hits for tasks A and B
+    And the metrics report one park per task with its time to park
+    And the metrics count one PAUSE and one RESUME request
+
+  Scenario: Metrics are scraped in Prometheus text format
+    Given tasks A and B are executing
+    When a Prometheus scraper fetches the metrics endpoint
+    Then the scrape contains the pause point hit counter of the pause group of task A
+    And the scrape has no series per task
+
+  Scenario: Prometheus series per task are opt-in
+    Given tasks A and B are executing
+    When a Prometheus scraper fetches the metrics endpoint with series per task
+    Then the scrape contains the pause point hit counter for task A
+
+  Scenario: A finished task's counts stay in the counters of its pause group
+    When a task of pause group "short" hits 3 pause points and finishes
+    Then the Prometheus metrics count 3 pause point hits and no registered task in pause group "short"
@@ -0,0 +1,26 @@
+Feature: Several scripts in one process
+
+	Background:
+		Given scripts "left" and "right" running in one process behind one control server
+
+	Scenario: PAUSE for one script halts only that script
+		When the client sends the PAUSE command to script "left"
+		Then the tasks of script "left" halt at their next pausable point
+		And the tasks of script "right" keep running
+
+	Scenario: Each script reports only its own tasks
+		Then the metrics of script "left" list only task "left-worker"
+		And the metrics of script "right" list only task "right-worker"
+
+	Scenario: STOP for one script leaves the others running
+		When the client sends the STOP command to script "right"
+		Then the main task of script "right" is cancelled
+		And the tasks of script "left" keep running
+
+	Scenario: A call for an unknown script is rejected
+		When the client sends the PAUSE command to script "middle"
+		Then the server rejects the call with NOT_FOUND
+
+	Scenario: A call without a script ID is rejected when several scripts are served
+		When the client sends the PAUSE command without a script ID
+		Then the server rejects the call with INVALID_ARGUMENT
@@ -0,0 +1,21 @@
+Feature: Pausable iteration
+
+	Background:
+		Given a pause controller without a control server
+
+	Scenario: A pausable iteration parks between two items
+		Given a task consuming an endless async stream with the pausable iterator
+		When the script is paused
+		Then the task parks within 20 milliseconds
+		And the task consumes no more items while parked
+		When the script is resumed
+		Then the task consumes items again
+
+	Scenario: A batched pausable iteration yields fixed size batches with one pause point each
+		When a task consumes 1000 items in batches of 64
+		Then it receives 16 batches with every item in order
+		And it passed 16 pause points
+
+	Scenario: A batched pausable iteration closes slow batches after the maximum delay
+		When a task consumes a stream producing an item every 10 milliseconds in batches of 64 with a maximum delay of 35 milliseconds
+		Then no batch holds more than 5 items
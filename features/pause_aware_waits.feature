@@ -0,0 +1,35 @@
+@virtual_time
+Feature: Pause-aware waits
+
+	Background:
+		Given a pause controller without a control server
+
+	Scenario: A task in a pause-aware sleep parks immediately
+		Given a task that sleeps 300 milliseconds between pause points with the pause-aware sleep
+		When the task has slept 100 milliseconds and the script is paused
+		Then the task parks within 20 milliseconds
+		When the script is resumed after 200 milliseconds
+		Then the task finishes its sleep about 200 milliseconds after the resume
+
+	Scenario: A busy loop of pause-aware zero sleeps yields to the loop and parks
+		Given a task that loops 10000 times over the pause-aware sleep of 0 seconds
+		When the script is paused
+		Then the task parks within 20 milliseconds
+		When the script is resumed
+		Then the task finishes its loop
+
+	Scenario: A task in a pause-aware queue get parks immediately and leaves items on the queue
+		Given a task that waits for items with the pause-aware queue get
+		When the script is paused
+		Then the task parks within 20 milliseconds
+		When an item is put on the queue
+		Then the item stays on the queue while the task is parked
+		When the script is resumed
+		Then the task receives the item
+
+	Scenario: A pause-aware wait_for parks immediately and returns the result after the resume
+		Given a task that waits 50 milliseconds for a result with the pause-aware wait_for
+		When the script is paused
+		Then the task parks within 20 milliseconds
+		When the script is resumed after 100 milliseconds
+		Then the task receives the result
@@ -0,0 +1,20 @@
+Feature: Predictive pause timeouts
+
+	Background:
+		Given a script whose task "slow" reaches a pause point every 30 seconds
+		And whose task "fast" reaches a pause point every 10 milliseconds
+
+	Scenario: PAUSE fails fast when a task cannot reach a pausable point before the timeout
+		When the operator pauses the script with a timeout of 2 seconds
+		Then the server responds with a timeout error without waiting for the timeout
+		And the error names task "slow" with its estimated time to park
+		And no pause was requested from the tasks
+
+	Scenario: PAUSE waits the full timeout when fail-fast is disabled
+		When the operator pauses the script with a timeout of 1 second, waiting the full timeout
+		Then the server responds with a timeout error after the timeout elapsed
+
+	Scenario: Metrics report the estimated time to park per task
+		When the client requests the metrics from the script
+		Then task "slow" reports a pause point interval of about 30 seconds
+		And task "slow" reports an estimated time to park of about 29 seconds
@@ -0,0 +1,20 @@
+Feature: Pause report
+
+	Background:
+		Given a script started with an embedded gRPC control server
+		And the script defines concurrent async tasks A and B with pausable points
+
+	Scenario: A successful PAUSE reports how each task parked
+		Given task B is executing and can reach a pausable point within 1 second
+		And task A spends 200 milliseconds in its pause callback
+		When the client sends the PAUSE command with a timeout of 5 seconds and keeps the report
+		Then the report is for the current pause generation
+		And the report lists tasks A and B as parked and no straggler
+		And task B took longer to park than task A
+		And task A reports a pause callback of about 200 milliseconds
+
+	Scenario: A timed-out PAUSE names the task that never parked
+		Given task A is executing and cannot reach a pausable point within 1 second
+		When the client sends the PAUSE command with a timeout of 1 second, waiting the full timeout
+		Then the server responds with a timeout error
+		And the report lists task B as parked and task A as a straggler
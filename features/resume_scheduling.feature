@@ -0,0 +1,28 @@
+Feature: Staggered resume
+
+	Background:
+		Given a pause controller with 6 parked tasks whose resume callbacks take 30 milliseconds
+
+	Scenario: A resume policy bounds the number of concurrent resume callbacks
+		Given a resume policy of at most 2 concurrent resumes
+		When the script is resumed
+		Then every task resumes
+		And at most 2 resume callbacks ran at the same time
+
+	Scenario: Tasks resume in priority order
+		Given a resume policy of at most 1 concurrent resume
+		When the script is resumed
+		Then every task resumes
+		And the tasks resumed from the highest to the lowest priority
+
+	Scenario: A resume rate ramps tasks up over time
+		Given a resume policy of at most 50 resumes per second
+		When the script is resumed
+		Then every task resumes
+		And the last task resumed at least 90 milliseconds after the first
+
+	Scenario: Per-task resume latency is reported
+		Given a resume policy of at most 1 concurrent resume
+		When the script is resumed
+		Then every task resumes
+		And the resume latency of each task grows with its position in the resume order
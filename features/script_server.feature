@@ -11,4 +11,11 @@ Feature: Script control server (gRPC)
 
   Scenario: Unknown command is rejected
     When a client sends an unknown command
-    Then the server responds with an error indicating the command is unsupported
\ No newline at end of file
+    Then the server responds with an error indicating the command is unsupported
+
+  Scenario: Control server listens on a Unix domain socket
+    Given a script started with a control server on a Unix domain socket
+    Then a client connected over the socket can pause and resume the script
+
+  Scenario: Embedding application controls the script in-process
+    Then an in-process client can pause and resume the script
@@ -0,0 +1,25 @@
+Feature: Virtual-time simulation of a script
+
+	Scenario: Minutes of script time are simulated in a fraction of wall time
+		Given a script whose task works 200 milliseconds between pause points
+		When the script is simulated for 600 seconds with a pause every 30 seconds held for 5 seconds
+		Then the simulation takes less than 1 second of wall time
+		And the pause-point interval of task "worker" is 200 milliseconds
+		And 19 pauses completed with a worst-case pause latency of at most 200 milliseconds
+
+	Scenario: Cycle times include the time spent paused
+		Given a script whose cycle is 3 steps of 100 milliseconds
+		When the script is simulated for 10 cycles with a pause every 1 second held for 2 seconds
+		Then every cycle took at least 300 milliseconds
+		And the total of the cycle times is 3 seconds plus 2 seconds for every pause
+
+	Scenario: A main that returns is run again until the simulated duration is over
+		Given a script whose cycle is 3 steps of 100 milliseconds
+		When the script is simulated for 2.95 seconds without pauses
+		Then 9 cycles completed
+
+	Scenario: Once the pause-point interval is learned, a hopeless pause timeout is rejected at once
+		Given a script whose task works 10000 milliseconds between pause points
+		When the script is simulated for 1200 seconds with a pause every 60 seconds with a timeout of 1 second
+		Then every pause fails
+		And every pause after 600 seconds is rejected without waiting for the timeout
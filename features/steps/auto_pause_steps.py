@@ -0,0 +1,113 @@
+import asyncio
+
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script import pause_points
+from puppemon_py_script.pausable import Pausable
+
+
+@given("a task running {count:d} awaited moves of {millis:d} milliseconds with automatic pause points")
+def step_move_sequence(context, count, millis):
+    context.moves = []
+    context.count = count
+
+    async def move(i):
+        context.moves.append(("start", i))
+        await asyncio.sleep(millis / 1000.0)
+        context.moves.append(("end", i))
+
+    @context.pausable.pause_points
+    async def sequence():
+        for i in range(count):
+            await move(i)
+
+    context.worker = context.loop.create_task(sequence())
+    run(context.loop, asyncio.sleep(0.005))
+
+
+@then("no move starts while parked")
+def step_no_move_while_parked(context):
+    before = list(context.moves)
+    run(context.loop, asyncio.sleep(0.05))
+    assert context.moves == before, context.moves
+    assert before[-1][0] == "end", before
+
+
+@then("the task finishes every move in order")
+def step_moves_in_order(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=2.0))
+    assert context.moves == [(kind, i) for i in range(context.count) for kind in ("start", "end")], context.moves
+
+
+@when(
+    "a task awaits a helper with {inner:d} awaits of its own {count:d} times in a function with automatic pause"
+    " points"
+)
+def step_nested_awaits(context, inner, count):
+    async def helper():
+        for _ in range(inner):
+            await asyncio.sleep(0)
+
+    @context.pausable.pause_points
+    async def calls():
+        for _ in range(count):
+            await helper()
+
+    run(context.loop, calls())
+
+
+@when("a task awaits {count:d} times in a function with automatic pause points at least {seconds:d} seconds apart")
+def step_throttled_awaits(context, count, seconds):
+    @context.pausable.pause_points(min_interval=seconds)
+    async def calls():
+        for _ in range(count):
+            await asyncio.sleep(0)
+
+    run(context.loop, calls())
+
+
+@when("a function with automatic pause points of its own is called")
+def step_own_pausable(context):
+    context.registered = []
+
+    @pause_points
+    async def palletize():
+        await asyncio.sleep(0)
+        context.registered.append([t.name for t in context.controller.snapshot().tasks])
+
+    run(context.loop, palletize())
+
+
+@then("a task named after the function is registered during the call only")
+def step_registered_during_call(context):
+    assert context.registered == [["waiter", "palletize"]], context.registered
+    assert [t.name for t in context.controller.snapshot().tasks] == ["waiter"]
+
+
+@given("a task in a Pausable block calling a function with automatic pause points of its own")
+def step_nested_in_block(context):
+    context.pausable.close()
+
+    @pause_points
+    async def step():
+        for _ in range(100):
+            await asyncio.sleep(0.001)
+
+    async def task():
+        with Pausable(name="outer") as p:
+            while True:
+                await p.maybe_pause()
+                await step()
+
+    context.worker = context.loop.create_task(task())
+    run(context.loop, asyncio.sleep(0.01))
+
+
+@then("every task parks and the task is registered once")
+def step_parks_registered_once(context):
+    assert run(context.loop, context.controller.wait_all_paused(timeout=1.0))
+    snapshot = context.controller.snapshot()
+    assert [t.name for t in snapshot.tasks] == ["outer"], snapshot.tasks
+    assert snapshot.expected_tasks == 1 and snapshot.tasks[0].parked, snapshot
+    context.worker.cancel()
@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script.checkpoint import CheckpointLog
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+def _checkpoint_log(context, persist):
+    tmp = tempfile.TemporaryDirectory()
+    context.add_cleanup(tmp.cleanup)
+    context.checkpoint_path = os.path.join(tmp.name, "script.checkpoint")
+    context.checkpoint_persist = persist
+
+
+@given("a checkpoint log")
+def step_checkpoint_log(context):
+    _checkpoint_log(context, "pause_point")
+
+
+@given("a checkpoint log that only saves checkpoints on pause")
+def step_checkpoint_log_on_pause(context):
+    _checkpoint_log(context, "pause")
+
+
+def _start(context):
+    """Start the counting script as `default_main` would with --checkpoint: attach the log, then run main."""
+    controller = PausableController()
+    log = CheckpointLog(context.checkpoint_path)
+    controller.attach_checkpoints(log, persist=context.checkpoint_persist)
+    context.controller = controller
+    context.log = log
+    context.steps = []
+
+    async def counter():
+        with Pausable(name=context.counter_name) as p:
+            start = p.restore(0)
+            context.started_from = start
+            for step in range(start, context.counter_goal):
+                await asyncio.sleep(0.001)
+                context.steps.append(step + 1)
+                await p.checkpoint(step + 1)
+
+    with Pausable.use_controller(controller):
+        context.main_task = context.loop.create_task(counter())
+
+    def _close():
+        context.main_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            run(context.loop, context.main_task)
+        log.close()
+
+    context.add_cleanup(_close)
+
+
+@given('a script whose task "{name}" counts to {goal:d} and checkpoints after every step')
+def step_counting_script(context, name, goal):
+    context.counter_name = name
+    context.counter_goal = goal
+    _start(context)
+
+
+async def _until(context, steps):
+    while len(context.steps) < steps:
+        await asyncio.sleep(0.001)
+
+
+@when("the script is stopped after {steps:d} steps")
+def step_stop_after(context, steps):
+    run(context.loop, _until(context, steps))
+    context.main_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        run(context.loop, context.main_task)
+    context.last_step = context.steps[-1]
+    context.log.close()
+
+
+@when("the script is paused after {steps:d} steps")
+def step_pause_after(context, steps):
+    run(context.loop, _until(context, steps))
+    context.on_disk_before_pause = _on_disk(context)
+    context.controller.pause()
+    run(context.loop, context.controller.wait_all_paused(timeout=2.0))
+    context.last_step = context.steps[-1]
+
+
+@when("the script runs to completion")
+def step_run_to_completion(context):
+    run(context.loop, asyncio.wait_for(context.main_task, timeout=5.0))
+
+
+@when("the last checkpoint record is cut short")
+def step_cut_last_record(context):
+    with open(context.checkpoint_path, "r+b") as f:
+        f.truncate(os.path.getsize(context.checkpoint_path) - 3)
+
+
+@when("the script is started again on the same checkpoint log")
+def step_restart(context):
+    _start(context)
+
+
+@then('task "{name}" continues from its last completed step')
+def step_continues(context, name):
+    run(context.loop, _until(context, 1))
+    assert context.started_from == context.last_step, (context.started_from, context.last_step)
+
+
+@then('task "{name}" continues from the step before its last completed step')
+def step_continues_before(context, name):
+    run(context.loop, _until(context, 1))
+    assert context.started_from == context.last_step - 1, (context.started_from, context.last_step)
+
+
+@then('task "{name}" counts to {goal:d}')
+def step_counts_to(context, name, goal):
+    run(context.loop, asyncio.wait_for(context.main_task, timeout=5.0))
+    assert context.steps[-1] == goal
+
+
+def _on_disk(context):
+    with CheckpointLog(context.checkpoint_path) as log:
+        return {key: log.load(key) for key in log.keys()}
+
+
+@then('the checkpoint log on disk holds the last completed step of task "{name}"')
+def step_on_disk(context, name):
+    assert _on_disk(context) == {name: context.last_step}
+
+
+@then('the checkpoint log on disk holds nothing for task "{name}"')
+def step_nothing_on_disk(context, name):
+    assert name not in _on_disk(context)
+
+
+@then("nothing was written to the checkpoint log before the pause")
+def step_nothing_before_pause(context):
+    assert context.on_disk_before_pause == {}, context.on_disk_before_pause
@@ -1,11 +1,12 @@
 import asyncio
+import time
 from dataclasses import dataclass, field
 from typing import Dict
 
 import grpc
 from google.protobuf import empty_pb2
 
-from puppemon_py_script import ScriptServicer, script_pb2_grpc
+from puppemon_py_script import ScriptServicer, script_pb2_grpc, start_server
 from puppemon_py_script.pausable import Pausable, PausableController
 from puppemon_py_script.generated import script_pb2
 
@@ -29,6 +30,7 @@ class ScriptClient:
     async def resume(self):
         async with grpc.aio.insecure_channel(self._addr) as channel:
             stub = script_pb2_grpc.ScriptStub(channel)
+            # Old clients send Empty; the server must keep accepting it
             return await stub.Resume(empty_pb2.Empty())
 
     async def stop(self):
@@ -36,6 +38,13 @@ class ScriptClient:
             stub = script_pb2_grpc.ScriptStub(channel)
             return await stub.Stop(empty_pb2.Empty())
 
+    async def watch_state(self, include_tasks: bool = True):
+        async with grpc.aio.insecure_channel(self._addr) as channel:
+            stub = script_pb2_grpc.ScriptStub(channel)
+            request = script_pb2.WatchStateRequest(include_tasks=include_tasks)
+            async for state in stub.WatchState(request):
+                yield state
+
     async def call_unknown(self) -> bool:
         async with grpc.aio.insecure_channel(self._addr) as channel:
             method = channel.unary_unary("/script.Script/Unknown")
@@ -55,6 +64,11 @@ class RunningScript:
     controller: PausableController
     stop_event: asyncio.Event
     task_config: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    target: str = ""
+
+
+# Pause groups of the dummy tasks
+TASK_TAGS = {"A": ("motion",), "B": ("telemetry",)}
 
 
 async def _run_dummy_tasks(running: RunningScript):
@@ -63,7 +77,12 @@ async def _run_dummy_tasks(running: RunningScript):
     Pausable.set_controller(controller)
 
     async def task(name: str):
-        with Pausable(name=name) as p:
+        async def pause_cb():
+            delay = float(running.task_config.get(name, {}).get("pause_cb_delay", 0.0))
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        with Pausable(name=name, tags=TASK_TAGS[name], pause_cb=pause_cb) as p:
             while not stop_event.is_set():
                 await asyncio.sleep(0)
                 cfg = running.task_config.get(name, {})
@@ -76,7 +95,9 @@ async def _run_dummy_tasks(running: RunningScript):
     await asyncio.gather(task("A"), task("B"))
 
 
-async def start_server_with_tasks(loop: asyncio.AbstractEventLoop) -> RunningScript:
+async def start_server_with_tasks(
+    loop: asyncio.AbstractEventLoop, address: str = "127.0.0.1:0"
+) -> RunningScript:
     controller = PausableController()
     stop_event = asyncio.Event()
     dummy = RunningScript(
@@ -91,14 +112,20 @@ async def start_server_with_tasks(loop: asyncio.AbstractEventLoop) -> RunningScr
     main_task = loop.create_task(_run_dummy_tasks(dummy))
     dummy.main_task = main_task
 
-    server = grpc.aio.server()
     servicer = ScriptServicer(
         controller, main_task, user_stop_cb=lambda: stop_event.set(), kill_on_stop=False
     )
-    script_pb2_grpc.add_ScriptServicer_to_server(servicer, server)
-    port = server.add_insecure_port("127.0.0.1:0")
-    await server.start()
+    server, port = await start_server(servicer, address)
     dummy.server = server
     dummy.servicer = servicer
     dummy.port = port
+    dummy.target = address if address.startswith("unix:") else f"127.0.0.1:{port}"
     return dummy
+
+
+def checkpointed_work(token, steps: int, step_seconds: float) -> int:
+    """Blocking executor work with a pause checkpoint per step; module level so process pools can pickle it."""
+    for _ in range(steps):
+        token.checkpoint()
+        time.sleep(step_seconds)
+    return steps
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import grpc
+from behave import given, when, then
+
+from features.steps.common import RunningScript, run
+from puppemon_py_script import ScriptClient
+
+
+async def _outcome(call):
+    try:
+        await call
+    except grpc.aio.AioRpcError as e:
+        return e
+    return None
+
+
+@given("task {name:S} reaches a pausable point every {seconds:d} seconds")
+def step_task_pause_interval(context, name, seconds):
+    context.running.task_config.setdefault(name, {})["pause_delay"] = float(seconds)
+
+
+@when("{count:d} clients send the PAUSE command with a timeout of {seconds:d} seconds at the same time")
+def step_concurrent_pauses(context, count, seconds):
+    server: RunningScript = context.running
+    context.generation_before = server.controller.generation
+
+    async def _run():
+        clients = [ScriptClient(server.target) for _ in range(count)]
+        try:
+            return await asyncio.gather(*(_outcome(c.pause(seconds, deadline=seconds + 5.0)) for c in clients))
+        finally:
+            for client in clients:
+                await client.close()
+
+    context.pause_errors = run(context.loop, _run())
+
+
+@when(
+    'one client pauses group "{group}" with a timeout of {first:d} second while another pauses groups'
+    ' "{a}" and "{b}" with a timeout of {second:d} seconds'
+)
+def step_overlapping_group_pauses(context, group, first, a, b, second):
+    server: RunningScript = context.running
+
+    async def _run():
+        async with ScriptClient(server.target) as one, ScriptClient(server.target) as other:
+            short = asyncio.ensure_future(_outcome(one.pause(first, groups=[group], deadline=first + 5.0)))
+            # Let the short pause start its flight first, so the overlapping one finds its group already paused
+            await asyncio.sleep(0.05)
+            long = asyncio.ensure_future(_outcome(other.pause(second, groups=[a, b], deadline=second + 5.0)))
+            return await asyncio.gather(short, long)
+
+    context.pause_errors = run(context.loop, _run())
+
+
+@when(
+    "a client sends the PAUSE command with a timeout of {seconds:d} seconds and another sends the RESUME command"
+    " before the tasks park"
+)
+def step_pause_then_resume(context, seconds):
+    server: RunningScript = context.running
+
+    async def _run():
+        async with ScriptClient(server.target) as pauser, ScriptClient(server.target) as resumer:
+            started = time.perf_counter()
+            pause = asyncio.ensure_future(_outcome(pauser.pause(seconds, deadline=seconds + 5.0)))
+            await asyncio.sleep(0.1)
+            await resumer.resume(deadline=5.0)
+            context.pause_error = await pause
+            context.pause_elapsed = time.perf_counter() - started
+            context.pause_timeout = seconds
+
+    run(context.loop, _run())
+
+
+@then("every client receives success")
+def step_every_client_succeeds(context):
+    assert context.pause_errors and all(e is None for e in context.pause_errors), context.pause_errors
+
+
+@then("the pause generation advanced by {count:d}")
+def step_generation_advanced(context, count):
+    assert context.running.controller.generation - context.generation_before == count
+
+
+@then("the metrics count {count:d} coalesced pauses")
+def step_coalesced_pauses(context, count):
+    assert context.running.servicer.metrics.pauses_coalesced == count
+
+
+@then("the first client receives a timeout error and the second succeeds")
+def step_first_times_out(context):
+    first, second = context.pause_errors
+    assert first is not None and first.code() == grpc.StatusCode.DEADLINE_EXCEEDED, first
+    assert second is None, second
+
+
+@then("the pausing client receives an aborted error without waiting for the timeout")
+def step_pause_aborted(context):
+    assert context.pause_error is not None and context.pause_error.code() == grpc.StatusCode.ABORTED
+    assert context.pause_elapsed < context.pause_timeout / 2
@@ -0,0 +1,66 @@
+import asyncio
+
+import grpc
+from behave import when, then
+
+from features.steps.common import RunningScript, run
+from puppemon_py_script import ScriptClient
+
+
+def _stop(context, seconds, resume_while_draining=False):
+    server: RunningScript = context.running
+
+    async def _call():
+        async with ScriptClient(server.target) as client:
+            stop = asyncio.ensure_future(client.stop(seconds, deadline=seconds + 5.0))
+            if resume_while_draining:
+                await asyncio.sleep(0.1)
+                try:
+                    await client.resume(deadline=5.0)
+                    context.resume_error = None
+                except grpc.aio.AioRpcError as e:
+                    context.resume_error = e
+            context.stop_response = await stop
+
+    run(context.loop, _call())
+
+
+@when("the client sends the STOP command with a drain timeout of {seconds:d} seconds")
+@when("the client sends the STOP command with a drain timeout of {seconds:d} second")
+def step_drain_stop(context, seconds):
+    _stop(context, seconds)
+
+
+@when(
+    "the client sends the STOP command with a drain timeout of {seconds:d} second and a RESUME command while"
+    " it drains"
+)
+def step_drain_stop_resume(context, seconds):
+    _stop(context, seconds, resume_while_draining=True)
+
+
+def _names(tasks):
+    return sorted(t.name for t in tasks)
+
+
+@then("tasks A and B are reported as drained and no task as cancelled")
+def step_all_drained(context):
+    assert _names(context.stop_response.drained) == ["A", "B"]
+    assert not context.stop_response.cancelled
+
+
+@then("task {drained:S} is reported as drained and task {cancelled:S} as cancelled")
+def step_drained_and_cancelled(context, drained, cancelled):
+    assert _names(context.stop_response.drained) == [drained]
+    assert _names(context.stop_response.cancelled) == [cancelled]
+
+
+@then("the drain took about {seconds:d} second")
+def step_drain_time(context, seconds):
+    assert abs(context.stop_response.drain_seconds - seconds) < 0.3, context.stop_response.drain_seconds
+
+
+@then("the RESUME command is rejected with {code}")
+def step_resume_rejected(context, code):
+    assert context.resume_error is not None
+    assert context.resume_error.code() == getattr(grpc.StatusCode, code), context.resume_error
@@ -0,0 +1,95 @@
+import asyncio
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from behave import given, when, then
+
+from features.steps.common import checkpointed_work, run
+from puppemon_py_script.executor import SharedPauseToken
+from puppemon_py_script.pausable import Pausable
+
+
+@given("a task that runs {steps:d} steps of {millis:d} milliseconds in a {pool} pool")
+def step_executor_task(context, steps, millis, pool):
+    if pool == "thread":
+        executor = ThreadPoolExecutor(1)
+    else:
+        executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn"))
+    # Start the worker up front so the scenario does not time process start-up
+    executor.submit(int).result(timeout=30)
+    context.add_cleanup(executor.shutdown)
+    context.callbacks = []
+
+    async def pause_cb():
+        context.callbacks.append(("pause", threading.get_ident()))
+
+    async def resume_cb():
+        context.callbacks.append(("resume", threading.get_ident()))
+        context.resume_cb_at = context.loop.time()
+
+    # Replace the background's idle pausable so this task is the only one registered
+    context.pausable.close()
+    context.pausable = Pausable(pause_cb=pause_cb, resume_cb=resume_cb, name="worker")
+    context.steps = steps
+
+    async def worker():
+        context.started_at = context.loop.time()
+        result = await context.pausable.run_in_executor(
+            checkpointed_work, steps, millis / 1000.0, executor=executor
+        )
+        context.received.append(result)
+        context.finished_at = context.loop.time()
+
+    context.worker = context.loop.create_task(worker())
+    run(context.loop, asyncio.sleep(0))
+
+
+@when("the task has run {millis:d} milliseconds and the script is paused")
+def step_pause_after_running(context, millis):
+    run(context.loop, asyncio.sleep(millis / 1000.0))
+    context.controller.pause()
+    context.paused_at = context.loop.time()
+
+
+@then("the pause callback ran on the event loop thread")
+def step_pause_cb_on_loop(context):
+    assert context.callbacks == [("pause", threading.get_ident())], context.callbacks
+
+
+@then("the work makes no progress while paused")
+def step_no_progress(context):
+    hold = 0.3
+    run(context.loop, asyncio.sleep(hold))
+    assert not context.worker.done()
+    context.held_for = hold
+
+
+@then("the resume callback ran on the event loop thread")
+def step_resume_cb_on_loop(context):
+    run(context.loop, asyncio.sleep(0.02))
+    assert context.callbacks[-1] == ("resume", threading.get_ident()), context.callbacks
+
+
+@then("the task returns the work result")
+def step_work_result(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=5.0))
+    assert context.received == [context.steps]
+    # The work itself takes ~0.5 s; the pause must have added the hold on top of it
+    assert context.finished_at - context.started_at >= 0.5 + context.held_for - 0.05
+
+
+@when("a process pool token is closed before the worker unpickles it")
+def step_token_closed_early(context):
+    token = SharedPauseToken()
+    token._hold()
+    payload = pickle.dumps(token)
+    token._close()
+    context.worker_token = pickle.loads(payload)
+
+
+@then("the worker's token reads not paused and its checkpoint returns at once")
+def step_token_unpaused(context):
+    assert not context.worker_token.paused
+    context.worker_token.checkpoint()
@@ -0,0 +1,73 @@
+import socket
+
+import grpc
+from behave import given, when, then
+
+from features.steps.common import run, RunningScript
+from puppemon_py_script import ScriptFleet
+
+
+def _unused_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@given("a fleet made of the script and an unreachable script server")
+def step_fleet(context):
+    server: RunningScript = context.running
+    context.script_target = f"127.0.0.1:{server.port}"
+    context.dead_target = f"127.0.0.1:{_unused_port()}"
+    context.fleet = ScriptFleet([context.script_target, context.dead_target], max_concurrency=2)
+
+
+@given("a fleet made of the script and a script server whose client fails with an OSError")
+def step_fleet_failing_client(context):
+    server: RunningScript = context.running
+    context.script_target = f"127.0.0.1:{server.port}"
+    context.failing_target = f"127.0.0.1:{_unused_port()}"
+    context.fleet = ScriptFleet([context.script_target, context.failing_target], max_concurrency=2)
+
+    async def _fail(*args, **kwargs):
+        raise OSError("connection setup failed")
+
+    # Anything but an AioRpcError, as raised while building a channel
+    context.fleet._clients[context.failing_target].pause = _fail
+
+
+def _fan_out(context, method: str, seconds: int):
+    async def _call():
+        try:
+            return await getattr(context.fleet, method)(deadline=float(seconds))
+        finally:
+            await context.fleet.close()
+
+    context.fleet_results = run(context.loop, _call())
+
+
+@when("the operator pauses the fleet with a deadline of {seconds:d} second")
+def step_fleet_pause(context, seconds):
+    _fan_out(context, "pause", seconds)
+
+
+@when("the operator resumes the fleet with a deadline of {seconds:d} second")
+def step_fleet_resume(context, seconds):
+    _fan_out(context, "resume", seconds)
+
+
+@then("the fleet reports the script as paused")
+@then("the fleet reports the script as resumed")
+def step_fleet_ok(context):
+    assert context.fleet_results[context.script_target].ok
+
+
+@then("the fleet reports the unreachable script as failed")
+def step_fleet_failed(context):
+    assert not context.fleet_results[context.dead_target].ok
+
+
+@then("the fleet reports the failing script as failed with the OSError")
+def step_fleet_failed_oserror(context):
+    result = context.fleet_results[context.failing_target]
+    assert result.code == grpc.StatusCode.UNKNOWN
+    assert result.details == "OSError: connection setup failed", result.details
@@ -0,0 +1,87 @@
+import asyncio
+
+import grpc
+from behave import given, when, then
+
+from features.steps.common import TASK_TAGS, run, RunningScript
+from puppemon_py_script import ScriptClient
+
+
+@given('task A is tagged "{tag_a}" and task B is tagged "{tag_b}"')
+def step_task_tags(context, tag_a, tag_b):
+    assert TASK_TAGS == {"A": (tag_a,), "B": (tag_b,)}
+
+
+def _client_call(context, call):
+    server: RunningScript = context.running
+
+    async def _call():
+        async with ScriptClient(server.target) as client:
+            try:
+                await call(client)
+                context.pause_error = None
+            except grpc.aio.AioRpcError as e:
+                context.pause_error = e
+
+    run(context.loop, _call())
+
+
+@when('the client sends the PAUSE command for group "{group}"')
+def step_pause_group(context, group):
+    _client_call(context, lambda c: c.pause(groups=[group], deadline=5.0))
+
+
+@when('the client sends the PAUSE command for group "{group}" with a timeout of {seconds:d} second')
+def step_pause_group_timeout(context, group, seconds):
+    _client_call(context, lambda c: c.pause(seconds, groups=[group], deadline=seconds + 5.0))
+
+
+@when('the client sends the RESUME command for group "{group}"')
+def step_resume_group(context, group):
+    _client_call(context, lambda c: c.resume(groups=[group], deadline=5.0))
+
+
+def _task(context, name: str):
+    (task,) = [t for t in context.running.controller.snapshot().tasks if t.name == name]
+    return task
+
+
+def _hits(context, name: str) -> int:
+    (task,) = [t for t in context.running.controller.task_metrics() if t.name == name]
+    return task.hits
+
+
+@then("task {name:S} halts at its next pausable point")
+def step_task_halts(context, name):
+    run(context.loop, asyncio.sleep(0.05))
+    assert _task(context, name).parked
+    # A group pause is not a global pause
+    assert context.running.controller.is_paused is False
+
+
+def _keeps_running(context, name: str) -> None:
+    before = _hits(context, name)
+    run(context.loop, asyncio.sleep(0.05))
+    assert not _task(context, name).parked
+    assert _hits(context, name) > before
+
+
+@then("task {name:S} keeps running")
+def step_task_keeps_running(context, name):
+    _keeps_running(context, name)
+
+
+@then("tasks A and B keep running")
+def step_tasks_keep_running(context):
+    _keeps_running(context, "A")
+    _keeps_running(context, "B")
+
+
+@then('the paused groups are "{groups}"')
+def step_paused_groups(context, groups):
+    assert context.running.controller.snapshot().paused_groups == tuple(groups.split(","))
+
+
+@then("no group is paused")
+def step_no_group_paused(context):
+    assert context.running.controller.snapshot().paused_groups == ()
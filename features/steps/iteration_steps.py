@@ -0,0 +1,85 @@
+import asyncio
+
+from behave import given, when, then
+
+from features.steps.common import run
+
+
+async def _endless():
+    i = 0
+    while True:
+        yield i
+        i += 1
+        await asyncio.sleep(0.001)
+
+
+@given("a task consuming an endless async stream with the pausable iterator")
+def step_iterating_task(context):
+    context.consumed = []
+
+    async def worker():
+        async for item in context.pausable.iterate(_endless()):
+            context.consumed.append(item)
+
+    context.worker = context.loop.create_task(worker())
+    run(context.loop, asyncio.sleep(0.02))
+    assert context.consumed
+
+
+@then("the task consumes no more items while parked")
+def step_no_items_while_parked(context):
+    before = len(context.consumed)
+    run(context.loop, asyncio.sleep(0.05))
+    assert len(context.consumed) == before
+
+
+@then("the task consumes items again")
+def step_consumes_again(context):
+    before = len(context.consumed)
+    run(context.loop, asyncio.sleep(0.05))
+    assert len(context.consumed) > before
+    assert context.consumed == list(range(len(context.consumed)))
+    context.worker.cancel()
+
+
+@when("a task consumes {count:d} items in batches of {size:d}")
+def step_consume_batches(context, count, size):
+    async def consume():
+        return [batch async for batch in context.pausable.iterate_batches(range(count), size)]
+
+    context.count = count
+    context.batches = run(context.loop, consume())
+
+
+@then("it receives {count:d} batches with every item in order")
+def step_batches(context, count):
+    assert len(context.batches) == count
+    assert [x for batch in context.batches for x in batch] == list(range(context.count))
+
+
+@then("it passed {count:d} pause points")
+def step_pause_points(context, count):
+    assert context.controller.task_metrics()[0].hits == count
+
+
+@when(
+    "a task consumes a stream producing an item every {interval:d} milliseconds in batches of {size:d}"
+    " with a maximum delay of {delay:d} milliseconds"
+)
+def step_consume_slow(context, interval, size, delay):
+    async def slow():
+        for i in range(20):
+            await asyncio.sleep(interval / 1000.0)
+            yield i
+
+    async def consume():
+        batches = context.pausable.iterate_batches(slow(), size, max_delay=delay / 1000.0)
+        return [batch async for batch in batches]
+
+    context.batches = run(context.loop, consume())
+
+
+@then("no batch holds more than {count:d} items")
+def step_batch_bound(context, count):
+    assert max(len(b) for b in context.batches) <= count, [len(b) for b in context.batches]
+    assert [x for batch in context.batches for x in batch] == list(range(20))
@@ -0,0 +1,136 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from behave import given, then
+
+from features.steps.common import RunningScript
+from puppemon_py_script.journal import HEADER_SIZE, _RECORD, EventJournal, EventKind, read_journal
+
+
+def _attach_journal(context, record_hits: bool):
+    server: RunningScript = context.running
+    tmp = tempfile.TemporaryDirectory()
+    context.journal_path = os.path.join(tmp.name, "script.journal")
+    journal = EventJournal(context.journal_path, capacity=4096)
+    server.controller.attach_journal(journal, record_hits=record_hits)
+
+    def _cleanup():
+        server.controller.attach_journal(None)
+        journal.close()
+        tmp.cleanup()
+
+    context.add_cleanup(_cleanup)
+
+
+@given("the script writes an event journal")
+def step_attach_journal(context):
+    _attach_journal(context, record_hits=False)
+
+
+@given("the script writes an event journal including pause point hits")
+def step_attach_journal_hits(context):
+    _attach_journal(context, record_hits=True)
+
+
+@then("the journal can be decoded without stopping the script")
+def step_decode_journal(context):
+    assert not context.running.main_task.done()
+    context.journal_records = read_journal(context.journal_path)
+    assert context.journal_records
+
+
+def _kinds(context):
+    return [r.kind for r in context.journal_records]
+
+
+@then("the journal records the PAUSE request, the new generation and both tasks parking")
+def step_journal_pause(context):
+    kinds = _kinds(context)
+    assert EventKind.RPC_PAUSE in kinds
+    generation = context.running.controller.generation
+    requested = [r for r in context.journal_records if r.kind == EventKind.PAUSE_REQUESTED]
+    assert [r.value for r in requested] == [generation]
+    parked = [r for r in context.journal_records if r.kind == EventKind.TASK_PARKED]
+    assert len({r.handle for r in parked}) == 2
+    assert kinds.index(EventKind.RPC_PAUSE) < kinds.index(EventKind.PAUSE_REQUESTED)
+
+
+@then("the journal records the RESUME request")
+def step_journal_resume(context):
+    kinds = _kinds(context)
+    assert EventKind.RPC_RESUME in kinds and EventKind.RESUMED in kinds
+
+
+@then("the journal records pause point hits")
+def step_journal_hits(context):
+    records = read_journal(context.journal_path)
+    assert any(r.kind == EventKind.PAUSE_POINT_HIT for r in records)
+
+
+def _journal_path(context) -> str:
+    tmp = tempfile.TemporaryDirectory()
+    context.add_cleanup(tmp.cleanup)
+    return os.path.join(tmp.name, "lapped.journal")
+
+
+@given("a full journal whose writer has filled in the next slot but not yet published it")
+def step_half_written_journal(context):
+    context.journal_path = _journal_path(context)
+    with EventJournal(context.journal_path, capacity=4) as journal:
+        for seq in range(4):
+            journal.record(EventKind.PAUSE_POINT_HIT, seq, seq)
+        # What `record` does for record 4 before it publishes the count: overwrite the slot of record 0
+        _RECORD.pack_into(journal._mm, HEADER_SIZE, time.monotonic_ns(), EventKind.STOPPING, 0, 0, 4)
+
+
+@then("reading the journal drops the record of that slot")
+def step_drops_half_written(context):
+    records = read_journal(context.journal_path)
+    assert [(r.seq, r.value) for r in records] == [(1, 1), (2, 2), (3, 3)], records
+
+
+# Writes records whose handle and value are their own sequence number until it is killed
+_LAPPING_WRITER = """
+import sys
+from puppemon_py_script.journal import EventJournal, EventKind
+
+journal = EventJournal(sys.argv[1], capacity=int(sys.argv[2]))
+print("ready", flush=True)
+seq = 0
+while True:
+    journal.record(EventKind.PAUSE_POINT_HIT, seq, seq)
+    seq += 1
+"""
+
+
+@given("a writer process that keeps lapping a small journal ring")
+def step_lapping_writer(context):
+    context.journal_path = _journal_path(context)
+    writer = subprocess.Popen(
+        [sys.executable, "-c", _LAPPING_WRITER, context.journal_path, "8"], stdout=subprocess.PIPE, text=True
+    )
+
+    def _stop():
+        writer.kill()
+        writer.wait()
+        writer.stdout.close()
+
+    context.add_cleanup(_stop)
+    # The file is only safe to map once the writer has sized it and written the header
+    assert writer.stdout.readline().strip() == "ready"
+    context.writer = writer
+
+
+@then("every record read while it writes is one the writer wrote with that sequence number")
+def step_consistent_reads(context):
+    deadline = time.monotonic() + 0.5
+    reads = 0
+    while time.monotonic() < deadline:
+        records = read_journal(context.journal_path)
+        for r in records:
+            assert r.value == r.seq and r.handle == r.seq & 0xFFFFFFFF, r
+        reads += 1
+    assert reads > 0 and context.writer.poll() is None
@@ -0,0 +1,111 @@
+import asyncio
+import functools
+
+from behave import when, then
+
+from features.steps.common import TASK_TAGS, run, RunningScript
+from puppemon_py_script import ScriptClient
+from puppemon_py_script.metrics import serve_prometheus
+from puppemon_py_script.pausable import Pausable
+
+
+@when("the client requests the metrics")
+def step_request_metrics(context):
+    server: RunningScript = context.running
+
+    async def _call():
+        async with ScriptClient(server.target) as client:
+            return await client.get_metrics(deadline=5.0)
+
+    context.metrics = run(context.loop, _call())
+
+
+@then("the metrics report pause point hits for tasks A and B")
+def step_metrics_hits(context):
+    hits = {t.name: t.hits for t in context.metrics.tasks}
+    assert hits.get("A", 0) > 0 and hits.get("B", 0) > 0, hits
+
+
+@then("the metrics report one park per task with its time to park")
+def step_metrics_parks(context):
+    assert context.metrics.pauses_total == 1
+    assert {t.name: t.parks for t in context.metrics.tasks} == {"A": 1, "B": 1}
+    assert context.metrics.time_to_park_seconds.count == 2
+    assert all(t.max_time_to_park_seconds >= 0 for t in context.metrics.tasks)
+
+
+@then("the metrics count one PAUSE and one RESUME request")
+def step_metrics_rpc_counts(context):
+    assert context.metrics.rpc_counts["Pause"] == 1
+    assert context.metrics.rpc_counts["Resume"] == 1
+    assert context.metrics.pause_rpc_seconds.count == 1
+
+
+def _scrape(context, per_task: bool):
+    server: RunningScript = context.running
+    render = functools.partial(server.servicer.render_prometheus, per_task=per_task)
+
+    async def _fetch():
+        http = await serve_prometheus(render, "127.0.0.1", 0)
+        try:
+            port = http.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics HTTP/1.0\r\n\r\n")
+            await writer.drain()
+            body = await reader.read()
+            writer.close()
+            return body.decode()
+        finally:
+            http.close()
+            await http.wait_closed()
+
+    context.scrape = run(context.loop, _fetch())
+    assert context.scrape.startswith("HTTP/1.0 200 OK")
+
+
+@when("a Prometheus scraper fetches the metrics endpoint")
+def step_scrape(context):
+    _scrape(context, per_task=False)
+
+
+@when("a Prometheus scraper fetches the metrics endpoint with series per task")
+def step_scrape_per_task(context):
+    _scrape(context, per_task=True)
+
+
+@then("the scrape contains the pause point hit counter of the pause group of task A")
+def step_scrape_group(context):
+    (group,) = TASK_TAGS["A"]
+    assert f'puppemon_group_pause_point_hits_total{{group="{group}"}}' in context.scrape, context.scrape
+    assert f'puppemon_group_tasks{{group="{group}"}} 1' in context.scrape, context.scrape
+
+
+@then("the scrape has no series per task")
+def step_scrape_no_tasks(context):
+    assert 'task="' not in context.scrape
+
+
+@then("the scrape contains the pause point hit counter for task A")
+def step_scrape_contains(context):
+    assert 'puppemon_pause_point_hits_total{task="A"' in context.scrape
+
+
+@when('a task of pause group "{group}" hits {count:d} pause points and finishes')
+def step_short_lived_task(context, group, count):
+    server: RunningScript = context.running
+
+    async def _task():
+        with Pausable.use_controller(server.controller):
+            p = Pausable(name="short-lived", tags=[group])
+        with p:
+            for _ in range(count):
+                await p.maybe_pause()
+
+    run(context.loop, _task())
+
+
+@then('the Prometheus metrics count {count:d} pause point hits and no registered task in pause group "{group}"')
+def step_group_counts_retired(context, count, group):
+    scrape = context.running.servicer.render_prometheus()
+    assert f'puppemon_group_pause_point_hits_total{{group="{group}"}} {count}' in scrape, scrape
+    assert f'puppemon_group_tasks{{group="{group}"}} 0' in scrape, scrape
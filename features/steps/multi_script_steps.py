@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+from collections import Counter
+
+import grpc
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script import ScriptClient, start_scripts
+from puppemon_py_script.pausable import Pausable
+
+
+@given('scripts "{first}" and "{second}" running in one process behind one control server')
+def step_scripts_in_one_process(context, first, second):
+    context.progress = Counter()
+
+    def script(script_id):
+        async def user_main():
+            with Pausable(name=f"{script_id}-worker") as p:
+                while True:
+                    await p.maybe_pause()
+                    context.progress[script_id] += 1
+                    await asyncio.sleep(0.005)
+
+        return user_main, None
+
+    server, port, router = run(
+        context.loop, start_scripts({first: script(first), second: script(second)}, "127.0.0.1:0")
+    )
+    context.router = router
+    context.target = f"127.0.0.1:{port}"
+
+    async def _stop():
+        for script_id in router.script_ids:
+            router.get(script_id)._user_main_task.cancel()
+        await server.stop(0)
+
+    context.add_cleanup(lambda: run(context.loop, _stop()))
+    run(context.loop, asyncio.sleep(0.05))
+
+
+def _call(context, script_id, call):
+    async def _run():
+        async with ScriptClient(context.target, script_id=script_id) as client:
+            try:
+                context.rpc_result = await call(client)
+                context.rpc_error = None
+            except grpc.aio.AioRpcError as e:
+                context.rpc_error = e
+
+    run(context.loop, _run())
+
+
+@when('the client sends the PAUSE command to script "{script_id}"')
+def step_pause_script(context, script_id):
+    _call(context, script_id, lambda c: c.pause(deadline=5.0))
+
+
+@when("the client sends the PAUSE command without a script ID")
+def step_pause_without_id(context):
+    _call(context, None, lambda c: c.pause(deadline=5.0))
+
+
+@when('the client sends the STOP command to script "{script_id}"')
+def step_stop_script(context, script_id):
+    _call(context, script_id, lambda c: c.stop(deadline=5.0))
+    assert context.rpc_error is None, context.rpc_error
+
+
+def _controller(context, script_id):
+    return context.router.get(script_id).controller
+
+
+@then('the tasks of script "{script_id}" halt at their next pausable point')
+def step_script_halts(context, script_id):
+    assert context.rpc_error is None, context.rpc_error
+    run(context.loop, asyncio.sleep(0.05))
+    assert all(t.parked for t in _controller(context, script_id).snapshot().tasks)
+    before = context.progress[script_id]
+    run(context.loop, asyncio.sleep(0.05))
+    assert context.progress[script_id] == before
+
+
+@then('the tasks of script "{script_id}" keep running')
+def step_script_runs(context, script_id):
+    assert not _controller(context, script_id).is_paused
+    before = context.progress[script_id]
+    run(context.loop, asyncio.sleep(0.05))
+    assert context.progress[script_id] > before
+
+
+@then('the metrics of script "{script_id}" list only task "{name}"')
+def step_metrics_tasks(context, script_id, name):
+    _call(context, script_id, lambda c: c.get_metrics(deadline=5.0))
+    assert context.rpc_error is None, context.rpc_error
+    assert [t.name for t in context.rpc_result.tasks] == [name]
+
+
+@then('the main task of script "{script_id}" is cancelled')
+def step_main_cancelled(context, script_id):
+    task = context.router.get(script_id)._user_main_task
+    with contextlib.suppress(asyncio.CancelledError):
+        run(context.loop, asyncio.wait_for(asyncio.shield(task), timeout=2.0))
+    assert task.cancelled()
+
+
+@then("the server rejects the call with {code}")
+def step_error_code(context, code):
+    assert context.rpc_error is not None
+    assert context.rpc_error.code() == getattr(grpc.StatusCode, code), context.rpc_error
@@ -0,0 +1,74 @@
+import grpc
+from behave import given, when, then
+
+from features.steps.common import RunningScript, run
+from puppemon_py_script import ScriptClient, pause_report
+
+
+@given("task {name:S} spends {millis:d} milliseconds in its pause callback")
+def step_pause_cb_delay(context, name, millis):
+    context.running.task_config.setdefault(name, {})["pause_cb_delay"] = millis / 1000.0
+
+
+def _pause(context, seconds, wait_full_timeout=False):
+    server: RunningScript = context.running
+
+    async def _call():
+        async with ScriptClient(server.target) as client:
+            try:
+                context.report = await client.pause(
+                    seconds, deadline=seconds + 5.0, wait_full_timeout=wait_full_timeout
+                )
+                context.pause_error = None
+            except grpc.aio.AioRpcError as e:
+                context.report = pause_report(e)
+                context.pause_error = e
+
+    run(context.loop, _call())
+
+
+@when("the client sends the PAUSE command with a timeout of {seconds:d} seconds and keeps the report")
+def step_pause_keep_report(context, seconds):
+    _pause(context, seconds)
+
+
+@when("the client sends the PAUSE command with a timeout of {seconds:d} second, waiting the full timeout")
+def step_pause_full_timeout(context, seconds):
+    _pause(context, seconds, wait_full_timeout=True)
+
+
+def _by_name(tasks):
+    return {t.name: t for t in tasks}
+
+
+@then("the report is for the current pause generation")
+def step_report_generation(context):
+    assert context.pause_error is None, context.pause_error
+    assert context.report.generation == context.running.controller.generation > 0
+
+
+@then("the report lists tasks A and B as parked and no straggler")
+def step_report_all_parked(context):
+    assert sorted(_by_name(context.report.parked)) == ["A", "B"]
+    assert not context.report.stragglers
+
+
+@then("task {slow:S} took longer to park than task {fast:S}")
+def step_report_time_to_park(context, slow, fast):
+    parked = _by_name(context.report.parked)
+    assert parked[slow].time_to_park_seconds > parked[fast].time_to_park_seconds
+
+
+@then("task {name:S} reports a pause callback of about {millis:d} milliseconds")
+def step_report_pause_cb(context, name, millis):
+    task = _by_name(context.report.parked)[name]
+    assert task.HasField("pause_cb_seconds")
+    assert abs(task.pause_cb_seconds - millis / 1000.0) < 0.1, task.pause_cb_seconds
+
+
+@then("the report lists task {parked:S} as parked and task {straggler:S} as a straggler")
+def step_report_straggler(context, parked, straggler):
+    assert context.report is not None
+    assert list(_by_name(context.report.parked)) == [parked]
+    assert list(_by_name(context.report.stragglers)) == [straggler]
+    assert not context.report.stragglers[0].HasField("time_to_park_seconds")
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import grpc
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script import InProcessScriptClient, ScriptServicer
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@given('a script whose task "slow" reaches a pause point every {seconds:d} seconds')
+def step_slow_task(context, seconds):
+    context.clock = FakeClock()
+    context.controller = PausableController(clock=context.clock)
+    Pausable.set_controller(context.controller)
+    context.pausables = {"slow": (Pausable(name="slow"), float(seconds))}
+    context.idle = context.loop.create_task(asyncio.Event().wait())
+    context.servicer = ScriptServicer(context.controller, context.idle, None, kill_on_stop=False)
+
+
+@given('whose task "fast" reaches a pause point every {millis:d} milliseconds')
+def step_fast_task(context, millis):
+    context.pausables["fast"] = (Pausable(name="fast"), millis / 1000.0)
+
+    async def _simulate():
+        # Replay 2 minutes of pause-point hits on the fake clock, sampling every 500 ms like default_main
+        clock, controller = context.clock, context.controller
+        next_hit = {name: clock.now + interval for name, (_, interval) in context.pausables.items()}
+        end = clock.now + 120.0
+        while clock.now < end:
+            clock.now += 0.5
+            for name, (p, interval) in context.pausables.items():
+                while next_hit[name] <= clock.now:
+                    await p.maybe_pause()
+                    next_hit[name] += interval
+            controller.sample_intervals()
+        # The slow task last passed a pause point at t=120s; leave it one second into its next interval
+        clock.now += 1.0
+
+    run(context.loop, _simulate())
+
+
+def _pause(context, seconds: int, wait_full_timeout: bool):
+    async def _call():
+        client = InProcessScriptClient(context.servicer)
+        started = time.perf_counter()
+        try:
+            await client.pause(seconds, wait_full_timeout=wait_full_timeout)
+            context.pause_error = None
+        except grpc.aio.AioRpcError as e:
+            context.pause_error = e
+        context.pause_elapsed = time.perf_counter() - started
+
+    run(context.loop, _call())
+
+
+@when("the operator pauses the script with a timeout of {seconds:d} seconds")
+def step_pause_with_prediction(context, seconds):
+    _pause(context, seconds, wait_full_timeout=False)
+
+
+@when("the operator pauses the script with a timeout of {seconds:d} second, waiting the full timeout")
+def step_pause_full_timeout(context, seconds):
+    context.pause_timeout = seconds
+    _pause(context, seconds, wait_full_timeout=True)
+
+
+@then("the server responds with a timeout error without waiting for the timeout")
+def step_fail_fast(context):
+    assert context.pause_error is not None
+    assert context.pause_error.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert context.pause_elapsed < 0.5, context.pause_elapsed
+
+
+@then("the server responds with a timeout error after the timeout elapsed")
+def step_full_timeout(context):
+    assert context.pause_error is not None
+    assert context.pause_error.code() == grpc.StatusCode.DEADLINE_EXCEEDED
+    assert context.pause_elapsed >= context.pause_timeout * 0.9, context.pause_elapsed
+
+
+@then('the error names task "{name}" with its estimated time to park')
+def step_error_names_task(context, name):
+    details = context.pause_error.details()
+    assert f"{name} (~29.0s to park)" in details, details
+    assert "fast" not in details, details
+
+
+@then("no pause was requested from the tasks")
+def step_no_pause_requested(context):
+    assert context.controller.generation == 0
+    assert context.controller.state == "running"
+    assert context.servicer.metrics.pauses_rejected == 1
+
+
+@when("the client requests the metrics from the script")
+def step_request_metrics_in_process(context):
+    async def _call():
+        return await InProcessScriptClient(context.servicer).get_metrics()
+
+    context.metrics = run(context.loop, _call())
+
+
+@then('task "{name}" reports a pause point interval of about {seconds:d} seconds')
+def step_interval(context, name, seconds):
+    (task,) = [t for t in context.metrics.tasks if t.name == name]
+    assert abs(task.pause_point_interval_seconds - seconds) < 0.5, task
+
+
+@then('task "{name}" reports an estimated time to park of about {seconds:d} seconds')
+def step_estimated_time_to_park(context, name, seconds):
+    (task,) = [t for t in context.metrics.tasks if t.name == name]
+    assert task.HasField("estimated_time_to_park_seconds")
+    assert abs(task.estimated_time_to_park_seconds - seconds) < 0.5, task
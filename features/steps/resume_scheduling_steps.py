@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from behave import given, then
+
+from features.steps.common import run
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+@given("a pause controller with {count:d} parked tasks whose resume callbacks take {millis:d} milliseconds")
+def step_parked_tasks(context, count, millis):
+    context.controller = PausableController()
+    Pausable.set_controller(context.controller)
+    context.running_cbs = 0
+    context.max_running_cbs = 0
+    context.resumed = []
+
+    def make_resume_cb(name):
+        async def resume_cb():
+            context.running_cbs += 1
+            context.max_running_cbs = max(context.max_running_cbs, context.running_cbs)
+            await asyncio.sleep(millis / 1000.0)
+            context.running_cbs -= 1
+            context.resumed.append((name, time.perf_counter()))
+
+        return resume_cb
+
+    async def worker(p):
+        await p.maybe_pause()
+
+    # Priority equals the task number, so the resume order is known in advance
+    context.pausables = [
+        Pausable(resume_cb=make_resume_cb(f"task-{i}"), name=f"task-{i}", priority=i) for i in range(count)
+    ]
+    context.controller.pause()
+    # Shares "the script is resumed" with the pause-aware wait steps, which expects a `worker`
+    context.worker = asyncio.gather(*(worker(p) for p in context.pausables))
+    run(context.loop, context.controller.wait_all_paused(timeout=1.0))
+
+
+@given("a resume policy of at most {count:d} concurrent resumes")
+@given("a resume policy of at most {count:d} concurrent resume")
+def step_concurrency_policy(context, count):
+    context.controller.set_resume_policy(max_concurrent=count)
+
+
+@given("a resume policy of at most {rate:d} resumes per second")
+def step_rate_policy(context, rate):
+    context.controller.set_resume_policy(rate=rate)
+
+
+@then("every task resumes")
+def step_every_task_resumes(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=5.0))
+    assert len(context.resumed) == len(context.pausables)
+
+
+@then("at most {count:d} resume callbacks ran at the same time")
+def step_max_concurrent(context, count):
+    assert context.max_running_cbs == count, context.max_running_cbs
+
+
+@then("the tasks resumed from the highest to the lowest priority")
+def step_priority_order(context):
+    names = [name for name, _ in context.resumed]
+    assert names == [p.name for p in reversed(context.pausables)], names
+
+
+@then("the last task resumed at least {millis:d} milliseconds after the first")
+def step_ramp(context, millis):
+    times = [t for _, t in context.resumed]
+    assert max(times) - min(times) >= millis / 1000.0, max(times) - min(times)
+
+
+@then("the resume latency of each task grows with its position in the resume order")
+def step_resume_latency(context):
+    latency = {t.name: t.resume_latency for t in context.controller.task_metrics()}
+    ordered = [latency[name] for name, _ in context.resumed]
+    assert ordered == sorted(ordered), ordered
+    assert ordered[-1] >= 0.03 * len(ordered) * 0.9, ordered
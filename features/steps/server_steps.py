@@ -1,6 +1,11 @@
+import os
+import tempfile
+
 from behave import given, when, then
 
 from features.steps.common import run, start_server_with_tasks, RunningScript, ScriptClient
+from puppemon_py_script import InProcessScriptClient
+from puppemon_py_script import ScriptClient as LibraryScriptClient
 
 
 @given("a script started with an embedded gRPC control server")
@@ -63,3 +68,36 @@ def step_unknown_command(context):
 @then("the server responds with an error indicating the command is unsupported")
 def step_assert_unknown_error(context):
     assert getattr(context, "unknown_error", False)
+
+
+@given("a script started with a control server on a Unix domain socket")
+def step_start_unix_server(context):
+    # Replace the TCP server from the background with one bound to a socket file
+    run(context.loop, context.running.server.stop(0))
+    context.running.main_task.cancel()
+    context.socket_dir = tempfile.TemporaryDirectory()
+    context.add_cleanup(context.socket_dir.cleanup)
+    address = "unix:" + os.path.join(context.socket_dir.name, "script.sock")
+    context.running = run(context.loop, start_server_with_tasks(context.loop, address))
+
+
+def _pause_and_resume(context, client):
+    async def _call():
+        async with client:
+            await client.pause(deadline=5.0)
+            paused = context.running.controller.is_paused
+            await client.resume(deadline=5.0)
+            return paused
+
+    assert run(context.loop, _call()) is True
+    assert context.running.controller.is_paused is False
+
+
+@then("a client connected over the socket can pause and resume the script")
+def step_unix_pause_resume(context):
+    _pause_and_resume(context, LibraryScriptClient(context.running.target))
+
+
+@then("an in-process client can pause and resume the script")
+def step_in_process_pause_resume(context):
+    _pause_and_resume(context, InProcessScriptClient(context.running.servicer))
@@ -0,0 +1,112 @@
+import asyncio
+
+from behave import given, when, then
+
+from puppemon_py_script.pausable import Pausable
+from puppemon_py_script.simulation import simulate
+
+
+@given("a script whose task works {millis:d} milliseconds between pause points")
+def step_working_script(context, millis):
+    async def user_main():
+        with Pausable(name="worker") as p:
+            while True:
+                await p.maybe_pause()
+                # Work is modelled as time: code between awaits takes no virtual time
+                await asyncio.sleep(millis / 1000.0)
+
+    context.user_main = user_main
+
+
+@given("a script whose cycle is {steps:d} steps of {millis:d} milliseconds")
+def step_cyclic_script(context, steps, millis):
+    async def user_main():
+        with Pausable(name="cycle") as p:
+            for _ in range(steps):
+                await p.maybe_pause()
+                await asyncio.sleep(millis / 1000.0)
+
+    context.user_main = user_main
+
+
+@when(
+    "the script is simulated for {seconds:d} seconds with a pause every {every:d} seconds held for {hold:d} seconds"
+)
+def step_simulate_pauses(context, seconds, every, hold):
+    context.report = simulate(context.user_main, duration=seconds, pause_every=every, pause_hold=hold)
+
+
+@when(
+    "the script is simulated for {cycles:d} cycles with a pause every {every:d} second held for {hold:d} seconds"
+)
+def step_simulate_cycles(context, cycles, every, hold):
+    context.report = simulate(
+        context.user_main, duration=3600, cycles=cycles, pause_every=every, pause_hold=hold
+    )
+
+
+@when("the script is simulated for {seconds:g} seconds without pauses")
+def step_simulate_no_pauses(context, seconds):
+    context.report = simulate(context.user_main, duration=seconds)
+
+
+@when(
+    "the script is simulated for {seconds:d} seconds with a pause every {every:d} seconds"
+    " with a timeout of {timeout:d} second"
+)
+def step_simulate_timeouts(context, seconds, every, timeout):
+    context.report = simulate(
+        context.user_main, duration=seconds, pause_every=every, pause_hold=1, pause_timeout=timeout
+    )
+
+
+@then("the simulation takes less than {seconds:d} second of wall time")
+def step_wall_time(context, seconds):
+    assert context.report.virtual_seconds > 0
+    assert context.report.wall_seconds < seconds, context.report.wall_seconds
+
+
+@then('the pause-point interval of task "{name}" is {millis:d} milliseconds')
+def step_interval(context, name, millis):
+    task = context.report.task(name)
+    assert abs(task.mean_interval - millis / 1000.0) < 1e-6, task
+    assert abs(task.max_interval - millis / 1000.0) < 1e-6, task
+
+
+@then("{count:d} pauses completed with a worst-case pause latency of at most {millis:d} milliseconds")
+def step_pauses_completed(context, count, millis):
+    pauses = context.report.pauses
+    assert len(pauses) == count and all(p.latency is not None for p in pauses), pauses
+    assert context.report.worst_pause_latency <= millis / 1000.0 + 1e-6, context.report.worst_pause_latency
+
+
+@then("every cycle took at least {millis:d} milliseconds")
+def step_cycle_times(context, millis):
+    assert context.report.cycle_times
+    assert all(c >= millis / 1000.0 - 1e-6 for c in context.report.cycle_times), context.report.cycle_times
+
+
+@then("the total of the cycle times is {seconds:d} seconds plus {hold:d} seconds for every pause")
+def step_cycle_total(context, seconds, hold):
+    report = context.report
+    # The script keeps working until it parks, so only the holds add to the cycle times
+    completed = [p for p in report.pauses if p.latency is not None]
+    expected = seconds + hold * len(completed)
+    assert abs(sum(report.cycle_times) - expected) < 1e-6, (report.cycle_times, report.pauses)
+
+
+@then("every pause fails")
+def step_all_fail(context):
+    pauses = context.report.pauses
+    assert pauses and all(p.latency is None for p in pauses), pauses
+
+
+@then("every pause after {seconds:d} seconds is rejected without waiting for the timeout")
+def step_rejected_at_once(context, seconds):
+    late = [p for p in context.report.pauses if p.requested_at > seconds]
+    assert late and all("cannot complete" in p.error for p in late), late
+
+
+@then("{count:d} cycles completed")
+def step_cycles_completed(context, count):
+    assert len(context.report.cycle_times) == count, context.report.cycle_times
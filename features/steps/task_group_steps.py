@@ -0,0 +1,198 @@
+import asyncio
+import os
+import tempfile
+
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script import PausableTaskGroup
+from puppemon_py_script.checkpoint import CheckpointLog
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+@given("a pause controller with no registered task")
+def step_empty_controller(context):
+    context.controller = PausableController()
+    Pausable.set_controller(context.controller)
+    context.handled = []
+    context.in_flight = 0
+    context.max_in_flight = 0
+
+
+def _handler(context, millis):
+    async def handle(p, item):
+        context.in_flight += 1
+        context.max_in_flight = max(context.max_in_flight, context.in_flight)
+        try:
+            await p.sleep(millis / 1000.0)
+            context.handled.append(item)
+        finally:
+            context.in_flight -= 1
+
+    return handle
+
+
+async def _handle_all(context, count, workers, millis):
+    context.count = count
+    async with PausableTaskGroup(_handler(context, millis), workers, name="handler") as group:
+        for item in range(count):
+            await group.put(item)
+
+
+@when("{count:d} items are handled by a task group of {workers:d} workers")
+def step_handle_items(context, count, workers):
+    run(context.loop, _handle_all(context, count, workers, 1))
+
+
+@then("every item is handled once")
+def step_every_item(context):
+    worker = getattr(context, "worker", None)
+    if worker is not None:
+        run(context.loop, asyncio.wait_for(worker, timeout=5.0))
+    assert sorted(context.handled) == list(range(context.count)), context.handled
+
+
+@then("at most {count:d} items were in flight at any time")
+def step_max_in_flight(context, count):
+    assert context.max_in_flight == count, context.max_in_flight
+
+
+@then("no worker is registered after the group exits")
+def step_no_worker(context):
+    assert context.controller.task_count == 0
+
+
+@given("a task group of {workers:d} workers handling {count:d} items of {millis:d} milliseconds each")
+def step_running_group(context, workers, count, millis):
+    context.worker = context.loop.create_task(_handle_all(context, count, workers, millis))
+    run(context.loop, asyncio.sleep(0.035))
+    assert context.handled
+
+
+@when("the script is paused and every task parks")
+def step_pause_and_park(context):
+    context.controller.pause()
+    assert run(context.loop, context.controller.wait_all_paused(timeout=1.0))
+
+
+@then("no item is taken off the queue while parked")
+def step_no_dispatch(context):
+    before = list(context.handled)
+    run(context.loop, asyncio.sleep(0.05))
+    assert context.handled == before
+    assert len(before) < context.count
+
+
+@given("the script was paused before any task registered")
+def step_paused_empty(context):
+    context.controller.pause()
+    assert context.controller.snapshot(include_tasks=False).expected_tasks == 0
+
+
+@when("a task group of {workers:d} workers is entered")
+def step_enter_group(context, workers):
+    async def body():
+        async with PausableTaskGroup(_handler(context, 1), workers) as group:
+            group.put_nowait(0)
+
+    context.worker = context.loop.create_task(body())
+    run(context.loop, asyncio.sleep(0))
+
+
+@then("the pause waits for {count:d} tasks")
+def step_pause_waits_for(context, count):
+    assert context.controller.snapshot(include_tasks=False).expected_tasks == count
+
+
+@then("all {count:d} workers park")
+def step_workers_park(context, count):
+    assert run(context.loop, context.controller.wait_all_paused(timeout=1.0))
+    tasks = context.controller.snapshot().tasks
+    assert len(tasks) == count and all(t.parked for t in tasks), tasks
+    assert context.handled == []
+    context.controller.resume()
+    run(context.loop, asyncio.wait_for(context.worker, timeout=1.0))
+    assert context.handled == [0]
+
+
+@when("a task group of {workers:d} workers with a queue of {size:d} item fails on item {failing:d}")
+def step_failing_group(context, workers, size, failing):
+    async def handle(p, item):
+        await asyncio.sleep(0.001)
+        if item == failing:
+            raise ValueError(f"item {item}")
+
+    async def body():
+        # The body is blocked on the full queue when the handler fails
+        async with PausableTaskGroup(handle, workers, maxsize=size) as group:
+            for item in range(1000):
+                await group.put(item)
+
+    try:
+        run(context.loop, body())
+    except ValueError as e:
+        context.error = e
+
+
+@then("the group raises the handler error")
+def step_raises_handler_error(context):
+    assert str(context.error) == "item 3", context.error
+
+
+@when("the only worker of a task group fails on item {failing:d}")
+def step_only_worker_fails(context, failing):
+    async def handle(p, item):
+        raise ValueError(f"item {item}")
+
+    async def body():
+        async with PausableTaskGroup(handle, 1) as group:
+            group.put_nowait(failing)
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                context.registered_on_cancel = context.controller.task_count
+                raise
+
+    try:
+        run(context.loop, body())
+    except ValueError as e:
+        context.error = e
+
+
+@then("the worker was unregistered when the body was cancelled")
+def step_unregistered_on_cancel(context):
+    assert context.registered_on_cancel == 0, context.registered_on_cancel
+    assert str(context.error) == "item 0"
+
+
+@given("the controller keeps checkpoints")
+def step_keeps_checkpoints(context):
+    tmp = tempfile.TemporaryDirectory()
+    context.add_cleanup(tmp.cleanup)
+    log = CheckpointLog(os.path.join(tmp.name, "script.checkpoint"))
+    context.add_cleanup(log.close)
+    context.controller.attach_checkpoints(log)
+
+
+@then("entering a task group without a name is refused")
+def step_unnamed_refused(context):
+    async def enter():
+        async with PausableTaskGroup(_handler(context, 0), 2):
+            pass
+
+    try:
+        run(context.loop, enter())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unnamed task group was entered")
+    assert context.controller.task_count == 0
+
+
+@then('a task group named "{name}" starts workers "{first}" and "{second}"')
+def step_named_group(context, name, first, second):
+    async def enter():
+        async with PausableTaskGroup(_handler(context, 0), 2, name=name) as group:
+            return [p.name for p in group.pausables]
+
+    assert run(context.loop, enter()) == [first, second]
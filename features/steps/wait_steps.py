@@ -0,0 +1,133 @@
+import asyncio
+
+from behave import given, when, then
+
+from features.steps.common import run
+from puppemon_py_script.pausable import Pausable, PausableController
+
+
+@given("a pause controller without a control server")
+def step_bare_controller(context):
+    context.controller = PausableController()
+    Pausable.set_controller(context.controller)
+    context.pausable = Pausable(name="waiter")
+    context.received = []
+
+
+def _start(context, coro_fn):
+    async def worker():
+        context.received.append(await coro_fn(context.pausable))
+        context.finished_at = context.loop.time()
+
+    context.worker = context.loop.create_task(worker())
+    run(context.loop, asyncio.sleep(0))
+
+
+@given("a task that sleeps {millis:d} milliseconds between pause points with the pause-aware sleep")
+def step_sleeping_task(context, millis):
+    _start(context, lambda p: p.sleep(millis / 1000.0))
+
+
+@given("a task that loops {count:d} times over the pause-aware sleep of 0 seconds")
+def step_zero_sleep_loop(context, count):
+    async def busy_loop(p):
+        # Without a yield per sleep this runs to the end in one step and the pause never catches it
+        for _ in range(count):
+            await p.sleep(0)
+        return count
+
+    context.loop_count = count
+    _start(context, busy_loop)
+
+
+@given("a task that waits for items with the pause-aware queue get")
+def step_queue_task(context):
+    context.queue = asyncio.Queue()
+    _start(context, lambda p: p.queue_get(context.queue))
+
+
+@given("a task that waits {millis:d} milliseconds for a result with the pause-aware wait_for")
+def step_wait_for_task(context, millis):
+    async def result():
+        await asyncio.sleep(millis / 1000.0)
+        return "result"
+
+    _start(context, lambda p: p.wait_for(result(), timeout=5.0))
+
+
+def _pause(context):
+    context.controller.pause()
+    context.paused_at = context.loop.time()
+
+
+@when("the task has slept {millis:d} milliseconds and the script is paused")
+def step_pause_after(context, millis):
+    run(context.loop, asyncio.sleep(millis / 1000.0))
+    _pause(context)
+
+
+@when("the script is paused")
+def step_pause(context):
+    _pause(context)
+
+
+@then("the task parks within {millis:d} milliseconds")
+def step_parks_within(context, millis):
+    async def _wait_parked():
+        while not context.controller.snapshot().tasks[0].parked:
+            await asyncio.sleep(0.001)
+
+    run(context.loop, asyncio.wait_for(_wait_parked(), timeout=1.0))
+    elapsed = context.loop.time() - context.paused_at
+    assert elapsed < millis / 1000.0, elapsed
+
+
+@when("the script is resumed after {millis:d} milliseconds")
+def step_resume_after(context, millis):
+    run(context.loop, asyncio.sleep(millis / 1000.0))
+    assert not context.worker.done()
+    context.controller.resume()
+    context.resumed_at = context.loop.time()
+
+
+@when("the script is resumed")
+def step_resume(context):
+    step_resume_after(context, 0)
+
+
+@then("the task finishes its sleep about {millis:d} milliseconds after the resume")
+def step_finishes_rest(context, millis):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=2.0))
+    rest = context.finished_at - context.resumed_at
+    assert abs(rest - millis / 1000.0) < 0.05, rest
+
+
+@when("an item is put on the queue")
+def step_put_item(context):
+    context.queue.put_nowait("item")
+    run(context.loop, asyncio.sleep(0.02))
+
+
+@then("the item stays on the queue while the task is parked")
+def step_item_stays(context):
+    assert context.queue.qsize() == 1
+    assert context.controller.snapshot().tasks[0].parked
+
+
+@then("the task receives the item")
+def step_receives_item(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=2.0))
+    assert context.received == ["item"]
+    assert context.queue.qsize() == 0
+
+
+@then("the task finishes its loop")
+def step_finishes_loop(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=5.0))
+    assert context.received == [context.loop_count]
+
+
+@then("the task receives the result")
+def step_receives_result(context):
+    run(context.loop, asyncio.wait_for(context.worker, timeout=2.0))
+    assert context.received == ["result"]
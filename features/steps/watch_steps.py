@@ -0,0 +1,43 @@
+import asyncio
+from behave import given, when, then
+
+from features.steps.common import run, RunningScript, ScriptClient
+from puppemon_py_script.generated import script_pb2
+
+
+@when("a client watches the script state")
+@given("a client is watching the script state")
+def step_watch_state(context):
+    server: RunningScript = context.running
+    context.state_updates = []
+
+    async def _consume():
+        client = ScriptClient(server.port)
+        async for state in client.watch_state():
+            context.state_updates.append(state)
+
+    context.watcher_task = context.loop.create_task(_consume())
+    run(context.loop, asyncio.sleep(0.05))
+
+
+@then('the watcher receives a "{state}" state update')
+def step_watcher_receives(context, state):
+    expected = script_pb2.ScriptState.RunState.Value(state.upper())
+
+    async def _wait():
+        for _ in range(200):
+            if context.state_updates and context.state_updates[-1].state == expected:
+                return context.state_updates[-1]
+            await asyncio.sleep(0.01)
+        return None
+
+    context.last_state = run(context.loop, _wait())
+    assert context.last_state is not None, [s.state for s in context.state_updates[-5:]]
+
+
+@then("every task acknowledged the current pause generation")
+def step_every_task_acked(context):
+    state = context.last_state
+    assert state.generation > 0
+    assert {t.name for t in state.tasks} == {"A", "B"}
+    assert all(t.parked and t.acked_generation == state.generation for t in state.tasks)
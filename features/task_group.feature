@@ -0,0 +1,37 @@
+Feature: Pausable task group
+
+	Background:
+		Given a pause controller with no registered task
+
+	Scenario: A task group handles every queued item with bounded concurrency
+		When 50 items are handled by a task group of 4 workers
+		Then every item is handled once
+		And at most 4 items were in flight at any time
+		And no worker is registered after the group exits
+
+	Scenario: Pausing a task group stops dispatch and parks every worker
+		Given a task group of 4 workers handling 200 items of 10 milliseconds each
+		When the script is paused and every task parks
+		Then no item is taken off the queue while parked
+		When the script is resumed
+		Then every item is handled once
+
+	Scenario: Workers of a task group entered during a pause hold the pause until they park
+		Given the script was paused before any task registered
+		When a task group of 3 workers is entered
+		Then the pause waits for 3 tasks
+		And all 3 workers park
+
+	Scenario: A handler error cancels the other workers and is raised when the group exits
+		When a task group of 2 workers with a queue of 1 item fails on item 3
+		Then the group raises the handler error
+		And no worker is registered after the group exits
+
+	Scenario: A worker whose handler failed unregisters before the group exits
+		When the only worker of a task group fails on item 0
+		Then the worker was unregistered when the body was cancelled
+
+	Scenario: A task group needs a name when the controller keeps checkpoints
+		Given the controller keeps checkpoints
+		Then entering a task group without a name is refused
+		And a task group named "sorter" starts workers "sorter-0" and "sorter-1"
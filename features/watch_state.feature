@@ -0,0 +1,22 @@
+Feature: Watch script state
+
+  Background:
+    Given a script started with an embedded gRPC control server
+    And the script defines concurrent async tasks A and B with pausable points
+
+  Scenario: Watcher receives the current state on subscribe
+    When a client watches the script state
+    Then the watcher receives a "running" state update
+
+  Scenario: Watcher is notified of pause and resume without polling
+    Given a client is watching the script state
+    When the client sends the PAUSE command
+    Then the watcher receives a "paused" state update
+    And every task acknowledged the current pause generation
+    When the client sends the RESUME command
+    Then the watcher receives a "running" state update
+
+  Scenario: Watcher is notified of stop
+    Given a client is watching the script state
+    When the client sends the STOP command
+    Then the watcher receives a "stopping" state update
@@ -1,16 +1,62 @@
 """Top-level package exports for puppemon_py_script.
 
-Only re-export lightweight symbols here to avoid side-effects during import.
+Importing the package has no side-effects and loads nothing heavy: every export below is resolved lazily on
+first attribute access (PEP 562), so a user script that only needs `Pausable` never pays for grpc, protobuf
+or the generated stubs.
 """
 
-from os import path as os_path
-from sys import path as sys_path
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-sys_path.append(os_path.join(os_path.dirname(__file__), "generated"))
+if TYPE_CHECKING:
+    from .autopause import pause_points  # noqa: F401
+    from .client import InProcessScriptClient, ScriptClient, SyncScriptClient, pause_report  # noqa: F401
+    from .fleet import FleetResult, ScriptFleet  # noqa: F401
+    from .generated import script_pb2_grpc  # noqa: F401
+    from .pausable import Pausable, PausableController  # noqa: F401
+    from .taskgroup import PausableTaskGroup  # noqa: F401
+    from .router import ScriptRouter  # noqa: F401
+    from .script_servicer import ScriptServicer  # noqa: F401
+    from .simulation import simulate  # noqa: F401
+    from .util import default_main, run_script, serve_scripts, start_scripts, start_server  # noqa: F401
 
-from .pausable import Pausable, PausableController  # noqa: F401
-from .generated import script_pb2_grpc  # noqa: F401
-from .script_servicer import ScriptServicer  # noqa: F401
-from .util import default_main  # noqa: F401
+# export name -> (submodule, attribute); attribute None exports the submodule itself
+_LAZY_EXPORTS = {
+    "Pausable": (".pausable", "Pausable"),
+    "PausableController": (".pausable", "PausableController"),
+    "PausableTaskGroup": (".taskgroup", "PausableTaskGroup"),
+    "script_pb2_grpc": (".generated.script_pb2_grpc", None),
+    "ScriptServicer": (".script_servicer", "ScriptServicer"),
+    "ScriptRouter": (".router", "ScriptRouter"),
+    "pause_points": (".autopause", "pause_points"),
+    "simulate": (".simulation", "simulate"),
+    "default_main": (".util", "default_main"),
+    "run_script": (".util", "run_script"),
+    "start_server": (".util", "start_server"),
+    "start_scripts": (".util", "start_scripts"),
+    "serve_scripts": (".util", "serve_scripts"),
+    "ScriptClient": (".client", "ScriptClient"),
+    "InProcessScriptClient": (".client", "InProcessScriptClient"),
+    "SyncScriptClient": (".client", "SyncScriptClient"),
+    "pause_report": (".client", "pause_report"),
+    "FleetResult": (".fleet", "FleetResult"),
+    "ScriptFleet": (".fleet", "ScriptFleet"),
+}
 
-__all__ = ["Pausable", "PausableController", "script_pb2_grpc", "ScriptServicer", "default_main"]
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attribute = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = import_module(module_name, __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,203 @@
+"""Automatic pause points at the await boundaries of a coroutine function.
+
+`pause_points` recompiles an `async def` so that every `await` written in its body is a pause point, as if
+`await p.maybe_pause()` came right before it. Long sequences of awaited calls then pause between any two of
+them without sprinkling `maybe_pause()` by hand:
+
+```python
+with Pausable(pause_cb=wait_complete) as p:
+
+    @p.pause_points
+    async def cycle():
+        await xyz.straight_move_to([0.4, 0.0, 0.1], feedrate)  # a pause parks the task before each move
+        await xyz.straight_move_to([0.3, 0.2, 0.15], feedrate)
+        await xyz.arc_move_to([0.4, 0.2, 0], normal, math.pi, feedrate)
+
+    while True:
+        await cycle()
+```
+
+Only the awaits of the function itself become pause points: the ones inside the called coroutines, nested
+functions, `async with` and `async for` do not. The awaited expression is evaluated first and, if a pause is
+pending, the task parks before awaiting it, so a coroutine call is made but not started while parked. Each
+await becomes `await gate(expr)`, where `gate` hands `expr` back untouched while no pause is pending: the cost
+is one call and an attribute check per await. With `min_interval` an await is only a pause point if that many
+seconds passed since the previous one, which bounds the pause-point rate of await-heavy code (every pause
+point is journaled with `attach_journal(record_hits=True)`) at the cost of a clock read per await and up to
+`min_interval` more pause latency.
+
+The function is recompiled from its source, which must be available (not defined in a REPL or by `exec`).
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import inspect
+import textwrap
+import types
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .pausable import Pausable
+
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+# Name of the closure variable holding the gate in a recompiled function
+_GATE = "_puppemon_pause_gate"
+# Recompiled code object of every decorated function's code object
+_rewritten: "weakref.WeakKeyDictionary[types.CodeType, types.CodeType]" = weakref.WeakKeyDictionary()
+
+
+class _GateAwaits(ast.NodeTransformer):
+    """Rewrite `await expr` into `await gate(expr)`, leaving nested scopes alone."""
+
+    def visit_Await(self, node: ast.Await) -> ast.Await:
+        self.generic_visit(node)
+        node.value = ast.Call(ast.Name(_GATE, ast.Load()), [node.value], [])
+        return node
+
+    def _skip(self, node: ast.AST) -> ast.AST:
+        return node
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_Lambda = visit_ClassDef = _skip
+
+
+def _find_code(code: types.CodeType, name: str) -> Optional[types.CodeType]:
+    """Breadth-first search for the coroutine code object `name` among the constants of `code`."""
+    pending = [code]
+    while pending:
+        nested = [c for parent in pending for c in parent.co_consts if isinstance(c, types.CodeType)]
+        for c in nested:
+            if c.co_name == name and c.co_flags & inspect.CO_COROUTINE:
+                return c
+        pending = nested
+    return None
+
+
+def _node(cls: type, **fields: Any) -> Any:
+    # `type_params` only exists, and is required, from Python 3.12 on
+    if "type_params" in cls._fields:
+        fields["type_params"] = []
+    return cls(**fields)
+
+
+def _rewrite(fn: Callable[..., Any]) -> types.CodeType:
+    code = fn.__code__
+    cached = _rewritten.get(code)
+    if cached is not None:
+        return cached
+    try:
+        source = textwrap.dedent(inspect.getsource(fn))
+    except (OSError, TypeError) as e:
+        raise TypeError(f"pause_points needs the source code of {fn.__qualname__}") from e
+    node = ast.parse(source).body[0]
+    if not isinstance(node, ast.AsyncFunctionDef) or node.name != code.co_name:
+        raise TypeError(f"pause_points decorates `async def` functions, not {fn.__qualname__}")
+    node.decorator_list = []
+    node.body = [_GateAwaits().visit(stmt) for stmt in node.body]
+
+    # Compile inside an enclosing function that binds every free variable and the gate, so they stay closure
+    # cells; a method is also nested in a class of its owner's name so private names are mangled the same
+    body: list = [node]
+    parts = fn.__qualname__.split(".")
+    if len(parts) > 1 and parts[-2] != "<locals>":
+        body = [_node(ast.ClassDef, name=parts[-2], bases=[], keywords=[], body=body, decorator_list=[])]
+    assigns = [ast.Assign([ast.Name(name, ast.Store())], ast.Constant(None)) for name in code.co_freevars]
+    assigns.append(ast.Assign([ast.Name(_GATE, ast.Store())], ast.Constant(None)))
+    no_args = ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[])
+    outer = _node(ast.FunctionDef, name="_outer", args=no_args, body=assigns + body, decorator_list=[])
+    for added in (outer, *assigns, *body):
+        ast.copy_location(added, node)
+    module = ast.fix_missing_locations(ast.Module([outer], []))
+    ast.increment_lineno(module, code.co_firstlineno - 1)
+    rewritten = _find_code(compile(module, code.co_filename, "exec"), code.co_name)
+    assert rewritten is not None
+    if hasattr(code, "co_qualname"):
+        rewritten = rewritten.replace(co_qualname=code.co_qualname)
+    _rewritten[code] = rewritten
+    return rewritten
+
+
+def _make_gate(pausable: Pausable, min_interval: float) -> Callable[[Any], Any]:
+    ctrl = pausable._ctrl
+    record = pausable._record
+
+    async def _park_then(point: Awaitable[None], aw: Any) -> Any:
+        try:
+            await point
+        except BaseException:
+            # Cancelled while parked: the awaited coroutine was never started
+            if inspect.iscoroutine(aw):
+                aw.close()
+            raise
+        return await aw
+
+    if min_interval <= 0:
+
+        def gate(aw: Any) -> Any:
+            record.hits += 1
+            if ctrl._fast_path is not None:
+                return aw
+            return _park_then(ctrl._slow_path(pausable), aw)
+
+        return gate
+
+    clock = ctrl._clock
+    due = float("-inf")
+
+    def throttled_gate(aw: Any) -> Any:
+        nonlocal due
+        now = clock()
+        if now < due:
+            return aw
+        due = now + min_interval
+        record.hits += 1
+        if ctrl._fast_path is not None:
+            return aw
+        return _park_then(ctrl._slow_path(pausable), aw)
+
+    return throttled_gate
+
+
+def _bind(fn: Callable[..., Any], code: types.CodeType, gate: Callable[[Any], Any]) -> types.FunctionType:
+    cells: Dict[str, Any] = dict(zip(fn.__code__.co_freevars, fn.__closure__ or ()))
+    cells[_GATE] = types.CellType(gate)
+    closure: Tuple[Any, ...] = tuple(cells[name] for name in code.co_freevars)
+    bound = types.FunctionType(code, fn.__globals__, fn.__name__, fn.__defaults__, closure)
+    bound.__kwdefaults__ = fn.__kwdefaults__
+    return bound
+
+
+def pause_points(
+    fn: Optional[_F] = None, *, pausable: Optional[Pausable] = None, min_interval: float = 0.0
+) -> Any:
+    """Make every `await` in the body of the coroutine function `fn` a pause point.
+
+    Args:
+        fn: The `async def` to decorate; omit it to get a decorator taking the keyword arguments.
+        pausable: Pause through this Pausable (see `Pausable.pause_points`). Without it a call pauses through
+            the Pausable whose `with` block the calling task is in (`Pausable.current_pausable`), so the task
+            is not registered twice; outside of one, the call creates its own Pausable named after the
+            function, registered for the duration of the call.
+        min_interval: Seconds from one pause point to the next; awaits in between are not pause points.
+            0 makes every await one.
+    """
+    if fn is None:
+        return functools.partial(pause_points, pausable=pausable, min_interval=min_interval)
+    if not inspect.iscoroutinefunction(fn):
+        raise TypeError(f"pause_points decorates `async def` functions, not {fn!r}")
+    code = _rewrite(fn)
+
+    if pausable is not None:
+        return functools.update_wrapper(_bind(fn, code, _make_gate(pausable, min_interval)), fn)
+
+    @functools.wraps(fn)
+    async def call_pausable(*args: Any, **kwargs: Any) -> Any:
+        current = Pausable.current_pausable()
+        if current is not None:
+            return await _bind(fn, code, _make_gate(current, min_interval))(*args, **kwargs)
+        with Pausable(name=fn.__name__) as p:
+            return await _bind(fn, code, _make_gate(p, min_interval))(*args, **kwargs)
+
+    return call_pausable
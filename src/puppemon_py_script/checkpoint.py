@@ -0,0 +1,188 @@
+"""Append-only log of per-task checkpoints, so a restarted script can continue where it stopped.
+
+Tasks save small states with `await p.checkpoint(state)` and read them back after a restart with
+`p.restore()`, keyed by the Pausable name (see `PausableController.attach_checkpoints`). `default_main`
+attaches a log with `--checkpoint PATH` before the user's main starts.
+
+File layout (little endian): magic, then records of
+
+* header: payload length (u32), CRC-32 of key and payload (u32), key length (u16), encoding (u8), reserved
+* key (UTF-8), payload
+
+Encoding 0 is a raw bytes-like state written as is, 1 a pickle (protocol 5), 2 a deleted key. Each record is
+written with one `os.writev` of header, key and payload, so bytes-like states are never copied into a
+buffer first. A record cut short by a crash fails its length or CRC check; replay stops there, and the last
+complete record of each key wins. Once the log is past `compact_bytes` and mostly superseded records, it is
+rewritten with the latest record of each key into a temporary file that atomically replaces it.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import zlib
+from struct import Struct
+from typing import Any, Dict, Iterator, Tuple
+
+MAGIC = b"PPMCKPT1"
+# payload length, crc32 of key + payload, key length, encoding, reserved
+_HEADER = Struct("<IIHBB")
+_RAW, _PICKLE, _DELETED = 0, 1, 2
+
+
+class CheckpointLog:
+    """Single writer: the event loop thread of the script that owns the file."""
+
+    def __init__(self, path: str, *, compact_bytes: int = 4 << 20, fsync: bool = False):
+        """
+        Args:
+            path: Log file; created when missing, replayed when it exists.
+            compact_bytes: Rewrite the log with only the latest record per key once it grows past this size and
+                at least half of it is superseded records.
+            fsync: Flush every record to stable storage. Without it a record survives a crash of the
+                script, but not a crash of the host.
+        """
+        self.path = path
+        self._compact_bytes = compact_bytes
+        self._fsync = fsync
+        # key -> (offset, size) of the latest record of that key
+        self._index: Dict[str, Tuple[int, int]] = {}
+        # Bytes of the records in the index
+        self._live = 0
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._size = self._replay()
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def _records(self, data: bytes) -> Iterator[Tuple[int, int, str, int]]:
+        """(offset, size, key, encoding) of every complete record, stopping at the first bad one."""
+        view = memoryview(data)
+        offset = len(MAGIC)
+        while offset + _HEADER.size <= len(view):
+            length, crc, key_len, encoding, _ = _HEADER.unpack_from(view, offset)
+            start = offset + _HEADER.size
+            end = start + key_len + length
+            if end > len(view) or zlib.crc32(view[start:end]) != crc:
+                return
+            key = bytes(view[start : start + key_len]).decode("utf-8")
+            yield offset, end - offset, key, encoding
+            offset = end
+
+    def _replay(self) -> int:
+        with open(self._fd, "rb", closefd=False) as f:
+            data = f.read()
+        if not data:
+            os.write(self._fd, MAGIC)
+            return len(MAGIC)
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a puppemon checkpoint log")
+        end = len(MAGIC)
+        for offset, size, key, encoding in self._records(data):
+            self._index_record(key, encoding, offset, size)
+            end = offset + size
+        if end < len(data):
+            # Drop a torn tail so new records are not appended after garbage
+            os.ftruncate(self._fd, end)
+        os.lseek(self._fd, end, os.SEEK_SET)
+        return end
+
+    def keys(self) -> Tuple[str, ...]:
+        return tuple(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def load(self, key: str, default: Any = None) -> Any:
+        """The latest state saved under `key`, or `default`. Raw states come back as `bytes`."""
+        location = self._index.get(key)
+        if location is None:
+            return default
+        offset, size = location
+        record = os.pread(self._fd, size, offset)
+        _, _, key_len, encoding, _ = _HEADER.unpack_from(record)
+        payload = memoryview(record)[_HEADER.size + key_len :]
+        return bytes(payload) if encoding == _RAW else pickle.loads(payload)
+
+    def write(self, key: str, state: Any) -> None:
+        """Append `state` as the latest checkpoint of `key`. bytes, bytearray and memoryview are stored as is,
+        anything else is pickled."""
+        if isinstance(state, (bytes, bytearray, memoryview)):
+            self._append(key, _RAW, state)
+        else:
+            self._append(key, _PICKLE, pickle.dumps(state, protocol=5))
+
+    def delete(self, key: str) -> None:
+        """Forget `key`, e.g. once its task finished and has nothing to continue."""
+        if key in self._index:
+            self._append(key, _DELETED, b"")
+
+    def _append(self, key: str, encoding: int, payload) -> None:
+        key_bytes = key.encode("utf-8")
+        length = memoryview(payload).nbytes
+        header = _HEADER.pack(length, zlib.crc32(payload, zlib.crc32(key_bytes)), len(key_bytes), encoding, 0)
+        size = len(header) + len(key_bytes) + length
+        written = os.writev(self._fd, (header, key_bytes, payload))
+        if written != size:
+            # A short write leaves a torn record that replay ignores; do not append after it
+            os.ftruncate(self._fd, self._size)
+            os.lseek(self._fd, self._size, os.SEEK_SET)
+            raise OSError(f"Short write to {self.path}: {written} of {size} bytes")
+        if self._fsync:
+            os.fsync(self._fd)
+        self._index_record(key, encoding, self._size, size)
+        self._size += size
+        if self._size > self._compact_bytes and self._size > 2 * self._live:
+            self.compact()
+
+    def _index_record(self, key: str, encoding: int, offset: int, size: int) -> None:
+        previous = self._index.pop(key, None)
+        if previous is not None:
+            self._live -= previous[1]
+        if encoding != _DELETED:
+            self._index[key] = (offset, size)
+            self._live += size
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest record of each key, replacing the file atomically."""
+        tmp = f"{self.path}.compact"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        index: Dict[str, Tuple[int, int]] = {}
+        try:
+            os.write(fd, MAGIC)
+            offset = len(MAGIC)
+            for key, (old, size) in self._index.items():
+                os.write(fd, os.pread(self._fd, size, old))
+                index[key] = (offset, size)
+                offset += size
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, self.path)
+        os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR)
+        os.lseek(self._fd, offset, os.SEEK_SET)
+        self._index = index
+        self._size = offset
+
+    @property
+    def size(self) -> int:
+        """Current size of the log file in bytes."""
+        return self._size
+
+    def flush(self) -> None:
+        os.fsync(self._fd)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> CheckpointLog:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
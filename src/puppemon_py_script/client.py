@@ -0,0 +1,379 @@
+"""Supported clients for a script control server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Optional, Sequence, Tuple
+
+import grpc
+from google.protobuf import empty_pb2
+
+from .generated import script_pb2, script_pb2_grpc
+from .router import PAUSE_REPORT_METADATA, SCRIPT_ID_METADATA
+
+if TYPE_CHECKING:
+    from .script_servicer import ScriptServicer
+
+
+def pause_report(error: grpc.aio.AioRpcError) -> Optional[script_pb2.PauseResponse]:
+    """The per-task report of a failed Pause (DEADLINE_EXCEEDED or ABORTED), or None if it carries none.
+
+    ```python
+    try:
+        report = await client.pause(timeout=2.0)
+    except grpc.aio.AioRpcError as e:
+        report = pause_report(e)
+        late = [t.name for t in report.stragglers] if report else []
+    ```
+    """
+    for key, value in error.trailing_metadata() or ():
+        if key == PAUSE_REPORT_METADATA:
+            return script_pb2.PauseResponse.FromString(value)
+    return None
+
+
+def _retry_service_config(max_attempts: int, initial_backoff: float) -> str:
+    # Transient transport failures only; every control command is idempotent so replaying is safe
+    return json.dumps(
+        {
+            "methodConfig": [
+                {
+                    "name": [{"service": "script.Script"}],
+                    "retryPolicy": {
+                        "maxAttempts": max_attempts,
+                        "initialBackoff": f"{initial_backoff:.3f}s",
+                        "maxBackoff": "1s",
+                        "backoffMultiplier": 2,
+                        "retryableStatusCodes": ["UNAVAILABLE"],
+                    },
+                }
+            ]
+        }
+    )
+
+
+def _pause_request(
+    timeout: Optional[float], wait_full_timeout: bool, groups: Optional[Iterable[str]]
+) -> script_pb2.PauseRequest:
+    return script_pb2.PauseRequest(
+        timeout_millis=int(timeout * 1000) if timeout else 0,
+        wait_full_timeout=wait_full_timeout,
+        groups=groups or (),
+    )
+
+
+def _stop_request(drain_timeout: Optional[float]) -> script_pb2.StopRequest:
+    return script_pb2.StopRequest(drain_timeout_millis=int(drain_timeout * 1000) if drain_timeout else 0)
+
+
+class ScriptClient:
+    """
+    Async client holding one persistent channel to a script control server.
+
+    The channel is created lazily on the first call, inside the running event loop, and reused until
+    `close()`. HTTP/2 keepalive pings keep idle connections warm, and UNAVAILABLE errors are retried by
+    gRPC itself with exponential backoff. Every attempt counts against the call's `deadline`.
+
+    ```python
+    async with ScriptClient("localhost:51052") as client:
+        await client.pause(timeout=2.0, deadline=3.0)
+        await client.resume()
+    ```
+
+    `script_id` selects one script on a server hosting several (`ScriptRouter`).
+    """
+
+    def __init__(
+        self,
+        target: str,
+        *,
+        script_id: Optional[str] = None,
+        keepalive_time: float = 30.0,
+        keepalive_timeout: float = 10.0,
+        max_attempts: int = 3,
+        initial_backoff: float = 0.05,
+        default_deadline: Optional[float] = None,
+        channel_options: Optional[Sequence[Tuple[str, object]]] = None,
+    ):
+        self._target = target
+        self._script_id = script_id
+        self._metadata = ((SCRIPT_ID_METADATA, script_id),) if script_id is not None else None
+        self._default_deadline = default_deadline
+        self._options = [
+            ("grpc.keepalive_time_ms", int(keepalive_time * 1000)),
+            ("grpc.keepalive_timeout_ms", int(keepalive_timeout * 1000)),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.enable_retries", 1 if max_attempts > 1 else 0),
+            ("grpc.service_config", _retry_service_config(max(1, max_attempts), initial_backoff)),
+            *(channel_options or ()),
+        ]
+        self._channel: Optional[grpc.aio.Channel] = None
+        self._stub: Optional[script_pb2_grpc.ScriptStub] = None
+
+    @property
+    def target(self) -> str:
+        return self._target
+
+    @property
+    def script_id(self) -> Optional[str]:
+        return self._script_id
+
+    def _get_stub(self) -> script_pb2_grpc.ScriptStub:
+        if self._stub is None:
+            self._channel = grpc.aio.insecure_channel(self._target, options=self._options)
+            self._stub = script_pb2_grpc.ScriptStub(self._channel)
+        return self._stub
+
+    def _deadline(self, deadline: Optional[float]) -> Optional[float]:
+        return deadline if deadline is not None else self._default_deadline
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        """Eagerly establish the connection instead of on the first command."""
+        self._get_stub()
+        assert self._channel is not None
+        await asyncio.wait_for(self._channel.channel_ready(), timeout=timeout)
+
+    async def pause(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        deadline: Optional[float] = None,
+        wait_full_timeout: bool = False,
+        groups: Optional[Iterable[str]] = None,
+    ) -> script_pb2.PauseResponse:
+        """Pause the script. `timeout` is the server-side pause timeout, `deadline` bounds the RPC.
+
+        With a timeout the server rejects the pause right away when its tasks are predicted to miss it;
+        `wait_full_timeout=True` makes it wait the whole timeout regardless. `groups` pauses only the tasks
+        tagged with one of them. Returns which tasks parked and how long each took; a failed pause carries
+        the same report, see `pause_report`.
+        """
+        request = _pause_request(timeout, wait_full_timeout, groups)
+        return await self._get_stub().Pause(
+            request, timeout=self._deadline(deadline), metadata=self._metadata
+        )
+
+    async def resume(
+        self, *, deadline: Optional[float] = None, groups: Optional[Iterable[str]] = None
+    ):
+        """Resume the script, or only `groups`. Without groups everything is resumed."""
+        request = script_pb2.ResumeRequest(groups=groups or ())
+        return await self._get_stub().Resume(
+            request, timeout=self._deadline(deadline), metadata=self._metadata
+        )
+
+    async def stop(
+        self, drain_timeout: Optional[float] = None, *, deadline: Optional[float] = None
+    ) -> script_pb2.StopResponse:
+        """Stop the script. With `drain_timeout`, tasks first get up to that long to reach their next pause
+        point and are cancelled there; tasks still running at the deadline are cancelled where they are. The
+        response lists both. `deadline` bounds the RPC, so leave room for the drain."""
+        return await self._get_stub().Stop(
+            _stop_request(drain_timeout), timeout=self._deadline(deadline), metadata=self._metadata
+        )
+
+    async def get_metrics(self, *, deadline: Optional[float] = None) -> script_pb2.Metrics:
+        return await self._get_stub().GetMetrics(
+            empty_pb2.Empty(), timeout=self._deadline(deadline), metadata=self._metadata
+        )
+
+    async def watch_state(
+        self, include_tasks: bool = True, min_interval: float = 0.0
+    ) -> AsyncIterator[script_pb2.ScriptState]:
+        """Yield `ScriptState` updates until the caller stops iterating or the server goes away."""
+        request = script_pb2.WatchStateRequest(
+            include_tasks=include_tasks, min_interval_millis=int(min_interval * 1000)
+        )
+        async for state in self._get_stub().WatchState(request, metadata=self._metadata):
+            yield state
+
+    async def close(self) -> None:
+        channel, self._channel, self._stub = self._channel, None, None
+        if channel is not None:
+            await channel.close()
+
+    async def __aenter__(self) -> ScriptClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+
+class _InProcessContext:
+    """The subset of `grpc.aio.ServicerContext` used by `ScriptServicer` handlers."""
+
+    def __init__(self):
+        self._code = grpc.StatusCode.OK
+        self._details = ""
+        self._trailing_metadata: Tuple[Tuple[str, object], ...] = ()
+
+    def set_code(self, code: grpc.StatusCode) -> None:
+        self._code = code
+
+    def set_details(self, details: str) -> None:
+        self._details = details
+
+    def set_trailing_metadata(self, trailing_metadata) -> None:
+        self._trailing_metadata = tuple(trailing_metadata)
+
+    def code(self) -> grpc.StatusCode:
+        return self._code
+
+    def details(self) -> str:
+        return self._details
+
+    def invocation_metadata(self):
+        return ()
+
+    def time_remaining(self) -> Optional[float]:
+        return None
+
+    async def abort(self, code: grpc.StatusCode, details: str = "", trailing_metadata=()):
+        raise _rpc_error(code, details, trailing_metadata)
+
+    def raise_for_status(self) -> None:
+        if self._code != grpc.StatusCode.OK:
+            raise _rpc_error(self._code, self._details, self._trailing_metadata)
+
+
+def _rpc_error(code: grpc.StatusCode, details: str, trailing_metadata=()) -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(
+        code, grpc.aio.Metadata(), grpc.aio.Metadata(*trailing_metadata), details
+    )
+
+
+class InProcessScriptClient:
+    """
+    Same API as `ScriptClient`, but calls the `ScriptServicer` of this process directly.
+
+    For embedding a script in a host application that lives in the same event loop: no socket, no HTTP/2
+    framing and no protobuf wire encoding. Non-OK statuses and deadlines are still reported as
+    `grpc.aio.AioRpcError`, so callers handle errors the same way for every transport.
+    """
+
+    def __init__(self, servicer: ScriptServicer, *, default_deadline: Optional[float] = None):
+        self._servicer = servicer
+        self._default_deadline = default_deadline
+
+    async def _call(self, handler, request, deadline: Optional[float]):
+        context = _InProcessContext()
+        deadline = deadline if deadline is not None else self._default_deadline
+        try:
+            response = await asyncio.wait_for(handler(request, context), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise _rpc_error(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded") from None
+        context.raise_for_status()
+        return response
+
+    async def connect(self, timeout: Optional[float] = None) -> None:
+        return None
+
+    async def pause(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        deadline: Optional[float] = None,
+        wait_full_timeout: bool = False,
+        groups: Optional[Iterable[str]] = None,
+    ) -> script_pb2.PauseResponse:
+        request = _pause_request(timeout, wait_full_timeout, groups)
+        return await self._call(self._servicer.Pause, request, deadline)
+
+    async def resume(
+        self, *, deadline: Optional[float] = None, groups: Optional[Iterable[str]] = None
+    ):
+        request = script_pb2.ResumeRequest(groups=groups or ())
+        return await self._call(self._servicer.Resume, request, deadline)
+
+    async def stop(
+        self, drain_timeout: Optional[float] = None, *, deadline: Optional[float] = None
+    ) -> script_pb2.StopResponse:
+        return await self._call(self._servicer.Stop, _stop_request(drain_timeout), deadline)
+
+    async def get_metrics(self, *, deadline: Optional[float] = None) -> script_pb2.Metrics:
+        return await self._call(self._servicer.GetMetrics, empty_pb2.Empty(), deadline)
+
+    async def watch_state(
+        self, include_tasks: bool = True, min_interval: float = 0.0
+    ) -> AsyncIterator[script_pb2.ScriptState]:
+        request = script_pb2.WatchStateRequest(
+            include_tasks=include_tasks, min_interval_millis=int(min_interval * 1000)
+        )
+        async for state in self._servicer.WatchState(request, _InProcessContext()):
+            yield state
+
+    async def close(self) -> None:
+        return None
+
+    async def __aenter__(self) -> InProcessScriptClient:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class SyncScriptClient:
+    """
+    Blocking wrapper around `ScriptClient` for code that has no event loop (CLIs, supervisors, notebooks).
+
+    A private event loop runs in a daemon thread and owns the underlying channel; each method blocks until its
+    RPC completes. Accepts the same keyword arguments as `ScriptClient`.
+    """
+
+    def __init__(self, target: str, **kwargs):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name=f"ScriptClient({target})", daemon=True
+        )
+        self._thread.start()
+        self._client = ScriptClient(target, **kwargs)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def connect(self, timeout: Optional[float] = None) -> None:
+        self._run(self._client.connect(timeout))
+
+    def pause(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        deadline: Optional[float] = None,
+        wait_full_timeout: bool = False,
+        groups: Optional[Iterable[str]] = None,
+    ) -> script_pb2.PauseResponse:
+        return self._run(
+            self._client.pause(
+                timeout, deadline=deadline, wait_full_timeout=wait_full_timeout, groups=groups
+            )
+        )
+
+    def resume(self, *, deadline: Optional[float] = None, groups: Optional[Iterable[str]] = None):
+        return self._run(self._client.resume(deadline=deadline, groups=groups))
+
+    def stop(
+        self, drain_timeout: Optional[float] = None, *, deadline: Optional[float] = None
+    ) -> script_pb2.StopResponse:
+        return self._run(self._client.stop(drain_timeout, deadline=deadline))
+
+    def get_metrics(self, *, deadline: Optional[float] = None) -> script_pb2.Metrics:
+        return self._run(self._client.get_metrics(deadline=deadline))
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._run(self._client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> SyncScriptClient:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,213 @@
+"""Cooperative pause for blocking or CPU-bound work running in thread and process pools.
+
+Work submitted with `Pausable.run_in_executor(fn, *args, executor=...)` is called as `fn(token, *args)`.
+The worker polls `token.paused` (a plain attribute or shared-memory byte read) or calls `token.checkpoint()`
+at safe points. The awaiting coroutine on the event loop does the rest: it raises the token's flag when a
+pause applies to the task, waits for the worker to acknowledge at a checkpoint, then parks on the worker's
+behalf through `PausableController.handle_pause`, so `pause_cb`/`resume_cb`, metrics and `wait_all_paused`
+behave exactly as for an in-loop pause point. The worker is released only after `resume_cb` has run.
+
+```python
+def plan_path(token, goal):
+    for step in search(goal):
+        token.checkpoint()  # blocks here while the script is paused
+    return path
+
+path = await p.run_in_executor(plan_path, goal, executor=process_pool)
+```
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import mmap
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from .pausable import Pausable
+
+_T = TypeVar("_T")
+# Layout of the shared flag file: [0] hold requested by the loop, [1] parked acknowledged by the worker
+_HOLD, _PARKED = 0, 1
+# How often a process worker re-checks a held flag, and the loop a pending acknowledgement
+_POLL_INTERVAL = 0.001
+
+
+class PauseToken(abc.ABC):
+    """Handed to executor work as its first argument; poll `paused` or call `checkpoint()` at safe points."""
+
+    @property
+    @abc.abstractmethod
+    def paused(self) -> bool:
+        """True when a pause is pending and the worker should reach `checkpoint()` soon. Cheap to poll."""
+
+    @abc.abstractmethod
+    def checkpoint(self) -> None:
+        """Block while the work is paused; returns immediately otherwise."""
+
+    # Loop side
+    @abc.abstractmethod
+    def _hold(self) -> None:
+        """Ask the worker to block at its next checkpoint."""
+
+    @abc.abstractmethod
+    def _release(self) -> None:
+        """Let a held worker continue."""
+
+    @abc.abstractmethod
+    async def _wait_parked(self) -> None:
+        """Return once a held worker is blocked in `checkpoint()`."""
+
+    def _close(self) -> None:
+        """Free the token's resources once the awaiting coroutine is done with it."""
+
+
+class ThreadPauseToken(PauseToken):
+    """Token for thread pools. The flag is a plain attribute, read atomically under the GIL."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._held = False
+        self._released = threading.Event()
+        self._parked: Optional[asyncio.Future] = None
+
+    @property
+    def paused(self) -> bool:
+        return self._held
+
+    def checkpoint(self) -> None:
+        if self._held:
+            self._loop.call_soon_threadsafe(self._ack)
+            self._released.wait()
+
+    def _ack(self) -> None:
+        if self._parked is not None and not self._parked.done():
+            self._parked.set_result(None)
+
+    def _hold(self) -> None:
+        self._released.clear()
+        self._parked = self._loop.create_future()
+        self._held = True
+
+    def _release(self) -> None:
+        self._held = False
+        self._parked = None
+        self._released.set()
+
+    async def _wait_parked(self) -> None:
+        assert self._parked is not None
+        await asyncio.shield(self._parked)
+
+
+class SharedPauseToken(PauseToken):
+    """Token for process pools: the flag lives in a small memory-mapped file, so it survives pickling."""
+
+    def __init__(self):
+        directory = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        fd, self._path = tempfile.mkstemp(prefix="puppemon-pause-", dir=directory)
+        try:
+            os.ftruncate(fd, mmap.PAGESIZE)
+            self._map: Optional[mmap.mmap] = mmap.mmap(fd, mmap.PAGESIZE)
+        finally:
+            os.close(fd)
+        self._owner = True
+
+    def __getstate__(self):
+        return {"path": self._path}
+
+    def __setstate__(self, state):
+        self._path = state["path"]
+        self._owner = False
+        # Map the flag file as soon as the worker unpickles the job: the mapping stays valid once the loop side
+        # unlinks the file. A job that only starts after its awaiting coroutine gave up (cancelled while queued)
+        # finds the file gone and gets a private, never paused flag instead.
+        try:
+            with open(self._path, "r+b") as f:
+                self._map = mmap.mmap(f.fileno(), mmap.PAGESIZE)
+        except FileNotFoundError:
+            self._map = mmap.mmap(-1, mmap.PAGESIZE)
+
+    def _buffer(self) -> mmap.mmap:
+        if self._map is None:
+            raise RuntimeError("PauseToken is closed")
+        return self._map
+
+    @property
+    def paused(self) -> bool:
+        return self._buffer()[_HOLD] != 0
+
+    def checkpoint(self) -> None:
+        buf = self._buffer()
+        if buf[_HOLD]:
+            buf[_PARKED] = 1
+            while buf[_HOLD]:
+                time.sleep(_POLL_INTERVAL)
+            buf[_PARKED] = 0
+
+    def _hold(self) -> None:
+        self._buffer()[_HOLD] = 1
+
+    def _release(self) -> None:
+        self._buffer()[_HOLD] = 0
+
+    async def _wait_parked(self) -> None:
+        buf = self._buffer()
+        while not buf[_PARKED]:
+            await asyncio.sleep(_POLL_INTERVAL)
+
+    def _close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._owner:
+            os.unlink(self._path)
+
+
+async def run_in_executor(
+    pausable: Pausable, fn: Callable[..., _T], args: tuple, executor: Optional[Executor]
+) -> _T:
+    """Implementation of `Pausable.run_in_executor`."""
+    ctrl = pausable._ctrl
+    loop = asyncio.get_running_loop()
+    token: PauseToken = (
+        SharedPauseToken() if isinstance(executor, ProcessPoolExecutor) else ThreadPauseToken(loop)
+    )
+    try:
+        await pausable.maybe_pause()
+        fut: asyncio.Future = loop.run_in_executor(executor, fn, token, *args)
+        try:
+            while not fut.done():
+                if not ctrl._must_park(pausable._record):
+                    await asyncio.wait((fut, ctrl._pause_signal()), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                token._hold()
+                parked = asyncio.ensure_future(token._wait_parked())
+                try:
+                    # Until the worker acknowledges, a resume or the work finishing ends the hold early
+                    while not (parked.done() or fut.done()) and ctrl._must_park(pausable._record):
+                        wake = ctrl._wake
+                        if wake is None:
+                            wake = ctrl._wake = asyncio.Event()
+                        waiter = asyncio.ensure_future(wake.wait())
+                        try:
+                            await asyncio.wait((fut, parked, waiter), return_when=asyncio.FIRST_COMPLETED)
+                        finally:
+                            waiter.cancel()
+                    if parked.done() and not fut.done():
+                        # The worker is blocked in checkpoint(): park on its behalf, resume_cb included
+                        await ctrl.handle_pause(pausable)
+                finally:
+                    parked.cancel()
+                    token._release()
+            return fut.result()
+        finally:
+            if not fut.done():
+                fut.cancel()
+    finally:
+        token._close()
@@ -0,0 +1,154 @@
+"""Fan control commands out to many script servers over pooled, long-lived channels."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import grpc
+
+from .client import ScriptClient, pause_report
+from .generated import script_pb2
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    """Outcome of one command against one script server."""
+
+    target: str
+    code: grpc.StatusCode
+    details: str = ""
+    # Seconds from dispatch to completion; 0 when the call was never sent
+    latency: float = 0.0
+    # Per-task report of a pause, also when it failed with one (see `client.pause_report`)
+    pause_report: Optional[script_pb2.PauseResponse] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.code == grpc.StatusCode.OK
+
+
+class ScriptFleet:
+    """
+    Gateway to N script servers (each one a `default_main` process on its own port).
+
+    Each target is served by a `ScriptClient`, whose channel is opened lazily on first use and kept until
+    `close()`, so repeated commands don't pay a TCP + HTTP/2 handshake. Commands are dispatched concurrently,
+    bounded by `max_concurrency`, and share one deadline: a call that is still queued when the deadline
+    passes is reported as DEADLINE_EXCEEDED without being sent.
+
+    ```python
+    async with ScriptFleet(["localhost:51052", "localhost:51053"]) as fleet:
+        results = await fleet.pause(timeout=2.0, deadline=3.0)
+        failed = [r for r in results.values() if not r.ok]
+    ```
+    """
+
+    def __init__(
+        self,
+        targets: Iterable[str] = (),
+        *,
+        max_concurrency: int = 64,
+        **client_kwargs,
+    ):
+        """
+        Args:
+            targets: `host:port` (or any gRPC target string) of each script server.
+            max_concurrency: Maximum number of RPCs in flight at once.
+            client_kwargs: Forwarded to every `ScriptClient` (keepalive, retries, channel options).
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._client_kwargs = client_kwargs
+        self._clients: Dict[str, ScriptClient] = {}
+        for target in targets:
+            self.add_target(target)
+        self._max_concurrency = max_concurrency
+
+    @property
+    def targets(self) -> Tuple[str, ...]:
+        return tuple(self._clients)
+
+    def add_target(self, target: str) -> None:
+        if target not in self._clients:
+            self._clients[target] = ScriptClient(target, **self._client_kwargs)
+
+    async def remove_target(self, target: str) -> None:
+        client = self._clients.pop(target, None)
+        if client is not None:
+            await client.close()
+
+    async def pause(
+        self,
+        timeout: Optional[float] = None,
+        *,
+        deadline: Optional[float] = None,
+        wait_full_timeout: bool = False,
+        groups: Optional[Iterable[str]] = None,
+    ) -> Dict[str, FleetResult]:
+        """Pause every target. `timeout` is the per-script pause timeout, `deadline` bounds the whole fan-out."""
+        return await self._fan_out(
+            lambda c, t: c.pause(
+                timeout, deadline=t, wait_full_timeout=wait_full_timeout, groups=groups
+            ),
+            deadline,
+        )
+
+    async def resume(
+        self, *, deadline: Optional[float] = None, groups: Optional[Iterable[str]] = None
+    ) -> Dict[str, FleetResult]:
+        return await self._fan_out(lambda c, t: c.resume(deadline=t, groups=groups), deadline)
+
+    async def stop(
+        self, drain_timeout: Optional[float] = None, *, deadline: Optional[float] = None
+    ) -> Dict[str, FleetResult]:
+        """Stop every target, each draining its tasks for up to `drain_timeout` (see `ScriptClient.stop`)."""
+        return await self._fan_out(lambda c, t: c.stop(drain_timeout, deadline=t), deadline)
+
+    async def _fan_out(
+        self,
+        call: Callable[[ScriptClient, Optional[float]], Awaitable[object]],
+        deadline: Optional[float],
+    ) -> Dict[str, FleetResult]:
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline if deadline is not None else None
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def one(target: str, client: ScriptClient) -> FleetResult:
+            async with semaphore:
+                remaining = None
+                if expires_at is not None:
+                    remaining = expires_at - loop.time()
+                    if remaining <= 0:
+                        return FleetResult(target, grpc.StatusCode.DEADLINE_EXCEEDED, "not dispatched")
+                started = time.perf_counter()
+                try:
+                    response = await call(client, remaining)
+                except grpc.aio.AioRpcError as e:
+                    return FleetResult(
+                        target, e.code(), e.details() or "", time.perf_counter() - started, pause_report(e)
+                    )
+                except Exception as e:
+                    # Not an RPC failure (e.g. a malformed target or an OSError): still only this target failed
+                    return FleetResult(
+                        target, grpc.StatusCode.UNKNOWN, f"{type(e).__name__}: {e}", time.perf_counter() - started
+                    )
+                report = response if isinstance(response, script_pb2.PauseResponse) else None
+                return FleetResult(target, grpc.StatusCode.OK, "", time.perf_counter() - started, report)
+
+        clients = list(self._clients.items())
+        results = await asyncio.gather(*(one(t, c) for t, c in clients))
+        return {t: r for (t, _), r in zip(clients, results)}
+
+    async def close(self) -> None:
+        """Close every pooled channel; the fleet can still be used afterwards and reconnects lazily."""
+        await asyncio.gather(*(c.close() for c in self._clients.values()), return_exceptions=True)
+
+    async def __aenter__(self) -> ScriptFleet:
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
@@ -0,0 +1,213 @@
+"""Fixed-size, memory-mapped ring buffer of control events and pause-point hits.
+
+The writer is the script itself (`PausableController` and `ScriptServicer`); readers are external tools that
+map the same file read-only, so a post-mortem never needs an RPC or a stopped script:
+
+```bash
+python -m puppemon_py_script.journal /tmp/script.journal --tail 50
+```
+
+File layout (little endian):
+
+* header, `HEADER_SIZE` bytes: magic, the total number of records ever written (`write_count`, updated after
+  each record is complete), wall/monotonic clock anchors, version, record size, capacity and writer pid
+* `capacity` records of `RECORD_SIZE` bytes: monotonic timestamp (ns), kind, handle, value
+
+Record `i` (0-based, counting all records ever written) lives in slot `i % capacity`.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import List, Optional
+
+MAGIC = b"PPMJRNL1"
+VERSION = 1
+# magic, write_count, wall anchor ns, monotonic anchor ns, version, record_size, capacity, pid
+_HEADER = struct.Struct("<8sQqqHHII")
+HEADER_SIZE = 64
+# 8-byte aligned so the counter is published with a single aligned store
+_WRITE_COUNT_OFFSET = 8
+# monotonic ns, kind, reserved, handle, value
+_RECORD = struct.Struct("<QHHIQ")
+RECORD_SIZE = _RECORD.size
+_COUNT = struct.Struct("<Q")
+
+
+class EventKind(IntEnum):
+    PAUSE_REQUESTED = 1  # value: new generation
+    RESUMED = 2  # value: generation being resumed
+    STOPPING = 3
+    TASK_PARKED = 4  # handle, value: generation
+    TASK_UNPARKED = 5  # handle, value: generation
+    PAUSE_POINT_HIT = 6  # handle, value: generation
+    TASK_REGISTERED = 7  # handle, value: first 8 bytes of the task name
+    TASK_UNREGISTERED = 8  # handle
+    GROUP_PAUSE_REQUESTED = 9  # value: first 8 bytes of the group name
+    GROUP_RESUMED = 10  # value: first 8 bytes of the group name
+    RPC_PAUSE = 16  # value: requested timeout in ms
+    RPC_PAUSE_TIMED_OUT = 17  # value: generation rolled back
+    RPC_RESUME = 18
+    RPC_STOP = 19  # value: requested drain timeout in ms
+    RPC_PAUSE_REJECTED = 20  # value: number of tasks predicted to miss the timeout
+    STOP_CANCELLED = 21  # value: number of tasks cancelled away from a pause point
+
+
+@dataclass(frozen=True)
+class JournalRecord:
+    seq: int
+    monotonic_ns: int
+    wall_time_ns: int
+    kind: int
+    handle: int
+    value: int
+
+    @property
+    def kind_name(self) -> str:
+        try:
+            return EventKind(self.kind).name
+        except ValueError:
+            return f"UNKNOWN({self.kind})"
+
+    @property
+    def task_name(self) -> str:
+        """The (possibly truncated) task or group name carried by TASK_REGISTERED and GROUP_* records."""
+        return self.value.to_bytes(8, "little").rstrip(b"\0").decode("utf-8", "replace")
+
+
+def pack_name(name: str) -> int:
+    return int.from_bytes(name.encode("utf-8")[:8].ljust(8, b"\0"), "little")
+
+
+class EventJournal:
+    """Writer side. Appends are lock-free single-writer: the event loop thread is the only writer."""
+
+    def __init__(self, path: str, capacity: int = 65536):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.path = path
+        self.capacity = capacity
+        size = HEADER_SIZE + capacity * RECORD_SIZE
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, size)
+            self._mm = mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+        self._count = 0
+        self._pack_record = _RECORD.pack_into
+        # Native-endian u64 view of write_count; the header is little endian, so only use it when they agree
+        self._count_view = (
+            memoryview(self._mm)[_WRITE_COUNT_OFFSET : _WRITE_COUNT_OFFSET + 8].cast("Q")
+            if sys.byteorder == "little"
+            else None
+        )
+        _HEADER.pack_into(
+            self._mm, 0, MAGIC, 0, time.time_ns(), time.monotonic_ns(),
+            VERSION, RECORD_SIZE, capacity, os.getpid(),
+        )  # fmt: skip
+
+    def record(self, kind: int, handle: int = 0, value: int = 0) -> None:
+        count = self._count
+        self._pack_record(
+            self._mm,
+            HEADER_SIZE + (count % self.capacity) * RECORD_SIZE,
+            time.monotonic_ns(),
+            kind,
+            0,
+            handle & 0xFFFFFFFF,
+            value,
+        )
+        count += 1
+        self._count = count
+        # Publish only after the record is complete so readers never see a half-written slot as committed
+        if self._count_view is not None:
+            self._count_view[0] = count
+        else:
+            _COUNT.pack_into(self._mm, _WRITE_COUNT_OFFSET, count)
+
+    @property
+    def write_count(self) -> int:
+        return self._count
+
+    def flush(self) -> None:
+        self._mm.flush()
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            if self._count_view is not None:
+                # Exported buffers must be released before the map can be closed
+                self._count_view.release()
+                self._count_view = None
+            self._mm.flush()
+            self._mm.close()
+
+    def __enter__(self) -> EventJournal:
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_journal(path: str, last: Optional[int] = None) -> List[JournalRecord]:
+    """Decode the records still present in the ring, oldest first, from a live or dead script's journal.
+
+    Records the writer may have overwritten while they were being copied are dropped, so the result is a
+    consistent (if possibly slightly shorter) window. The oldest record of a full ring is always dropped: its
+    slot is the next one written.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, _, wall0, mono0, version, record_size, capacity, _pid = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {VERSION} puppemon journal")
+        end = _COUNT.unpack_from(mm, _WRITE_COUNT_OFFSET)[0]
+        start = max(0, end - capacity)
+        if last is not None:
+            start = max(start, end - last)
+        raw = [
+            _RECORD.unpack_from(mm, HEADER_SIZE + (seq % capacity) * RECORD_SIZE)
+            for seq in range(start, end)
+        ]
+        # Anything the writer lapped during the copy is no longer trustworthy, including the slot of record
+        # `end_after`, which the writer may be filling in before it publishes the count
+        end_after = _COUNT.unpack_from(mm, _WRITE_COUNT_OFFSET)[0]
+        first_valid = max(start, end_after - capacity + 1)
+    finally:
+        mm.close()
+    return [
+        JournalRecord(seq, mono, wall0 + (mono - mono0), kind, handle, value)
+        for seq, (mono, kind, _, handle, value) in zip(range(start, end), raw)
+        if seq >= first_valid
+    ]
+
+
+def _format(r: JournalRecord) -> str:
+    wall = time.strftime("%H:%M:%S", time.localtime(r.wall_time_ns / 1e9))
+    frac = (r.wall_time_ns // 1000) % 1_000_000
+    named = (EventKind.TASK_REGISTERED, EventKind.GROUP_PAUSE_REQUESTED, EventKind.GROUP_RESUMED)
+    detail = f"name={r.task_name!r}" if r.kind in named else f"value={r.value}"
+    return f"{r.seq:>10} {wall}.{frac:06d} {r.kind_name:<20} handle={r.handle:<8} {detail}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Decode a puppemon event journal")
+    parser.add_argument("path")
+    parser.add_argument("--tail", type=int, default=None, help="Only show the last N records")
+    args = parser.parse_args(argv)
+    for r in read_journal(args.path, last=args.tail):
+        print(_format(r))
+
+
+if __name__ == "__main__":
+    main()
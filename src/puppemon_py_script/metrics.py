@@ -0,0 +1,264 @@
+"""Low-overhead instrumentation for the controller and servicer, plus Prometheus text export.
+
+Nothing here is touched on the `maybe_pause` fast path except a per-task hit counter; histograms are only
+fed on the pause/resume slow path and by control RPCs.
+
+The Prometheus export aggregates tasks per pause group (tag), so the number of series stays bounded however
+many short-lived Pausables come and go. Series per task, labelled with its name and handle, are opt-in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .pausable import PausableController, TaskMetrics
+
+# Seconds; spans sub-millisecond pause points up to minute-long stragglers
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)  # fmt: skip
+
+
+class Histogram:
+    """Fixed-bucket histogram; `counts[i]` holds observations <= `bounds[i]`, the last slot is +Inf."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total, out = 0, []
+        for c in self.counts:
+            total += c
+            out.append(total)
+        return out
+
+
+class GroupTotals:
+    """Counters of the unregistered tasks of one pause group, so group counters never go down."""
+
+    __slots__ = ("hits", "parks", "paused_seconds")
+
+    def __init__(self):
+        self.hits = 0
+        self.parks = 0
+        self.paused_seconds = 0.0
+
+
+class ControllerMetrics:
+    """Aggregates recorded by `PausableController`; per-task counters live on the task records."""
+
+    __slots__ = ("pauses_total", "time_to_park", "pause_cb", "resume_cb", "resume_latency", "retired")
+
+    def __init__(self):
+        self.pauses_total = 0
+        self.time_to_park = Histogram()
+        self.pause_cb = Histogram()
+        self.resume_cb = Histogram()
+        # Resume request until a task left its pause point, resume_cb and resume slot wait included
+        self.resume_latency = Histogram()
+        # Per pause group ("" for untagged tasks), the counters of its tasks that have unregistered
+        self.retired: Dict[str, GroupTotals] = {}
+
+    def retire(self, groups: Iterable[str], hits: int, parks: int, paused_seconds: float) -> None:
+        """Keep the counters of a task that unregisters in the totals of its groups."""
+        for group in groups:
+            totals = self.retired.get(group)
+            if totals is None:
+                totals = self.retired[group] = GroupTotals()
+            totals.hits += hits
+            totals.parks += parks
+            totals.paused_seconds += paused_seconds
+
+
+class ServicerMetrics:
+    """Aggregates recorded by `ScriptServicer`."""
+
+    __slots__ = ("rpc_counts", "pause_rpc", "pauses_rejected", "pauses_coalesced")
+
+    def __init__(self):
+        self.rpc_counts: Counter = Counter()
+        self.pause_rpc = Histogram()
+        self.pauses_rejected = 0
+        self.pauses_coalesced = 0
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, help_text: str, h: Histogram) -> Iterable[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} histogram"
+    for bound, total in zip((*h.bounds, "+Inf"), h.cumulative()):
+        yield f'{name}_bucket{{le="{bound}"}} {total}'
+    yield f"{name}_sum {h.sum}"
+    yield f"{name}_count {h.count}"
+
+
+def _groups_of(task: TaskMetrics) -> Iterable[str]:
+    return task.tags or ("",)
+
+
+def _group_lines(tasks: List[TaskMetrics], retired: Dict[str, GroupTotals]) -> Iterable[str]:
+    members: Dict[str, List[TaskMetrics]] = {group: [] for group in retired}
+    for t in tasks:
+        for group in _groups_of(t):
+            members.setdefault(group, []).append(t)
+    groups = sorted(members)
+    yield "# HELP puppemon_group_tasks Registered tasks per pause group."
+    yield "# TYPE puppemon_group_tasks gauge"
+    for group in groups:
+        yield f'puppemon_group_tasks{{group="{_escape(group)}"}} {len(members[group])}'
+    for metric, help_text, attr in (
+        ("puppemon_group_pause_point_hits_total", "Pause point hits per pause group.", "hits"),
+        ("puppemon_group_parks_total", "Times a task of the pause group parked.", "parks"),
+        ("puppemon_group_paused_seconds_total", "Time tasks of the pause group spent parked.", "paused_seconds"),
+    ):
+        yield f"# HELP {metric} {help_text}"
+        yield f"# TYPE {metric} counter"
+        for group in groups:
+            totals = retired.get(group)
+            value = sum(getattr(t, attr) for t in members[group])
+            if totals is not None:
+                value += getattr(totals, attr)
+            yield f'{metric}{{group="{_escape(group)}"}} {value}'
+    for metric, help_text, attr in (
+        ("puppemon_group_max_time_to_park_seconds", "Slowest park in the pause group.", "max_time_to_park"),
+        (
+            "puppemon_group_pause_point_interval_seconds",
+            "Longest smoothed pause point interval in the pause group.", "interval",
+        ),
+        (
+            "puppemon_group_estimated_time_to_park_seconds",
+            "Longest expected time to the next pause point in the pause group.", "estimated_time_to_park",
+        ),
+        (
+            "puppemon_group_resume_latency_seconds",
+            "Slowest latency of the last resume in the pause group.", "resume_latency",
+        ),
+    ):  # fmt: skip
+        yield f"# HELP {metric} {help_text}"
+        yield f"# TYPE {metric} gauge"
+        for group in groups:
+            values = [v for v in (getattr(t, attr) for t in members[group]) if v is not None]
+            if values:
+                yield f'{metric}{{group="{_escape(group)}"}} {max(values)}'
+
+
+def _task_lines(tasks: List[TaskMetrics]) -> Iterable[str]:
+    for metric, kind, help_text, attr in (
+        ("puppemon_pause_point_hits_total", "counter", "Pause point hits per task.", "hits"),
+        ("puppemon_task_parks_total", "counter", "Times a task parked.", "parks"),
+        ("puppemon_task_paused_seconds_total", "counter", "Time spent parked.", "paused_seconds"),
+        ("puppemon_task_max_time_to_park_seconds", "gauge", "Slowest park.", "max_time_to_park"),
+        ("puppemon_pause_point_interval_seconds", "gauge", "Smoothed pause point interval.", "interval"),
+        (
+            "puppemon_estimated_time_to_park_seconds", "gauge",
+            "Expected time to the next pause point.", "estimated_time_to_park",
+        ),
+        ("puppemon_task_resume_latency_seconds", "gauge", "Latency of the last resume.", "resume_latency"),
+    ):  # fmt: skip
+        yield f"# HELP {metric} {help_text}"
+        yield f"# TYPE {metric} {kind}"
+        for t in tasks:
+            value = getattr(t, attr)
+            if value is None:
+                continue
+            labels = f'task="{_escape(t.name)}",handle="{t.handle}"'
+            yield f"{metric}{{{labels}}} {value}"
+
+
+def render_prometheus(
+    controller: PausableController, servicer_metrics: Optional[ServicerMetrics] = None, *, per_task: bool = False
+) -> str:
+    """Render controller (and optionally servicer) metrics in the Prometheus text exposition format.
+
+    Task metrics are aggregated per pause group, untagged tasks under `group=""`. `per_task` adds series per
+    task: every task ever registered then leaves a series behind, so only use it with a fixed set of tasks.
+    """
+    m = controller.metrics
+    lines = [
+        "# HELP puppemon_pause_generation Current pause generation.",
+        "# TYPE puppemon_pause_generation gauge",
+        f"puppemon_pause_generation {controller.generation}",
+        "# HELP puppemon_pauses_total Accepted pause requests.",
+        "# TYPE puppemon_pauses_total counter",
+        f"puppemon_pauses_total {m.pauses_total}",
+    ]
+    tasks = controller.task_metrics()
+    lines += _group_lines(tasks, m.retired)
+    if per_task:
+        lines += _task_lines(tasks)
+    lines += _histogram_lines(
+        "puppemon_time_to_park_seconds", "Time from pause request to a task parking.", m.time_to_park
+    )
+    lines += _histogram_lines("puppemon_pause_callback_seconds", "pause_cb duration.", m.pause_cb)
+    lines += _histogram_lines("puppemon_resume_callback_seconds", "resume_cb duration.", m.resume_cb)
+    lines += _histogram_lines(
+        "puppemon_resume_latency_seconds", "Resume request to a task leaving its pause point.", m.resume_latency
+    )
+    if servicer_metrics is not None:
+        lines.append("# HELP puppemon_rpc_requests_total Control RPCs received.")
+        lines.append("# TYPE puppemon_rpc_requests_total counter")
+        for method, count in sorted(servicer_metrics.rpc_counts.items()):
+            lines.append(f'puppemon_rpc_requests_total{{method="{method}"}} {count}')
+        lines.append("# HELP puppemon_pause_rejected_total Pauses rejected as predicted to time out.")
+        lines.append("# TYPE puppemon_pause_rejected_total counter")
+        lines.append(f"puppemon_pause_rejected_total {servicer_metrics.pauses_rejected}")
+        lines.append("# HELP puppemon_pause_coalesced_total Pauses that joined a pause already in flight.")
+        lines.append("# TYPE puppemon_pause_coalesced_total counter")
+        lines.append(f"puppemon_pause_coalesced_total {servicer_metrics.pauses_coalesced}")
+        lines += _histogram_lines(
+            "puppemon_pause_rpc_seconds", "Pause RPC handling time.", servicer_metrics.pause_rpc
+        )
+    return "\n".join(lines) + "\n"
+
+
+async def serve_prometheus(render: Callable[[], str], host: str, port: int) -> asyncio.AbstractServer:
+    """Serve `render()` as a minimal HTTP/1.0 scrape endpoint; any request path returns the metrics."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Drain the request head; the method and path are irrelevant for a scrape endpoint
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            body = render().encode()
+            writer.write(
+                b"HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def write_prometheus_file(render: Callable[[], str], path: str, interval: float = 15.0) -> None:
+    """Periodically rewrite `path` atomically, e.g. for the node_exporter textfile collector. Runs until
+    cancelled."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    while True:
+        started = time.monotonic()
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(render())
+        os.replace(tmp, path)
+        await asyncio.sleep(max(0.0, interval - (time.monotonic() - started)))
@@ -1,82 +1,569 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+import contextlib
+import itertools
+from asyncio import QueueEmpty
+from contextvars import ContextVar
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import (
+    AbstractSet, Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, FrozenSet, Iterable, Iterator,
+    List, Optional, Set, Tuple, TypeVar, Union, TYPE_CHECKING,
+)  # fmt: skip
+
+from .journal import EventJournal, EventKind, pack_name
+from .metrics import ControllerMetrics
+from .scheduler import ResumeScheduler
+
+if TYPE_CHECKING:
+    from .checkpoint import CheckpointLog
+
+_T = TypeVar("_T")
+
+# EWMA gains for the pause-point interval and its mean deviation (the RTT estimator constants of RFC 6298)
+_INTERVAL_GAIN = 0.125
+_JITTER_GAIN = 0.25
+# A task is only declared unable to park in time if it would miss even when this many mean deviations early
+_FAIL_FAST_JITTERS = 2.0
+
+# No checkpoint held in memory for the task
+_NO_CHECKPOINT: Any = object()
+_CHECKPOINT_PERSIST = ("pause_point", "pause")
+
+# Controller for Pausables created in the current context; overrides the process-wide default when set, so
+# several scripts can share one process. Tasks copy the context they are created in, hence inherit it.
+_current_controller: ContextVar[Optional[PausableController]] = ContextVar(
+    "puppemon_current_controller", default=None
+)
+# Pausable whose `with` block the current task is in; code that needs a pause point for the task, like
+# `pause_points`, uses it instead of registering the task a second time
+_current_pausable: ContextVar[Optional[Pausable]] = ContextVar("puppemon_current_pausable", default=None)
 
 
 class Pausable:
     """
     A non-singleton class that represents a point in the code that can be paused.
     Each instance can have its own pause and resume callbacks.
-    It relies on a central PausableController to manage the global pause/resume state.
+    It relies on a central PausableController to manage the global pause/resume state. The controller is
+    picked when the instance is created: the one set with `use_controller` for the current context, else the
+    process-wide one from `set_controller`.
     """
 
-    _controller: PausableController
+    __slots__ = (
+        "pause_cb", "resume_cb", "name", "_ctrl", "_handle", "_record", "_finalizer", "_entered", "__weakref__",
+    )  # fmt: skip
+
+    _controller: Optional[PausableController] = None
 
     @classmethod
     def set_controller(cls, controller):
         """Sets the central controller for all Pausable instances."""
         cls._controller = controller
 
-    def __init__(self, pause_cb=None, resume_cb=None, name: Optional[str] = None):
+    @classmethod
+    @contextlib.contextmanager
+    def use_controller(cls, controller: PausableController) -> Iterator[PausableController]:
+        """Scope `controller` to the current context, e.g. to host several scripts in one process.
+
+        Tasks created inside the block copy the context, so every Pausable they create binds to `controller`.
+
+        ```python
+        with Pausable.use_controller(PausableController()):
+            task = asyncio.create_task(user_main())
+        ```
+        """
+        token = _current_controller.set(controller)
+        try:
+            yield controller
+        finally:
+            _current_controller.reset(token)
+
+    @classmethod
+    def current_controller(cls) -> Optional[PausableController]:
+        """The controller a Pausable created here would use: context-scoped first, then process-wide."""
+        ctrl = _current_controller.get()
+        return ctrl if ctrl is not None else cls._controller
+
+    @classmethod
+    def current_pausable(cls) -> Optional[Pausable]:
+        """The Pausable whose `with` block the current task is in, if it is still registered."""
+        p = _current_pausable.get()
+        return p if p is not None and p._finalizer.alive else None
+
+    def __init__(
+        self,
+        pause_cb=None,
+        resume_cb=None,
+        name: Optional[str] = None,
+        tags: Iterable[str] = (),
+        priority: int = 0,
+    ):
         """
         Initializes a new Pausable instance.
 
         Args:
             pause_cb: An async function to be called when pausing.
             resume_cb: An async function to be called when resuming.
+            name: Human readable task name; defaults to the integer handle assigned by the controller.
+            tags: Groups this task belongs to. `PausableController.pause_groups` parks only the tasks tagged
+                with one of the paused groups; every task parks on a global `pause()`.
+            priority: Resume order under a resume policy (`PausableController.set_resume_policy`); higher
+                resumes first.
         """
-        self.pause_cb = pause_cb
-        self.resume_cb = resume_cb
-        self.name: str = name if name is not None else str(id(self))
-        if Pausable._controller is None:
+        ctrl = self.current_controller()
+        if ctrl is None:
             raise RuntimeError(
                 "PausableController has not been set. Please initialize it in your main entry point."
             )
-        # Auto-register this named task with the controller for coordination
-        if self.name:
-            type(self)._controller.register_task(self.name)
+        self.pause_cb = pause_cb
+        self.resume_cb = resume_cb
+        self._ctrl: PausableController = ctrl
+        # Auto-register with the controller for coordination; the handle is the controller-side identity
+        self._handle: int = ctrl.register_task(name, tags, priority)
+        self.name: str = name if name is not None else str(self._handle)
+        # Shared with the controller so the hit counter costs one attribute increment
+        self._record: _TaskRecord = ctrl._tasks[self._handle]
+        # Unregister from the controller that issued the handle, even if the global controller is swapped later
+        self._finalizer = weakref.finalize(self, ctrl.unregister_task, self._handle)
+        self._finalizer.atexit = False
+        # Token of `_current_pausable` while inside the `with` block
+        self._entered = None
+
+    @property
+    def tags(self) -> FrozenSet[str]:
+        return self._record.tags
+
+    def maybe_pause(self) -> Awaitable[None]:
+        """Cooperate with the controller to pause/resume when requested.
+
+        This is a plain method returning an awaitable, so `await p.maybe_pause()` keeps working. When no
+        pause is pending it hands back the controller's shared, already-completed future instead of
+        building a coroutine, which keeps the common "not paused" case down to an attribute check.
+        """
+        self._record.hits += 1
+        ctrl = self._ctrl
+        ready = ctrl._fast_path
+        if ready is not None:
+            return ready
+        return ctrl._slow_path(self)
+
+    def checkpoint(self, state: Any) -> Awaitable[None]:
+        """A pause point that also saves `state` as this task's checkpoint, read back with `restore()`.
+
+        Without a checkpoint log on the controller (`PausableController.attach_checkpoints`) this is just
+        `maybe_pause()`. Checkpoints are keyed by the task name, so give checkpointing tasks a stable `name`.
+
+        ```python
+        with Pausable(name="palletizer") as p:
+            done = p.restore(0)
+            for i in range(done, len(boxes)):
+                await place(boxes[i])
+                await p.checkpoint(i + 1)
+        ```
+        """
+        ctrl = self._ctrl
+        log = ctrl._checkpoints
+        if log is not None:
+            if ctrl._checkpoint_every_point:
+                log.write(self.name, state)
+            else:
+                self._record.checkpoint = state
+        return self.maybe_pause()
+
+    def restore(self, default: Any = None) -> Any:
+        """The latest checkpoint of this task, e.g. the one a previous run saved before it stopped, else
+        `default`."""
+        pending = self._record.checkpoint
+        if pending is not _NO_CHECKPOINT:
+            return pending
+        log = self._ctrl._checkpoints
+        return default if log is None else log.load(self.name, default)
+
+    def clear_checkpoint(self) -> None:
+        """Forget this task's checkpoint. Done on a normal exit of the `with` block, since a finished task has
+        nothing to continue after a restart."""
+        self._record.checkpoint = _NO_CHECKPOINT
+        log = self._ctrl._checkpoints
+        if log is not None:
+            log.delete(self.name)
+
+    # Pause-aware waits: each is a pause point that also parks as soon as a pause is requested mid-wait,
+    # instead of only once the wait is over. Time spent parked does not count against delays or timeouts.
+
+    async def sleep(self, delay: float) -> None:
+        """`asyncio.sleep(delay)` that parks immediately when a pause is requested, then sleeps the rest."""
+        ctrl = self._ctrl
+        await self.maybe_pause()
+        if delay <= 0:
+            # Like `asyncio.sleep(0)`, yield once: the pause point alone never does while no pause is pending
+            await asyncio.sleep(0)
+            return
+        loop = asyncio.get_running_loop()
+        remaining = delay
+        while remaining > 0:
+            started = loop.time()
+            signal = ctrl._pause_signal()
+            await asyncio.wait((signal,), timeout=remaining)
+            if not signal.done():
+                # Timed out: done. Re-deriving the rest from the clock can leave a sliver that never expires
+                return
+            remaining -= loop.time() - started
+            if ctrl._must_park(self._record):
+                await ctrl.handle_pause(self)
+
+    async def wait_for(self, aw: Awaitable[_T], timeout: Optional[float] = None) -> _T:
+        """`asyncio.wait_for(aw, timeout)` that parks immediately when a pause is requested.
+
+        The awaitable keeps running while the task is parked and its result is returned after the resume. It
+        is cancelled on timeout, or when the waiting task itself is cancelled.
+        """
+        ctrl = self._ctrl
+        fut = asyncio.ensure_future(aw)
+        loop = asyncio.get_running_loop()
+        remaining = timeout
+        try:
+            await self.maybe_pause()
+            while not fut.done():
+                started = loop.time()
+                signal = ctrl._pause_signal()
+                await asyncio.wait((fut, signal), timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if fut.done():
+                    break
+                if remaining is not None:
+                    remaining -= loop.time() - started
+                    if remaining <= 0 or not signal.done():
+                        raise asyncio.TimeoutError()
+                if ctrl._must_park(self._record):
+                    await ctrl.handle_pause(self)
+            return fut.result()
+        finally:
+            if not fut.done():
+                fut.cancel()
+
+    async def queue_get(self, queue: "asyncio.Queue[_T]") -> _T:
+        """`queue.get()` that parks immediately when a pause is requested while the queue is empty.
+
+        The pending get is cancelled while parked, so no item is taken off the queue for a parked task.
+        """
+        ctrl = self._ctrl
+        await self.maybe_pause()
+        while True:
+            try:
+                return queue.get_nowait()
+            except QueueEmpty:
+                pass
+            getter: "asyncio.Task[_T]" = asyncio.ensure_future(queue.get())
+            try:
+                await asyncio.wait((getter, ctrl._pause_signal()), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not getter.done():
+                    getter.cancel()
+            # Let a cancelled get unwind; it may still have completed with an item first
+            await asyncio.wait((getter,))
+            item: Any = None if getter.cancelled() else getter.result()
+            if ctrl._must_park(self._record):
+                await ctrl.handle_pause(self)
+            if not getter.cancelled():
+                return item
 
-    async def maybe_pause(self) -> None:
-        """Cooperate with the controller to pause/resume when requested."""
-        await type(self)._controller.handle_pause(self)
+    async def run_in_executor(self, fn: Callable[..., _T], *args: Any, executor: Optional[Any] = None) -> _T:
+        """Run `fn(token, *args)` in `executor` (a thread or process pool; None for the loop's default).
+
+        `token` is a `PauseToken`: the worker polls `token.paused` or calls `token.checkpoint()` at safe points
+        and blocks there while this task is paused. The awaiting task parks on the worker's behalf, so
+        `pause_cb`/`resume_cb` still run on the event loop, and the worker is released after `resume_cb`.
+        Work that never checks its token simply keeps running and the task counts as parked only once it ends.
+        """
+        from .executor import run_in_executor
+
+        return await run_in_executor(self, fn, args, executor)
+
+    def pause_points(self, fn: Optional[Callable[..., Any]] = None, *, min_interval: float = 0.0) -> Any:
+        """Decorate an `async def` so that every `await` in its body is a pause point of this Pausable.
+
+        ```python
+        @p.pause_points(min_interval=0.05)
+        async def cycle():
+            await xyz.straight_move_to(a, feedrate)
+            await xyz.straight_move_to(b, feedrate)
+        ```
+
+        Awaits closer than `min_interval` seconds to the previous pause point are not pause points. See
+        `puppemon_py_script.autopause` for what is and is not a pause point.
+        """
+        from .autopause import pause_points
+
+        return pause_points(fn, pausable=self, min_interval=min_interval)
+
+    # Pausable iteration for high-rate loops: a pause point per item (or per batch) without awaiting
+    # `maybe_pause()` each time. While no pause is pending the check is one attribute load.
+
+    async def iterate(self, src: Union[Iterable[_T], AsyncIterable[_T]]) -> AsyncIterator[_T]:
+        """Yield the items of `src`, a sync or async iterable, with a pause point before each item.
+
+        ```python
+        async for sample in p.iterate(sensor.stream()):
+            process(sample)
+        ```
+
+        Worst-case pause latency is the time to process one item (plus waiting for the next one from an async
+        source). Checking every item is already cheaper than counting items or reading a clock, so there is
+        nothing to amortize further here; use `iterate_batches` to also amortize the per-item generator cost.
+        """
+        ctrl = self._ctrl
+        record = self._record
+        if hasattr(src, "__aiter__"):
+            async for item in src:
+                record.hits += 1
+                if ctrl._fast_path is None:
+                    await ctrl._slow_path(self)
+                yield item
+        else:
+            for item in src:
+                record.hits += 1
+                if ctrl._fast_path is None:
+                    await ctrl._slow_path(self)
+                yield item
+
+    async def iterate_batches(
+        self,
+        src: Union[Iterable[_T], AsyncIterable[_T]],
+        size: int,
+        max_delay: Optional[float] = None,
+    ) -> AsyncIterator[List[_T]]:
+        """Yield lists of up to `size` items from `src` with one pause point per batch.
+
+        Args:
+            src: Sync or async iterable.
+            size: Items per batch; bounds the pause latency to one batch worth of processing.
+            max_delay: Also close a batch once this many seconds passed since its first item, which bounds
+                the pause latency in time when items arrive slowly. Checked as items arrive, so the clock is
+                only read when set.
+        """
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        ctrl = self._ctrl
+        record = self._record
+        clock = asyncio.get_running_loop().time if max_delay is not None else None
+        batch: List[_T] = []
+        closes_at = 0.0
+
+        async def _pause_point():
+            record.hits += 1
+            if ctrl._fast_path is None:
+                await ctrl._slow_path(self)
+
+        if hasattr(src, "__aiter__"):
+            async for item in src:
+                if clock is not None and not batch:
+                    closes_at = clock() + max_delay
+                batch.append(item)
+                if len(batch) >= size or (clock is not None and clock() >= closes_at):
+                    await _pause_point()
+                    yield batch
+                    batch = []
+        elif clock is None:
+            # Sync source without a time bound: slice whole batches at C speed
+            it = iter(src)
+            while True:
+                batch = list(itertools.islice(it, size))
+                if not batch:
+                    return
+                await _pause_point()
+                yield batch
+        else:
+            for item in src:
+                if not batch:
+                    closes_at = clock() + max_delay
+                batch.append(item)
+                if len(batch) >= size or clock() >= closes_at:
+                    await _pause_point()
+                    yield batch
+                    batch = []
+        if batch:
+            await _pause_point()
+            yield batch
 
     # Deterministic cleanup API (recommended)
     def close(self) -> None:
-        try:
-            ctrl = getattr(type(self), "_controller", None)
-            if ctrl is not None:
-                ctrl.unregister_task(self.name)
-        except Exception:
-            # Best-effort; never raise during cleanup
-            pass
+        """Unregister from the controller now. Safe to call more than once."""
+        self._finalizer()
 
     def __enter__(self):
+        self._entered = _current_pausable.set(self)
         return self
 
     def __exit__(self, exc_type, exc, tb):
         """
-        Context manager support for automatic cleanup, which is better than relying on __del__. `__del__` can be
-        called at unpredictable times, using a context manager ensures that resources are released deterministically.
+        Context manager support for deterministic cleanup. Without it the instance is unregistered by a
+        `weakref.finalize` hook when it is garbage collected, which can happen at unpredictable times.
 
         ```python
         with Pausable() as p:
             await do_something()
             await p.maybe_pause()
         ```
+
+        A normal exit also clears the task's checkpoint; leaving on an exception, cancellation included, keeps it.
         """
+        if exc_type is None and self._finalizer.alive:
+            self.clear_checkpoint()
         self.close()
+        token, self._entered = self._entered, None
+        if token is not None:
+            try:
+                _current_pausable.reset(token)
+            except ValueError:
+                # Left in another context than it was entered in; that context is gone anyway
+                pass
         return False
 
-    # Best-effort GC-time cleanup (not guaranteed timely)
-    def __del__(self):
-        try:
-            ctrl = getattr(type(self), "_controller", None)
-            if ctrl is not None:
-                ctrl.unregister_task(getattr(self, "name", None))
-        except Exception:
-            # Avoid issues during interpreter shutdown
-            pass
+
+class _TaskRecord:
+    """Controller-side bookkeeping for one registered Pausable."""
+
+    __slots__ = (
+        "name", "paused_generation", "parked",
+        "hits", "parks", "paused_seconds", "max_time_to_park",
+        "progress_at", "sampled_hits", "interval", "interval_jitter",
+        "tags", "group_generations", "priority", "resume_latency", "time_to_park", "pause_cb_seconds",
+        "checkpoint",
+    )  # fmt: skip
+
+    def __init__(self, name: str, now: float, tags: FrozenSet[str] = frozenset(), priority: int = 0):
+        self.name = name
+        self.tags = tags
+        self.priority = priority
+        # Seconds from the last resume request until this task left its pause point, resume_cb included
+        self.resume_latency = 0.0
+        # Last generation of each paused group this task parked in; allocated on the first group park
+        self.group_generations: Optional[Dict[str, int]] = None
+        # Last pause generation this task parked in; compared against the controller generation so that a
+        # new generation never needs to reset per-task state.
+        self.paused_generation = 0
+        self.parked = False
+        # Metrics: pause point hits, number of parks, total time parked, slowest pause-request-to-park
+        self.hits = 0
+        self.parks = 0
+        self.paused_seconds = 0.0
+        self.max_time_to_park = 0.0
+        # Last park: pause request until parked, and how long pause_cb took (None while it runs)
+        self.time_to_park = 0.0
+        self.pause_cb_seconds: Optional[float] = 0.0
+        # Latest `Pausable.checkpoint` state not written yet (persist="pause")
+        self.checkpoint: Any = _NO_CHECKPOINT
+        # Pause-point interval estimate, refreshed by `PausableController.sample_intervals` rather than on every
+        # hit: clock time when `hits` was last seen advancing, the hit count at that time, and the EWMA of the
+        # interval and of its mean deviation (0 while unknown)
+        self.progress_at = now
+        self.sampled_hits = 0
+        self.interval = 0.0
+        self.interval_jitter = 0.0
+
+
+class _PauseGroup:
+    """State of one tag used as a pause group; kept across pauses so generations keep counting up."""
+
+    __slots__ = ("generation", "expected", "paused_count", "all_paused", "requested_at")
+
+    def __init__(self):
+        self.generation = 0
+        # Members registered while the group is paused, and how many of them parked in this generation
+        self.expected = 0
+        self.paused_count = 0
+        self.all_paused = asyncio.Event()
+        self.requested_at = 0.0
+
+
+@dataclass(frozen=True)
+class TaskSnapshot:
+    handle: int
+    name: str
+    parked: bool
+    acked_generation: int
+    tags: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class TaskMetrics:
+    handle: int
+    name: str
+    hits: int
+    parks: int
+    paused_seconds: float
+    max_time_to_park: float
+    # EWMA of the time between two pause points and its mean deviation; 0 while unknown
+    interval: float = 0.0
+    interval_jitter: float = 0.0
+    # Expected seconds until the task reaches its next pause point; 0 when parked, None while unknown
+    estimated_time_to_park: Optional[float] = None
+    # Seconds from the last resume request until the task left its pause point, resume_cb included
+    resume_latency: float = 0.0
+    tags: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class TaskEstimate:
+    handle: int
+    name: str
+    parked: bool
+    interval: float
+    interval_jitter: float
+    # Seconds since the task was last seen passing a pause point
+    since_progress: float
+    # Expected seconds until the next pause point; 0 when parked, None while the interval is unknown
+    time_to_park: Optional[float]
+    # Optimistic bound used for fail-fast decisions; None while the interval is unknown
+    earliest_time_to_park: Optional[float]
+
+
+@dataclass(frozen=True)
+class TaskPauseReport:
+    handle: int
+    name: str
+    # Parked in the reported generation (of every selected group the task belongs to, for a group pause)
+    parked: bool
+    # Seconds from the pause request until the task parked; None if it has not parked
+    time_to_park: Optional[float]
+    # Duration of the task's pause_cb (0 without one); None while it still runs or if the task has not parked
+    pause_cb_seconds: Optional[float]
+    # Expected seconds until the next pause point of a task that has not parked; None while unknown
+    estimated_time_to_park: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class PauseReport:
+    """Per-task outcome of one pause, as returned by `PausableController.pause_report()`."""
+
+    generation: int
+    tasks: Tuple[TaskPauseReport, ...] = ()
+    # Generation of each selected group, for a group pause
+    group_generations: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def parked(self) -> Tuple[TaskPauseReport, ...]:
+        return tuple(t for t in self.tasks if t.parked)
+
+    @property
+    def stragglers(self) -> Tuple[TaskPauseReport, ...]:
+        return tuple(t for t in self.tasks if not t.parked)
+
+
+@dataclass(frozen=True)
+class ControllerSnapshot:
+    """Point-in-time view of the controller, as returned by `PausableController.snapshot()`."""
+
+    version: int
+    generation: int
+    # One of "running", "pausing", "paused", "stopping"
+    state: str
+    expected_tasks: int
+    paused_tasks: int
+    tasks: Tuple[TaskSnapshot, ...] = ()
+    # Groups paused with `pause_groups`, sorted
+    paused_groups: Tuple[str, ...] = ()
 
 
 class PausableController:
@@ -85,80 +572,583 @@ class PausableController:
     This object is intended to be a singleton, managed by the main script entrypoint.
     """
 
-    def __init__(self):
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            clock: Monotonic clock in seconds used for metrics and pause-point interval estimates.
+        """
+        self._clock = clock
         self._pause_requested = asyncio.Event()
-        self._resume_requested = asyncio.Event()
+        # Parked tasks wait on this event; it is replaced on every resume so they re-check whether to stay parked
+        self._wake: Optional[asyncio.Event] = None
+        # Resolved on the next pause or group pause, to interrupt the pause-aware waits of `Pausable`
+        self._pause_waiters: Optional[asyncio.Future] = None
         self._is_paused = False
+        # Completed future returned by `Pausable.maybe_pause` while no pause is pending; None otherwise
+        self._fast_path: Optional[asyncio.Future] = None
+        self._ready: Optional[asyncio.Future] = None
         # Tracking for pause "generations" and coordinated multi-task pause
         self._pause_generation = 0
+        # Tasks a pause waits for: `set_expected_tasks` if configured, else the tasks registered while it lasts
         self._expected_tasks = 0
-        self._paused_tasks: set[str] = set()
+        self._configured_expected = 0
+        # Number of distinct tasks parked in the current generation
+        self._paused_count = 0
         self._all_paused_event = asyncio.Event()
-        # Track active tasks seen by the controller (by name)
-        self._active_tasks: set[str] = set()
+        # Active tasks keyed by the integer handle handed out in `register_task`
+        self._tasks: Dict[int, _TaskRecord] = {}
+        self._next_handle = itertools.count(1)
+        # Handles of tasks parked right now, whatever the reason
+        self._parked: Set[int] = set()
+        # Pause groups: state per tag ever paused, the ones paused right now and tag -> member handles
+        self._groups: Dict[str, _PauseGroup] = {}
+        self._paused_groups: Set[str] = set()
+        self._members: Dict[str, Set[int]] = {}
+        self._resume_requested_at = 0.0
+        # Optional staggered resume, see `set_resume_policy`
+        self._resume_scheduler: Optional[ResumeScheduler] = None
+        self._stopping = False
+        # Change notification for watchers; the event is only allocated while someone is waiting
+        self._state_version = 0
+        self._state_changed: Optional[asyncio.Event] = None
+        self.metrics = ControllerMetrics()
+        self._pause_requested_at = 0.0
+        self._journal: Optional[EventJournal] = None
+        self._journal_hits = False
+        self._checkpoints: Optional[CheckpointLog] = None
+        self._checkpoint_every_point = True
 
     def pause(self):
-        """Called by an external entity (like a gRPC server) to request a pause."""
-        if not self._is_paused:
+        """Called by an external entity (like a gRPC server) to request a pause.
+
+        A no-op while a pause is already requested or in effect, so the generation only moves once per pause.
+        """
+        if not (self._is_paused or self._pause_requested.is_set()):
             self._pause_generation += 1
-            self._paused_tasks.clear()
+            self._paused_count = 0
             self._all_paused_event.clear()
-            # Auto-determine expected tasks if not explicitly configured
-            if self._expected_tasks <= 0:
-                self._expected_tasks = len(self._active_tasks)
+            # Auto-determine expected tasks if not explicitly configured; tasks registered or unregistered
+            # during the pause adjust it (see `register_task`)
+            self._expected_tasks = self._configured_expected or len(self._tasks)
             self._pause_requested.set()
+            self._fast_path = None
+            self._pause_requested_at = self._clock()
+            self.metrics.pauses_total += 1
+            if self._journal is not None:
+                self._journal.record(EventKind.PAUSE_REQUESTED, 0, self._pause_generation)
+            # Tasks already parked by a group pause acknowledge the new generation right away
+            for handle in self._parked:
+                self._ack_generation(self._tasks[handle], self._pause_requested_at)
+            self._interrupt_waits()
+            self._bump_state()
 
     def resume(self):
-        """Called by an external entity to request a resume."""
+        """Called by an external entity to request a resume. Paused groups stay paused."""
         if self._is_paused or self._pause_requested.is_set():
             # Allow paused tasks to proceed and ensure new calls won't re-enter pause immediately
-            self._resume_requested.set()
             self._pause_requested.clear()
+            self._rearm_fast_path()
+            if self._journal is not None:
+                self._journal.record(EventKind.RESUMED, 0, self._pause_generation)
+            self._resume_requested_at = self._clock()
+            self._wake_parked()
+            self._bump_state()
         self._is_paused = False
 
+    def pause_groups(self, groups: Iterable[str]) -> None:
+        """Pause only the tasks tagged with one of `groups`; every other task keeps running.
+
+        Each group has its own generation and its own all-paused state (see `wait_all_paused`). Pausing a group
+        that is already paused is a no-op. While any pause is active, untagged tasks leave `maybe_pause` through
+        the slow path, which costs a set lookup instead of an attribute check.
+        """
+        now = self._clock()
+        changed = False
+        for name in groups:
+            if name in self._paused_groups:
+                continue
+            group = self._groups.get(name)
+            if group is None:
+                group = self._groups[name] = _PauseGroup()
+            members = self._members.get(name, ())
+            group.generation += 1
+            group.expected = len(members)
+            group.paused_count = 0
+            group.all_paused.clear()
+            group.requested_at = now
+            self._paused_groups.add(name)
+            # Members already parked (by the global pause or another group) acknowledge right away
+            for handle in members:
+                record = self._tasks[handle]
+                if record.parked:
+                    self._ack_group(record, name, group, now)
+            if group.paused_count >= group.expected:
+                group.all_paused.set()
+            self.metrics.pauses_total += 1
+            if self._journal is not None:
+                self._journal.record(EventKind.GROUP_PAUSE_REQUESTED, 0, pack_name(name))
+            changed = True
+        if changed:
+            self._fast_path = None
+            self._interrupt_waits()
+            self._bump_state()
+
+    def resume_groups(self, groups: Iterable[str]) -> None:
+        """Resume the given groups. A task tagged with a group that is still paused, or caught by a global
+        pause, stays parked."""
+        changed = False
+        for name in groups:
+            if name in self._paused_groups:
+                self._paused_groups.discard(name)
+                if self._journal is not None:
+                    self._journal.record(EventKind.GROUP_RESUMED, 0, pack_name(name))
+                changed = True
+        if changed:
+            self._rearm_fast_path()
+            self._resume_requested_at = self._clock()
+            self._wake_parked()
+            self._bump_state()
+
+    def set_resume_policy(
+        self, max_concurrent: Optional[int] = None, rate: Optional[float] = None
+    ) -> None:
+        """Stagger resumes instead of waking every parked task at once.
+
+        Woken tasks leave their pause point in `Pausable` priority order, with at most `max_concurrent` of them
+        running their `resume_cb` at the same time and at most `rate` leaving per second. Both None restores
+        the default of resuming everything at once.
+        """
+        if max_concurrent is None and rate is None:
+            self._resume_scheduler = None
+        else:
+            self._resume_scheduler = ResumeScheduler(max_concurrent, rate)
+
+    @property
+    def resume_scheduler(self) -> Optional[ResumeScheduler]:
+        return self._resume_scheduler
+
+    @property
+    def paused_groups(self) -> AbstractSet[str]:
+        return frozenset(self._paused_groups)
+
+    def group_generation(self, group: str) -> int:
+        """Number of times `group` has been paused."""
+        state = self._groups.get(group)
+        return state.generation if state is not None else 0
+
+    def _rearm_fast_path(self) -> None:
+        if not (self._journal_hits or self._pause_requested.is_set() or self._paused_groups):
+            self._fast_path = self._ready
+
+    def _pause_signal(self) -> asyncio.Future:
+        """Future resolved by the next pause request; shared by every pause-aware wait."""
+        signal = self._pause_waiters
+        if signal is None:
+            signal = self._pause_waiters = asyncio.get_running_loop().create_future()
+        return signal
+
+    def _interrupt_waits(self) -> None:
+        signal, self._pause_waiters = self._pause_waiters, None
+        if signal is not None:
+            signal.set_result(None)
+
+    def _wake_parked(self) -> None:
+        wake, self._wake = self._wake, None
+        if wake is not None:
+            wake.set()
+
+    def _must_park(self, record: Optional[_TaskRecord]) -> bool:
+        if self._pause_requested.is_set():
+            return True
+        return (
+            record is not None
+            and bool(self._paused_groups)
+            and not record.tags.isdisjoint(self._paused_groups)
+        )
+
+    def _ack_generation(self, record: _TaskRecord, now: float) -> None:
+        """Count `record` as parked in the current global generation (once per generation)."""
+        if record.paused_generation != self._pause_generation:
+            record.paused_generation = self._pause_generation
+            self._paused_count += 1
+            self._observe_time_to_park(record, now - self._pause_requested_at)
+            if self._expected_tasks > 0 and self._paused_count >= self._expected_tasks:
+                self._all_paused_event.set()
+
+    def _ack_group(self, record: _TaskRecord, name: str, group: _PauseGroup, now: float) -> None:
+        """Count `record` as parked in the current generation of group `name` (once per generation)."""
+        acked = record.group_generations
+        if acked is None:
+            acked = record.group_generations = {}
+        if acked.get(name) != group.generation:
+            acked[name] = group.generation
+            group.paused_count += 1
+            self._observe_time_to_park(record, now - group.requested_at)
+            if group.paused_count >= group.expected:
+                group.all_paused.set()
+
+    def _observe_time_to_park(self, record: _TaskRecord, time_to_park: float) -> None:
+        self.metrics.time_to_park.observe(time_to_park)
+        record.time_to_park = time_to_park
+        if time_to_park > record.max_time_to_park:
+            record.max_time_to_park = time_to_park
+
+    def set_stopping(self) -> None:
+        """Mark the script as stopping; reported to watchers, the pause state is left untouched."""
+        if not self._stopping:
+            self._stopping = True
+            if self._journal is not None:
+                self._journal.record(EventKind.STOPPING, 0, self._pause_generation)
+            self._bump_state()
+
+    def attach_journal(self, journal: Optional[EventJournal], record_hits: bool = False) -> None:
+        """Write control events (and optionally every pause-point hit) to `journal`; None detaches.
+
+        Recording hits routes every `maybe_pause` call through the slow path, so it costs a journal append per
+        call. Without it the fast path is untouched.
+        """
+        self._journal = journal
+        self._journal_hits = journal is not None and record_hits
+        self._fast_path = None
+        self._rearm_fast_path()
+
+    @property
+    def journal(self) -> Optional[EventJournal]:
+        return self._journal
+
+    def attach_checkpoints(self, log: Optional[CheckpointLog], persist: str = "pause_point") -> None:
+        """Save `Pausable.checkpoint` states to `log`, and restore from it; None detaches.
+
+        With `persist="pause_point"` every checkpoint is written when it is taken, so a crash loses nothing
+        past the last pause point. With `persist="pause"` only the latest state of each task is kept in memory
+        and written when the task parks, leaves, or on `flush_checkpoints`; a crash then goes back to the last
+        pause. States still held in memory are written to the previous log before it is detached.
+        """
+        if persist not in _CHECKPOINT_PERSIST:
+            raise ValueError(f"persist must be one of {_CHECKPOINT_PERSIST}, not {persist!r}")
+        self.flush_checkpoints()
+        self._checkpoints = log
+        self._checkpoint_every_point = persist == "pause_point"
+
+    @property
+    def checkpoints(self) -> Optional[CheckpointLog]:
+        return self._checkpoints
+
+    def flush_checkpoints(self) -> None:
+        """Write the checkpoints held in memory (`persist="pause"`) to the log."""
+        for r in self._tasks.values():
+            if r.checkpoint is not _NO_CHECKPOINT:
+                self._write_checkpoint(r)
+
+    def _write_checkpoint(self, record: _TaskRecord) -> None:
+        state = record.checkpoint
+        record.checkpoint = _NO_CHECKPOINT
+        if self._checkpoints is not None:
+            self._checkpoints.write(record.name, state)
+
     @property
     def is_paused(self) -> bool:
         return self._is_paused
 
+    @property
+    def is_stopping(self) -> bool:
+        return self._stopping
+
+    @property
+    def generation(self) -> int:
+        return self._pause_generation
+
+    @property
+    def state(self) -> str:
+        """Coarse run state: "running", "pausing", "paused" or "stopping"."""
+        if self._stopping:
+            return "stopping"
+        if self._pause_requested.is_set():
+            if self._expected_tasks > 0:
+                return "paused" if self._all_paused_event.is_set() else "pausing"
+            return "paused" if self._is_paused else "pausing"
+        return "running"
+
+    def snapshot(self, include_tasks: bool = True) -> ControllerSnapshot:
+        """Capture the current state; the per-task list is O(number of tasks) so it can be skipped."""
+        tasks: Tuple[TaskSnapshot, ...] = ()
+        if include_tasks:
+            tasks = tuple(
+                TaskSnapshot(handle, r.name, r.parked, r.paused_generation, r.tags)
+                for handle, r in self._tasks.items()
+            )
+        return ControllerSnapshot(
+            version=self._state_version,
+            generation=self._pause_generation,
+            state=self.state,
+            expected_tasks=self._expected_tasks,
+            paused_tasks=self._paused_count,
+            tasks=tasks,
+            paused_groups=tuple(sorted(self._paused_groups)),
+        )
+
+    def task_metrics(self) -> List[TaskMetrics]:
+        """Per-task counters for every registered task."""
+        now = self._clock()
+        return [
+            TaskMetrics(
+                handle, r.name, r.hits, r.parks, r.paused_seconds, r.max_time_to_park,
+                r.interval, r.interval_jitter, self._time_to_park(r, now), r.resume_latency, r.tags,
+            )  # fmt: skip
+            for handle, r in self._tasks.items()
+        ]
+
+    def pause_report(self, groups: Optional[Iterable[str]] = None) -> PauseReport:
+        """Which tasks parked in the current pause generation, how long each took and how long its pause_cb
+        ran, and the estimated time to park of the others. With `groups`, the current generation of each of
+        those groups and only their members. O(number of reported tasks)."""
+        now = self._clock()
+        selected = None if groups is None else set(groups)
+        group_generations = {}
+        if selected is not None:
+            group_generations = {
+                name: (self._groups[name].generation if name in self._groups else 0) for name in sorted(selected)
+            }
+        tasks = []
+        for handle, r in self._select(selected):
+            if selected is None:
+                parked = self._pause_generation > 0 and r.paused_generation == self._pause_generation
+            else:
+                acked = r.group_generations or {}
+                parked = all(acked.get(name) == group_generations[name] for name in r.tags & selected)
+            if parked:
+                tasks.append(TaskPauseReport(handle, r.name, True, r.time_to_park, r.pause_cb_seconds))
+            else:
+                tasks.append(TaskPauseReport(handle, r.name, False, None, None, self._time_to_park(r, now)))
+        return PauseReport(self._pause_generation, tuple(tasks), group_generations)
+
+    def sample_intervals(self) -> None:
+        """Fold the pause-point hits since the previous sample into each task's interval estimate.
+
+        `maybe_pause` only bumps a counter, so the interval between pause points is measured here, at sample
+        time, as elapsed time over hits. Resolution is therefore the sampling period, which is plenty to tell
+        a task that passes a pause point every few milliseconds from one that is minutes away from the next.
+        O(number of tasks); call it periodically (`run_interval_sampler`) and before predicting.
+        """
+        now = self._clock()
+        for r in self._tasks.values():
+            hits = r.hits
+            if hits == r.sampled_hits or r.parked:
+                continue
+            interval = (now - r.progress_at) / (hits - r.sampled_hits)
+            if r.interval == 0.0:
+                r.interval = interval
+                r.interval_jitter = interval / 2
+            else:
+                r.interval_jitter += _JITTER_GAIN * (abs(interval - r.interval) - r.interval_jitter)
+                r.interval += _INTERVAL_GAIN * (interval - r.interval)
+            r.progress_at = now
+            r.sampled_hits = hits
+
+    async def run_interval_sampler(self, period: float = 0.5) -> None:
+        """Call `sample_intervals` every `period` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(period)
+            self.sample_intervals()
+
+    @staticmethod
+    def _time_to_park(r: _TaskRecord, now: float) -> Optional[float]:
+        if r.parked:
+            return 0.0
+        if r.interval == 0.0:
+            return None
+        return max(0.0, r.interval - (now - r.progress_at))
+
+    def pause_estimates(self, groups: Optional[Iterable[str]] = None) -> List[TaskEstimate]:
+        """Per-task time-to-park predictions from the current interval estimates, optionally only for the
+        members of `groups`."""
+        now = self._clock()
+        estimates = []
+        for handle, r in self._select(groups):
+            since = now - r.progress_at
+            earliest = None
+            if r.parked:
+                earliest = 0.0
+            elif r.interval > 0.0:
+                earliest = max(0.0, r.interval - _FAIL_FAST_JITTERS * r.interval_jitter - since)
+            estimates.append(
+                TaskEstimate(
+                    handle, r.name, r.parked, r.interval, r.interval_jitter, since,
+                    self._time_to_park(r, now), earliest,
+                )  # fmt: skip
+            )
+        return estimates
+
+    def predict_stragglers(
+        self, within: float, groups: Optional[Iterable[str]] = None
+    ) -> List[TaskEstimate]:
+        """Return the tasks that make a pause completing within `within` seconds impossible, if any.
+
+        A task is a straggler when even an optimistic estimate puts its next pause point beyond `within`.
+        Stragglers are only returned when there are too many of them for the expected task count to be met.
+        Tasks with no interval estimate yet are given the benefit of the doubt. Run `sample_intervals` first
+        for a fresh prediction. With `groups`, only their members are considered and all of them must park.
+        """
+        estimates = self.pause_estimates(groups)
+        stragglers = [
+            e for e in estimates if e.earliest_time_to_park is not None and e.earliest_time_to_park > within
+        ]
+        if groups is not None:
+            expected = len(estimates)
+        else:
+            expected = self._configured_expected or len(self._tasks)
+        if not stragglers or len(estimates) - len(stragglers) >= expected:
+            return []
+        return sorted(stragglers, key=lambda e: e.earliest_time_to_park, reverse=True)
+
+    async def wait_for_change(self, version: int) -> int:
+        """Wait until the state version differs from `version` and return the new version.
+
+        Several changes that happen before the waiter runs are coalesced into one wake-up.
+        """
+        while self._state_version == version:
+            if self._state_changed is None:
+                self._state_changed = asyncio.Event()
+            await self._state_changed.wait()
+        return self._state_version
+
+    def _select(self, groups: Optional[Iterable[str]]) -> Iterable[Tuple[int, _TaskRecord]]:
+        if groups is None:
+            return self._tasks.items()
+        handles: Set[int] = set()
+        for name in groups:
+            handles |= self._members.get(name, set())
+        return ((handle, self._tasks[handle]) for handle in sorted(handles))
+
+    def _bump_state(self) -> None:
+        self._state_version += 1
+        changed = self._state_changed
+        if changed is not None:
+            self._state_changed = None
+            changed.set()
+
+    def _slow_path(self, pausable_instance: Pausable) -> Awaitable[None]:
+        """Resolve a `maybe_pause` call that could not take the fast path.
+
+        Either a pause is pending, or the shared completed future has not been created yet. It is created
+        lazily so the controller can still be constructed outside a running event loop. When pause-point hits
+        are journaled the fast path stays disarmed and every call lands here.
+        """
+        if self._journal_hits:
+            self._journal.record(
+                EventKind.PAUSE_POINT_HIT, pausable_instance._handle, self._pause_generation
+            )
+        if self._pause_requested.is_set() or (
+            self._paused_groups and not pausable_instance._record.tags.isdisjoint(self._paused_groups)
+        ):
+            return self.handle_pause(pausable_instance)
+        if self._ready is None:
+            self._ready = asyncio.get_running_loop().create_future()
+            self._ready.set_result(None)
+        self._rearm_fast_path()
+        return self._ready
+
     def set_expected_tasks(self, count: int) -> None:
         """Sets the expected number of cooperating tasks for coordinated pause.
 
-        If set to 0, coordinated waiting is effectively disabled.
+        If set to 0, every pause waits for the tasks registered while it is in effect.
         """
-        self._expected_tasks = max(0, int(count))
+        self._configured_expected = self._expected_tasks = max(0, int(count))
 
-    def register_task(self, name: str) -> None:
-        """Register a task name as active for coordination.
+    def register_task(
+        self, name: Optional[str] = None, tags: Iterable[str] = (), priority: int = 0
+    ) -> int:
+        """Register a task as active for coordination and return its integer handle.
 
-        This is called automatically by Pausable when a name is provided.
+        This is called automatically by Pausable on construction.
         """
-        if name:
-            self._active_tasks.add(name)
+        handle = next(self._next_handle)
+        tags = frozenset(tags)
+        record = self._tasks[handle] = _TaskRecord(
+            name if name is not None else str(handle), self._clock(), tags, priority
+        )
+        for tag in tags:
+            self._members.setdefault(tag, set()).add(handle)
+        # A task spawned during a pause parks at its first pause point; the pause is not complete before that
+        if self._pause_requested.is_set() and not self._configured_expected:
+            self._expected_tasks += 1
+            self._all_paused_event.clear()
+        for tag in tags & self._paused_groups:
+            group = self._groups[tag]
+            group.expected += 1
+            group.all_paused.clear()
+        if self._journal is not None:
+            self._journal.record(EventKind.TASK_REGISTERED, handle, pack_name(record.name))
+        self._bump_state()
+        return handle
 
-    def unregister_task(self, name: str) -> None:
-        """Unregister a task name when no longer active."""
-        if name:
-            self._active_tasks.discard(name)
+    def unregister_task(self, handle: int) -> None:
+        """Unregister a task handle when no longer active."""
+        if not isinstance(handle, int):
+            # Tasks used to be unregistered by name; a name would now be a silent no-op
+            raise TypeError(f"unregister_task takes the integer handle from register_task, not {handle!r}")
+        record = self._tasks.pop(handle, None)
+        if record is not None:
+            if record.checkpoint is not _NO_CHECKPOINT:
+                self._write_checkpoint(record)
+            self.metrics.retire(record.tags or ("",), record.hits, record.parks, record.paused_seconds)
+            self._parked.discard(handle)
+            for tag in record.tags:
+                members = self._members[tag]
+                members.discard(handle)
+                if not members:
+                    del self._members[tag]
+            # A task that leaves before parking no longer holds up the pause
+            if (
+                self._pause_requested.is_set()
+                and not self._configured_expected
+                and record.paused_generation != self._pause_generation
+            ):
+                self._expected_tasks -= 1
+                if self._paused_count >= self._expected_tasks:
+                    self._all_paused_event.set()
+            for tag in record.tags & self._paused_groups:
+                group = self._groups[tag]
+                if (record.group_generations or {}).get(tag) != group.generation:
+                    group.expected -= 1
+                    if group.paused_count >= group.expected:
+                        group.all_paused.set()
+            if self._journal is not None:
+                self._journal.record(EventKind.TASK_UNREGISTERED, handle)
+            self._bump_state()
 
-    async def wait_all_paused(self, timeout: Optional[float]) -> bool:
+    @property
+    def task_count(self) -> int:
+        """Number of currently registered tasks."""
+        return len(self._tasks)
+
+    async def wait_all_paused(
+        self, timeout: Optional[float], groups: Optional[Iterable[str]] = None
+    ) -> bool:
         """Wait until all expected tasks report paused for the current generation.
 
         Args:
             timeout: seconds to wait; None means indefinitely.
+            groups: wait for every member of these paused groups instead of the global pause; groups that are
+                not paused are ignored.
 
         Returns:
             True if all paused within timeout; False if timed out or coordination disabled.
         """
-        # If coordination not requested, treat as immediately satisfied
-        if self._expected_tasks <= 0:
+        if groups is not None:
+            events = [self._groups[g].all_paused for g in groups if g in self._paused_groups]
+        elif self._expected_tasks > 0:
+            events = [self._all_paused_event]
+        else:
+            # If coordination not requested, treat as immediately satisfied
+            events = []
+        pending = [e for e in events if not e.is_set()]
+        if not pending:
             return True
+        waiter = pending[0].wait() if len(pending) == 1 else asyncio.gather(*(e.wait() for e in pending))
         try:
-            if timeout is None:
-                await self._all_paused_event.wait()
-                return True
-            else:
-                await asyncio.wait_for(self._all_paused_event.wait(), timeout=timeout)
-                return True
+            await asyncio.wait_for(waiter, timeout=timeout)
+            return True
         except asyncio.TimeoutError:
             return False
 
@@ -167,24 +1157,89 @@ class PausableController:
         The core logic that checks for a pause request and manages the state.
         This is called by `Pausable.maybe_pause()`.
         """
+        if not (self._pause_requested.is_set() or self._paused_groups):
+            return
+        record = self._tasks.get(pausable_instance._handle)
+        if not self._must_park(record):
+            return
         if self._pause_requested.is_set():
             self._is_paused = True
 
-            # Mark this Pausable's task as paused for current generation
-            self._paused_tasks.add(pausable_instance.name)
-            if self._expected_tasks > 0 and len(self._paused_tasks) >= self._expected_tasks:
-                self._all_paused_event.set()
+        # Mark this Pausable's task as paused for the current global and/or group generations
+        clock = self._clock
+        parked_at = clock()
+        metrics = self.metrics
+        if record is not None:
+            record.parked = True
+            record.parks += 1
+            record.pause_cb_seconds = None if pausable_instance.pause_cb else 0.0
+            if record.checkpoint is not _NO_CHECKPOINT:
+                self._write_checkpoint(record)
+            self._parked.add(pausable_instance._handle)
+            if self._pause_requested.is_set():
+                self._ack_generation(record, parked_at)
+            if self._paused_groups:
+                for name in record.tags & self._paused_groups:
+                    self._ack_group(record, name, self._groups[name], parked_at)
+            if self._journal is not None:
+                self._journal.record(
+                    EventKind.TASK_PARKED, pausable_instance._handle, self._pause_generation
+                )
+            self._bump_state()
 
-            # Execute the specific instance's pause callback
-            if pausable_instance.pause_cb:
-                await pausable_instance.pause_cb()
+        # Execute the specific instance's pause callback
+        if pausable_instance.pause_cb:
+            started = clock()
+            await pausable_instance.pause_cb()
+            elapsed = clock() - started
+            metrics.pause_cb.observe(elapsed)
+            if record is not None:
+                record.pause_cb_seconds = elapsed
 
-            # Wait for the global resume signal
-            await self._resume_requested.wait()
-            self._resume_requested.clear()
+        # Wait until neither the global pause nor any of this task's groups holds it, then for a resume slot
+        scheduler = None
+        try:
+            while True:
+                while self._must_park(record):
+                    if self._wake is None:
+                        self._wake = asyncio.Event()
+                    await self._wake.wait()
+                scheduler = self._resume_scheduler
+                if scheduler is None:
+                    break
+                await scheduler.acquire(record.priority if record is not None else 0)
+                if not self._must_park(record):
+                    break
+                # Paused again while queued for a slot
+                scheduler.release()
+                scheduler = None
+        finally:
+            if record is not None:
+                unparked_at = clock()
+                record.parked = False
+                self._parked.discard(pausable_instance._handle)
+                record.paused_seconds += unparked_at - parked_at
+                # Time spent parked is not part of the pause-point interval
+                record.progress_at = unparked_at
+                record.sampled_hits = record.hits
+                if self._journal is not None:
+                    self._journal.record(
+                        EventKind.TASK_UNPARKED, pausable_instance._handle, self._pause_generation
+                    )
+                self._bump_state()
 
-            # Execute the specific instance's resume callback
+        # Execute the specific instance's resume callback
+        try:
             if pausable_instance.resume_cb:
+                started = clock()
                 await pausable_instance.resume_cb()
+                metrics.resume_cb.observe(clock() - started)
+        finally:
+            if scheduler is not None:
+                scheduler.release()
+        resume_latency = clock() - self._resume_requested_at
+        metrics.resume_latency.observe(resume_latency)
+        if record is not None:
+            record.resume_latency = resume_latency
 
-            self._is_paused = False
+        self._is_paused = False
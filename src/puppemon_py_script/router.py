@@ -0,0 +1,89 @@
+"""Host several scripts in one process behind one control server, routing each RPC by script ID.
+
+Each script keeps its own `PausableController` (scoped with `Pausable.use_controller`) and its own
+`ScriptServicer`, so pause state, metrics and journals stay per script. Clients pick a script with the
+`puppemon-script-id` call metadata, which `ScriptClient(target, script_id=...)` sends on every call.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+import grpc
+
+from .generated import script_pb2_grpc
+
+if TYPE_CHECKING:
+    from .script_servicer import ScriptServicer
+
+SCRIPT_ID_METADATA = "puppemon-script-id"
+# Trailing metadata key of the serialized `PauseResponse` sent with a failed Pause
+PAUSE_REPORT_METADATA = "puppemon-pause-report-bin"
+
+
+class ScriptRouter(script_pb2_grpc.ScriptServicer):
+    """
+    Script service that forwards every RPC to the `ScriptServicer` registered under the caller's script ID.
+
+    A call without a script ID is accepted while exactly one script is registered, so single-script clients
+    keep working. Unknown IDs fail with NOT_FOUND.
+
+    ```python
+    router = ScriptRouter()
+    router.add("conveyor", ScriptServicer(controller, task, stop_cb, kill_on_stop=False))
+    server, port = await start_server(router, "localhost:51052")
+    ```
+    """
+
+    def __init__(self):
+        self._scripts: Dict[str, ScriptServicer] = {}
+
+    @property
+    def script_ids(self) -> Tuple[str, ...]:
+        return tuple(self._scripts)
+
+    def add(self, script_id: str, servicer: ScriptServicer) -> None:
+        if script_id in self._scripts:
+            raise ValueError(f"Script {script_id!r} is already registered")
+        self._scripts[script_id] = servicer
+
+    def remove(self, script_id: str) -> Optional[ScriptServicer]:
+        return self._scripts.pop(script_id, None)
+
+    def get(self, script_id: str) -> Optional[ScriptServicer]:
+        return self._scripts.get(script_id)
+
+    async def _route(self, context) -> ScriptServicer:
+        script_id = None
+        for key, value in context.invocation_metadata() or ():
+            if key == SCRIPT_ID_METADATA:
+                script_id = value
+                break
+        if script_id is None:
+            if len(self._scripts) == 1:
+                return next(iter(self._scripts.values()))
+            await context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"{len(self._scripts)} scripts are served here; set the {SCRIPT_ID_METADATA} metadata",
+            )
+        servicer = self._scripts.get(script_id)
+        if servicer is None:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Unknown script {script_id!r}")
+        return servicer
+
+    async def Stop(self, request, context):  # noqa: N802 (gRPC naming)
+        return await (await self._route(context)).Stop(request, context)
+
+    async def Pause(self, request, context):  # noqa: N802
+        return await (await self._route(context)).Pause(request, context)
+
+    async def Resume(self, request, context):  # noqa: N802
+        return await (await self._route(context)).Resume(request, context)
+
+    async def WatchState(self, request, context):  # noqa: N802
+        servicer = await self._route(context)
+        async for state in servicer.WatchState(request, context):
+            yield state
+
+    async def GetMetrics(self, request, context):  # noqa: N802
+        return await (await self._route(context)).GetMetrics(request, context)
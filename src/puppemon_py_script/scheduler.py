@@ -0,0 +1,93 @@
+"""Staggered resume: hand out resume slots to woken tasks instead of letting every one run at once."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from typing import List, Optional, Tuple
+
+
+class ResumeScheduler:
+    """
+    Grants resume slots to parked tasks after a resume: highest priority first, at most `max_concurrent`
+    slots held at a time and at most `rate` grants per second.
+
+    A task holds its slot while its `resume_cb` runs, so the limit bounds concurrent resume callbacks, which
+    is where scripts typically hit shared backends. All tasks woken by the same resume enqueue before the
+    first grant, so priority ordering holds across them.
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, rate: Optional[float] = None):
+        """
+        Args:
+            max_concurrent: Maximum number of slots held at once; None for no limit.
+            rate: Maximum number of grants per second (a ramp instead of a burst); None for no limit.
+        """
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self._waiting: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._next_grant_at = 0.0
+        # Pending call_soon/call_later handle for `_dispatch`, so at most one is scheduled
+        self._dispatch_handle: Optional[asyncio.Handle] = None
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    async def acquire(self, priority: int = 0) -> None:
+        """Wait for a slot; higher `priority` is served first, ties in arrival order."""
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (-priority, next(self._seq), fut))
+        self._schedule(0.0)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # Granted just before the cancellation arrived: hand the slot on
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self._active -= 1
+        self._schedule(0.0)
+
+    def _schedule(self, delay: float) -> None:
+        if self._dispatch_handle is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if delay > 0:
+            self._dispatch_handle = loop.call_later(delay, self._dispatch)
+        else:
+            # Deferred by one loop iteration so every task woken by the same resume has enqueued
+            self._dispatch_handle = loop.call_soon(self._dispatch)
+
+    def _dispatch(self) -> None:
+        self._dispatch_handle = None
+        loop = asyncio.get_running_loop()
+        waiting = self._waiting
+        while True:
+            # Drop waiters cancelled while queued
+            while waiting and waiting[0][2].cancelled():
+                heapq.heappop(waiting)
+            if not waiting or (self.max_concurrent is not None and self._active >= self.max_concurrent):
+                return
+            if self.rate is not None:
+                now = loop.time()
+                if now < self._next_grant_at:
+                    self._schedule(self._next_grant_at - now)
+                    return
+                self._next_grant_at = max(now, self._next_grant_at) + 1.0 / self.rate
+            _, _, fut = heapq.heappop(waiting)
+            self._active += 1
+            fut.set_result(None)
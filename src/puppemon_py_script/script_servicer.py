@@ -2,12 +2,86 @@ import asyncio
 import os
 import signal
 import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import grpc
 import inspect
-from .generated import script_pb2_grpc
+from .generated import script_pb2, script_pb2_grpc
 from google.protobuf import empty_pb2
-from .pausable import PausableController
+from .journal import EventKind
+from .metrics import Histogram, ServicerMetrics, render_prometheus
+from .pausable import ControllerSnapshot, PausableController, PauseReport, TaskEstimate, TaskPauseReport
+from .router import PAUSE_REPORT_METADATA
+
+_RUN_STATES = {
+    "running": script_pb2.ScriptState.RUNNING,
+    "pausing": script_pb2.ScriptState.PAUSING,
+    "paused": script_pb2.ScriptState.PAUSED,
+    "stopping": script_pb2.ScriptState.STOPPING,
+}
+
+
+def _state_to_proto(snapshot: ControllerSnapshot) -> script_pb2.ScriptState:
+    return script_pb2.ScriptState(
+        version=snapshot.version,
+        generation=snapshot.generation,
+        state=_RUN_STATES.get(snapshot.state, script_pb2.ScriptState.RUN_STATE_UNSPECIFIED),
+        expected_tasks=snapshot.expected_tasks,
+        paused_tasks=snapshot.paused_tasks,
+        paused_groups=snapshot.paused_groups,
+        tasks=[
+            script_pb2.TaskState(
+                handle=t.handle,
+                name=t.name,
+                parked=t.parked,
+                acked_generation=t.acked_generation,
+                tags=sorted(t.tags),
+            )
+            for t in snapshot.tasks
+        ],
+    )
+
+
+def _stragglers_details(timeout: float, stragglers: List[TaskEstimate], limit: int = 5) -> str:
+    names = ", ".join(f"{e.name} (~{e.time_to_park:.1f}s to park)" for e in stragglers[:limit])
+    more = f" and {len(stragglers) - limit} more" if len(stragglers) > limit else ""
+    return f"pause cannot complete within {timeout:.3f}s: {names}{more}"
+
+
+def _histogram_to_proto(h: Histogram) -> script_pb2.Histogram:
+    return script_pb2.Histogram(bounds=h.bounds, bucket_counts=h.counts, count=h.count, sum=h.sum)
+
+
+def _task_report_to_proto(t: TaskPauseReport) -> script_pb2.TaskPauseReport:
+    return script_pb2.TaskPauseReport(
+        handle=t.handle,
+        name=t.name,
+        time_to_park_seconds=t.time_to_park,
+        pause_cb_seconds=t.pause_cb_seconds,
+        estimated_time_to_park_seconds=t.estimated_time_to_park,
+    )
+
+
+def _report_to_proto(report: PauseReport) -> script_pb2.PauseResponse:
+    return script_pb2.PauseResponse(
+        generation=report.generation,
+        group_generations=report.group_generations,
+        parked=[_task_report_to_proto(t) for t in report.parked],
+        stragglers=[_task_report_to_proto(t) for t in report.stragglers],
+    )
+
+
+class _PauseFlight:
+    """A pause operation in flight, shared by every Pause call with the same selector that arrives meanwhile."""
+
+    __slots__ = ("groups", "resumed", "task")
+
+    def __init__(self, groups: Optional[List[str]]):
+        self.groups: Optional[FrozenSet[str]] = frozenset(groups) if groups is not None else None
+        # Resolved by a Resume covering this selector while the flight still waits for its tasks
+        self.resumed: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Future] = None
 
 
 class ScriptServicer(script_pb2_grpc.ScriptServicer):
@@ -24,41 +98,260 @@ class ScriptServicer(script_pb2_grpc.ScriptServicer):
         self._user_stop_cb = user_stop_cb
         self._kill_on_stop = kill_on_stop
         self.terminating = False
+        self.metrics = ServicerMetrics()
+        # Pause operations in flight, by selector (None for a global pause)
+        self._pause_flights: Dict[Optional[FrozenSet[str]], _PauseFlight] = {}
+        self._stop: Optional[asyncio.Future] = None
+
+    @property
+    def controller(self) -> PausableController:
+        return self._pausable_controller
+
+    def _journal(self, kind: EventKind, value: int = 0) -> None:
+        journal = self._pausable_controller.journal
+        if journal is not None:
+            journal.record(kind, 0, value)
 
     async def Stop(self, request, context):  # noqa: N802 (gRPC naming)
         print("[DEBUG] ScriptServicer: Stop received")
-        self._user_main_task.cancel()
+        self.metrics.rpc_counts["Stop"] += 1
+        drain_ms = getattr(request, "drain_timeout_millis", 0) or 0
+        self._journal(EventKind.RPC_STOP, drain_ms)
+        # A Stop arriving while one is in progress gets its result instead of stopping again
+        if self._stop is None:
+            self._stop = asyncio.ensure_future(self._drain_stop(drain_ms / 1000.0))
+        response = await asyncio.shield(self._stop)
+        if self._kill_on_stop and not self.terminating:
+            self.terminating = True
+            add_done_callback = getattr(context, "add_done_callback", None)
+            if add_done_callback is not None:
+                # Terminate once the response has been sent
+                add_done_callback(lambda _: os.kill(os.getpid(), signal.SIGTERM))
+            else:
+                threading.Timer(0.1, lambda: os.kill(os.getpid(), signal.SIGTERM)).start()
+        return response
+
+    async def _drain_stop(self, drain: float) -> script_pb2.StopResponse:
+        """Park every task at its next pause point for at most `drain` seconds, then cancel the script.
+
+        Tasks parked by then are cancelled at their pause point and reported as drained. The others are
+        cancelled wherever they are. A drain is a pause, so `pause_cb` runs for every task that parks.
+        """
+        controller = self._pausable_controller
+        main = self._user_main_task
+        controller.set_stopping()
+        started = time.perf_counter()
+        if drain > 0 and not main.done():
+            controller.pause()
+            waiter = asyncio.ensure_future(controller.wait_all_paused(timeout=drain))
+            try:
+                await asyncio.wait((waiter, main), return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+        drain_seconds = time.perf_counter() - started
+        drained, cancelled = [], []
+        for t in controller.snapshot().tasks:
+            (drained if t.parked else cancelled).append(script_pb2.TaskRef(handle=t.handle, name=t.name))
+        # Save the checkpoints held in memory before the process may be terminated
+        controller.flush_checkpoints()
+        if not main.done():
+            self._journal(EventKind.STOP_CANCELLED, len(cancelled))
+            main.cancel()
+            # Let the cancelled tasks unwind, within what is left of the drain time
+            remaining = drain - (time.perf_counter() - started)
+            if remaining > 0:
+                await asyncio.wait((main,), timeout=remaining)
         if self._user_stop_cb:
             result = self._user_stop_cb()
             if inspect.isawaitable(result):
                 await result
-        if self._kill_on_stop and not self.terminating:
-            self.terminating = True
-            threading.Timer(0.1, lambda: os.kill(os.getpid(), signal.SIGTERM)).start()
-        return empty_pb2.Empty()
+        return script_pb2.StopResponse(drained=drained, cancelled=cancelled, drain_seconds=drain_seconds)
 
     async def Pause(self, request, context: grpc.ServicerContext):  # noqa: N802
         print("[DEBUG] ScriptServicer: Pause received")
-        self._pausable_controller.pause()
+        self.metrics.rpc_counts["Pause"] += 1
+        started = time.perf_counter()
+        timeout_ms = getattr(request, "timeout_millis", 0) or 0
+        self._journal(EventKind.RPC_PAUSE, timeout_ms)
+        # An empty selector pauses every task
+        groups = list(request.groups) or None
+        # Single flight: a Pause for the same selector arriving while one is in flight joins it and gets its
+        # result, instead of bumping the generation again or rolling back on its own timeout
+        key = frozenset(groups) if groups is not None else None
+        flight = self._pause_flights.get(key)
+        if flight is None:
+            flight = _PauseFlight(groups)
+            self._pause_flights[key] = flight
+            flight.task = asyncio.ensure_future(self._pause(request, flight))
+            flight.task.add_done_callback(lambda _, key=key, flight=flight: self._land(key, flight))
+        else:
+            self.metrics.pauses_coalesced += 1
+        # Shielded: a caller going away must not cancel the pause for the callers that joined it
+        code, details, response = await asyncio.shield(flight.task)
+        if code != grpc.StatusCode.OK:
+            # A non-OK status carries no response message, so the report travels in the trailers
+            context.set_trailing_metadata(((PAUSE_REPORT_METADATA, response.SerializeToString()),))
+            context.set_details(details)
+            context.set_code(code)
+        self.metrics.pause_rpc.observe(time.perf_counter() - started)
+        return response
 
-        # If a timeout is specified, schedule an auto-resume after the duration
+    def _land(self, key: Optional[FrozenSet[str]], flight: _PauseFlight) -> None:
+        if self._pause_flights.get(key) is flight:
+            del self._pause_flights[key]
+
+    async def _pause(
+        self, request, flight: _PauseFlight
+    ) -> Tuple[grpc.StatusCode, str, script_pb2.PauseResponse]:
+        """The pause operation behind one flight; its status and report are shared by every caller that joined
+        it."""
         timeout_ms = getattr(request, "timeout_millis", 0) or 0
+        controller = self._pausable_controller
+        groups = flight.groups
+        already_paused = (
+            controller.is_paused if groups is None else controller.paused_groups.issuperset(groups)
+        )
+
+        # Fail fast: if the observed pause-point intervals say some tasks cannot park before the timeout, reject
+        # now instead of blocking for the whole timeout and rolling back. The prediction is only made up front
+        # since it cannot get worse while waiting: a task's remaining time shrinks as fast as the timeout does.
+        if timeout_ms > 0 and not request.wait_full_timeout and not already_paused:
+            controller.sample_intervals()
+            stragglers = controller.predict_stragglers(timeout_ms / 1000.0, groups)
+            if stragglers:
+                self.metrics.pauses_rejected += 1
+                self._journal(EventKind.RPC_PAUSE_REJECTED, len(stragglers))
+                # Nothing was paused, so the report only lists the predicted stragglers
+                response = script_pb2.PauseResponse(
+                    generation=controller.generation,
+                    stragglers=[
+                        script_pb2.TaskPauseReport(
+                            handle=e.handle, name=e.name, estimated_time_to_park_seconds=e.time_to_park
+                        )
+                        for e in stragglers
+                    ],
+                )
+                return (
+                    grpc.StatusCode.DEADLINE_EXCEEDED,
+                    _stragglers_details(timeout_ms / 1000.0, stragglers),
+                    response,
+                )
+
+        if groups is None:
+            controller.pause()
+            generation = controller.generation
+        else:
+            # Only the groups paused by this request are rolled back on timeout
+            newly_paused = [g for g in groups if g not in controller.paused_groups]
+            controller.pause_groups(groups)
+            group_generations = {g: controller.group_generation(g) for g in newly_paused}
+
         # Try to coordinate and wait until all expected tasks have reached a pausable point
         # The controller will succeed immediately if not configured with an expected count
-        all_paused = await self._pausable_controller.wait_all_paused(
-            timeout=(timeout_ms / 1000.0) if timeout_ms > 0 else None
+        waiter = asyncio.ensure_future(
+            controller.wait_all_paused(timeout=(timeout_ms / 1000.0) if timeout_ms > 0 else None, groups=groups)
         )
-        # print(f"[DEBUG] all_paused: {all_paused}")
-        if not all_paused and timeout_ms > 0:
-            # Abort the pause per requirement and report timeout to client
-            self._pausable_controller.resume()
+        try:
+            await asyncio.wait((waiter, flight.resumed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+        # Taken before a rollback, which does not change who parked in this generation
+        response = _report_to_proto(controller.pause_report(groups))
+        if not waiter.done() or waiter.cancelled():
+            return grpc.StatusCode.ABORTED, "resumed before every task parked", response
+        if not waiter.result() and timeout_ms > 0:
+            # Abort the pause per requirement and report timeout to client. Only what this flight paused is
+            # rolled back, and only if no later pause has taken it over since
+            self._journal(EventKind.RPC_PAUSE_TIMED_OUT, controller.generation)
+            if groups is None:
+                if controller.generation == generation:
+                    controller.resume()
+            else:
+                held = {g for f in self._pause_flights.values() if f is not flight and f.groups for g in f.groups}
+                controller.resume_groups(
+                    g
+                    for g in newly_paused
+                    if controller.group_generation(g) == group_generations[g] and g not in held
+                )
             await asyncio.sleep(0)  # yield to let any paused tasks wake
-            context.set_details("pause timed out")
-            context.set_code(grpc.StatusCode.DEADLINE_EXCEEDED)
-
-        return empty_pb2.Empty()
+            return grpc.StatusCode.DEADLINE_EXCEEDED, "pause timed out", response
+        return grpc.StatusCode.OK, "", response
 
     async def Resume(self, request, context):  # noqa: N802
         print("[DEBUG] ScriptServicer: Resume received")
-        self._pausable_controller.resume()
+        self.metrics.rpc_counts["Resume"] += 1
+        self._journal(EventKind.RPC_RESUME)
+        if self._stop is not None and not self._stop.done():
+            # Draining tasks stay parked until they are cancelled
+            context.set_details("script is stopping")
+            context.set_code(grpc.StatusCode.FAILED_PRECONDITION)
+            return empty_pb2.Empty()
+        controller = self._pausable_controller
+        # Older clients send google.protobuf.Empty, which decodes as an empty selector
+        groups = list(getattr(request, "groups", ()))
+        if groups:
+            controller.resume_groups(groups)
+        else:
+            controller.resume_groups(controller.paused_groups)
+            controller.resume()
+        # Pauses still waiting for their tasks end now, rather than time out and roll back a later pause
+        for flight in self._pause_flights.values():
+            if not groups or (flight.groups is not None and not flight.groups.isdisjoint(groups)):
+                if not flight.resumed.done():
+                    flight.resumed.set_result(None)
         return empty_pb2.Empty()
+
+    async def WatchState(self, request, context):  # noqa: N802
+        """Stream the controller state: once immediately, then after every (coalesced) change."""
+        self.metrics.rpc_counts["WatchState"] += 1
+        controller = self._pausable_controller
+        include_tasks = bool(request.include_tasks)
+        min_interval = request.min_interval_millis / 1000.0
+        version = -1
+        while True:
+            await controller.wait_for_change(version)
+            snapshot = controller.snapshot(include_tasks=include_tasks)
+            version = snapshot.version
+            yield _state_to_proto(snapshot)
+            if min_interval > 0:
+                await asyncio.sleep(min_interval)
+
+    async def GetMetrics(self, request, context):  # noqa: N802
+        self.metrics.rpc_counts["GetMetrics"] += 1
+        controller = self._pausable_controller
+        controller.sample_intervals()
+        m = controller.metrics
+        return script_pb2.Metrics(
+            generation=controller.generation,
+            pauses_total=m.pauses_total,
+            tasks=[
+                script_pb2.TaskMetrics(
+                    handle=t.handle,
+                    name=t.name,
+                    hits=t.hits,
+                    parks=t.parks,
+                    paused_seconds=t.paused_seconds,
+                    max_time_to_park_seconds=t.max_time_to_park,
+                    pause_point_interval_seconds=t.interval,
+                    pause_point_interval_jitter_seconds=t.interval_jitter,
+                    estimated_time_to_park_seconds=t.estimated_time_to_park,
+                    resume_latency_seconds=t.resume_latency,
+                )
+                for t in controller.task_metrics()
+            ],
+            time_to_park_seconds=_histogram_to_proto(m.time_to_park),
+            pause_cb_seconds=_histogram_to_proto(m.pause_cb),
+            resume_cb_seconds=_histogram_to_proto(m.resume_cb),
+            resume_latency_seconds=_histogram_to_proto(m.resume_latency),
+            pause_rpc_seconds=_histogram_to_proto(self.metrics.pause_rpc),
+            rpc_counts=dict(self.metrics.rpc_counts),
+            pauses_rejected=self.metrics.pauses_rejected,
+            pauses_coalesced=self.metrics.pauses_coalesced,
+        )
+
+    def render_prometheus(self, per_task: bool = False) -> str:
+        """Controller and servicer metrics in the Prometheus text format, with series per task if `per_task`."""
+        self._pausable_controller.sample_intervals()
+        return render_prometheus(self._pausable_controller, self.metrics, per_task=per_task)
@@ -0,0 +1,396 @@
+"""Run a user script on a virtual clock to estimate its cycle time and pause behaviour in a fraction of wall time.
+
+`VirtualTimeEventLoop` never sleeps: whenever it would block waiting for the next timer it jumps its clock
+straight to it. A script that spends its time in `asyncio.sleep`, timeouts and pause-aware waits therefore runs
+minutes of script time in milliseconds, deterministically. Code between two awaits takes no virtual time, so
+model work that matters for timing (moves, IO) with sleeps.
+
+`simulate` runs `user_main` on such a loop with its own `PausableController`, driven by a simulated operator
+that pauses and resumes through an `InProcessScriptClient`, and reports:
+
+* cycle times: how long each run of `user_main` took (`cycles` runs back to back)
+* per task pause-point intervals (virtual time between hits, time parked excluded) and time to park
+* every pause trial and the worst-case pause latency (pause request until every task parked)
+
+```python
+report = simulate(user_main, duration=600, pause_every=30, pause_hold=5, pause_timeout=2)
+print(report.worst_pause_latency, report.speedup)
+```
+
+or from the command line: `python -m puppemon_py_script.simulation my_script:user_main --duration 600`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import itertools
+import selectors
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import grpc
+
+from .client import InProcessScriptClient
+from .journal import EventKind
+from .pausable import Pausable, PausableController
+from .script_servicer import ScriptServicer
+
+
+class _VirtualClockSelector(selectors.DefaultSelector):
+    """Selector that polls instead of blocking and, when idle, moves the virtual clock to the next timer."""
+
+    def __init__(self, start: float):
+        super().__init__()
+        self.now = start
+        self.next_timer: Callable[[], Optional[float]] = lambda: None
+
+    def select(self, timeout: Optional[float] = None):
+        ready = super().select(0)
+        if ready or timeout == 0:
+            return ready
+        if timeout is None:
+            # Nothing scheduled: only real IO (e.g. an executor thread finishing) can make progress
+            return super().select(None)
+        # Jump to the timer's exact deadline rather than adding `timeout`, so rounding does not accumulate
+        when = self.next_timer()
+        self.now = when if when is not None and when > self.now else self.now + timeout
+        return ready
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Selector event loop whose `time()` is virtual and jumps to the next timer instead of waiting for it.
+
+    Real IO and `call_soon_threadsafe` still work; they are polled whenever the loop is idle. Finding the next
+    timer reads the timer heap `_scheduled`, a private attribute of CPython's `asyncio.BaseEventLoop`; on an
+    implementation without it the loop refuses to start rather than never advancing its clock.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._virtual_clock = _VirtualClockSelector(start)
+        super().__init__(self._virtual_clock)
+        if not isinstance(getattr(self, "_scheduled", None), list):
+            self.close()
+            raise RuntimeError(
+                "VirtualTimeEventLoop needs the timer heap `_scheduled` of CPython's asyncio.BaseEventLoop"
+            )
+        self._virtual_clock.next_timer = self._next_timer
+
+    def _next_timer(self) -> Optional[float]:
+        # The loop's timer heap; cancelled handles still count, which at worst wakes the loop early
+        scheduled = self._scheduled
+        return scheduled[0].when() if scheduled else None
+
+    def time(self) -> float:
+        return self._virtual_clock.now
+
+
+@dataclass(frozen=True)
+class SimulatedTask:
+    """Pause-point timing of one Pausable over a simulation, in virtual seconds."""
+
+    handle: int
+    name: str
+    hits: int
+    mean_interval: float
+    max_interval: float
+    max_time_to_park: float
+
+
+@dataclass(frozen=True)
+class PauseTrial:
+    """One pause of the simulated operator."""
+
+    requested_at: float
+    # Pause request until every task parked; None when the pause was rejected, timed out or never finished
+    latency: Optional[float]
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class SimulationReport:
+    virtual_seconds: float
+    wall_seconds: float
+    cycle_times: Tuple[float, ...]
+    tasks: Tuple[SimulatedTask, ...]
+    pauses: Tuple[PauseTrial, ...]
+
+    @property
+    def worst_pause_latency(self) -> Optional[float]:
+        latencies = [p.latency for p in self.pauses if p.latency is not None]
+        return max(latencies) if latencies else None
+
+    @property
+    def speedup(self) -> float:
+        """Virtual seconds simulated per wall-clock second."""
+        return self.virtual_seconds / self.wall_seconds if self.wall_seconds > 0 else float("inf")
+
+    def task(self, name: str) -> SimulatedTask:
+        for t in self.tasks:
+            if t.name == name:
+                return t
+        raise KeyError(name)
+
+
+class _TimingRecorder:
+    """Stands in for an `EventJournal`, timestamping pause-point hits and parks on the controller clock."""
+
+    def __init__(self, controller: PausableController):
+        self._controller = controller
+        self._clock = controller._clock
+        self._pause_requested_at: Optional[float] = None
+        self.names: Dict[int, str] = {}
+        self.hits: Dict[int, int] = {}
+        # handle -> time of the last hit (or unpark); None while parked or before the first hit
+        self._last: Dict[int, Optional[float]] = {}
+        self._interval_sum: Dict[int, float] = {}
+        self._intervals: Dict[int, int] = {}
+        self.max_interval: Dict[int, float] = {}
+        self.max_time_to_park: Dict[int, float] = {}
+
+    def record(self, kind: int, handle: int = 0, value: int = 0) -> None:
+        now = self._clock()
+        if kind == EventKind.PAUSE_POINT_HIT:
+            self.hits[handle] = self.hits.get(handle, 0) + 1
+            last = self._last.get(handle)
+            if last is not None:
+                interval = now - last
+                self._interval_sum[handle] = self._interval_sum.get(handle, 0.0) + interval
+                self._intervals[handle] = self._intervals.get(handle, 0) + 1
+                if interval > self.max_interval.get(handle, 0.0):
+                    self.max_interval[handle] = interval
+            self._last[handle] = now
+        elif kind == EventKind.TASK_PARKED:
+            self._last[handle] = None
+            if self._pause_requested_at is not None:
+                time_to_park = now - self._pause_requested_at
+                if time_to_park > self.max_time_to_park.get(handle, 0.0):
+                    self.max_time_to_park[handle] = time_to_park
+        elif kind == EventKind.TASK_UNPARKED:
+            self._last[handle] = now
+        elif kind == EventKind.PAUSE_REQUESTED:
+            self._pause_requested_at = now
+        elif kind == EventKind.RESUMED:
+            self._pause_requested_at = None
+        elif kind == EventKind.TASK_REGISTERED:
+            self.names[handle] = self._controller._tasks[handle].name
+
+    def tasks(self) -> Tuple[SimulatedTask, ...]:
+        return tuple(
+            SimulatedTask(
+                handle=handle,
+                name=name,
+                hits=self.hits.get(handle, 0),
+                mean_interval=(
+                    self._interval_sum[handle] / self._intervals[handle] if self._intervals.get(handle) else 0.0
+                ),
+                max_interval=self.max_interval.get(handle, 0.0),
+                max_time_to_park=self.max_time_to_park.get(handle, 0.0),
+            )
+            for handle, name in self.names.items()
+        )
+
+
+async def _operate(
+    client: InProcessScriptClient,
+    main_task: asyncio.Future,
+    trials: List[PauseTrial],
+    first: float,
+    every: float,
+    hold: float,
+    timeout: Optional[float],
+    end: float,
+) -> None:
+    loop = asyncio.get_running_loop()
+    # Pauses go out on a fixed schedule; one still pending when the next is due delays it
+    for k in itertools.count():
+        due = first + k * every
+        if due >= end:
+            return
+        await asyncio.sleep(max(0.0, due - loop.time()))
+        requested_at = loop.time()
+        try:
+            await client.pause(timeout)
+        except asyncio.CancelledError:
+            # Unfinished at the end; unless the script simply finished, a task never parked
+            if not main_task.done():
+                trials.append(PauseTrial(requested_at, None, "not all tasks parked before the simulation ended"))
+            raise
+        except grpc.aio.AioRpcError as e:
+            trials.append(PauseTrial(requested_at, None, e.details()))
+        else:
+            trials.append(PauseTrial(requested_at, loop.time() - requested_at))
+            await asyncio.sleep(hold)
+            await client.resume()
+
+
+async def _simulate(
+    user_main: Callable,
+    duration: float,
+    cycles: Optional[int],
+    pause_every: Optional[float],
+    pause_hold: float,
+    pause_timeout: Optional[float],
+    first_pause: Optional[float],
+    sample_interval: float,
+    resume_concurrency: Optional[int],
+    resume_rate: Optional[float],
+) -> SimulationReport:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    controller = PausableController(clock=loop.time)
+    controller.set_resume_policy(resume_concurrency, resume_rate)
+    recorder = _TimingRecorder(controller)
+    controller.attach_journal(recorder, record_hits=True)
+    cycle_times: List[float] = []
+    trials: List[PauseTrial] = []
+
+    async def run_cycles():
+        n = 0
+        while cycles is None or n < cycles:
+            cycle_started = loop.time()
+            await user_main()
+            cycle_times.append(loop.time() - cycle_started)
+            n += 1
+
+    with Pausable.use_controller(controller):
+        main_task = asyncio.ensure_future(run_cycles())
+    helpers = []
+    if sample_interval > 0:
+        helpers.append(asyncio.ensure_future(controller.run_interval_sampler(sample_interval)))
+    if pause_every is not None:
+        client = InProcessScriptClient(ScriptServicer(controller, main_task, None, kill_on_stop=False))
+        first = started + (pause_every if first_pause is None else first_pause)
+        operator = _operate(
+            client, main_task, trials, first, pause_every, pause_hold, pause_timeout, started + duration
+        )
+        helpers.append(asyncio.ensure_future(operator))
+    try:
+        await asyncio.wait((main_task,), timeout=duration)
+    finally:
+        ended = loop.time()
+        for task in (main_task, *helpers):
+            task.cancel()
+        # Release parked tasks so they can unwind
+        controller.resume()
+        await asyncio.gather(main_task, *helpers, return_exceptions=True)
+    if not main_task.cancelled() and main_task.exception() is not None:
+        raise main_task.exception()
+    return SimulationReport(
+        virtual_seconds=ended - started,
+        wall_seconds=0.0,
+        cycle_times=tuple(cycle_times),
+        tasks=recorder.tasks(),
+        pauses=tuple(trials),
+    )
+
+
+def simulate(
+    user_main: Callable,
+    *,
+    duration: float,
+    cycles: Optional[int] = None,
+    pause_every: Optional[float] = None,
+    pause_hold: float = 0.0,
+    pause_timeout: Optional[float] = None,
+    first_pause: Optional[float] = None,
+    sample_interval: float = 0.5,
+    resume_concurrency: Optional[int] = None,
+    resume_rate: Optional[float] = None,
+    quiet: bool = True,
+) -> SimulationReport:
+    """Run `user_main` on a `VirtualTimeEventLoop` for up to `duration` virtual seconds.
+
+    Args:
+        user_main: The script's async main, as passed to `default_main`.
+        duration: Virtual seconds after which the script is cancelled.
+        cycles: Runs of `user_main`, back to back; None, the default as for `--cycles`, repeats until
+            `duration` (each run must await).
+        pause_every: Virtual seconds between the starts of two operator pauses; None never pauses.
+        pause_hold: How long each successful pause is held before the resume.
+        pause_timeout: Pause timeout sent with each pause; None waits until every task parked.
+        first_pause: When the first pause is sent; defaults to `pause_every`.
+        sample_interval: Pause-point interval sampling period, as `--sample-interval`; 0 disables it.
+        resume_concurrency: Resume policy, as `--resume-concurrency`.
+        resume_rate: Resume policy, as `--resume-rate`.
+        quiet: Swallow what the script and the servicer print.
+    """
+    loop = VirtualTimeEventLoop()
+    wall_started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+            report = loop.run_until_complete(
+                _simulate(
+                    user_main, duration, cycles, pause_every, pause_hold, pause_timeout, first_pause,
+                    sample_interval, resume_concurrency, resume_rate,
+                )
+            )  # fmt: skip
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+    return SimulationReport(
+        virtual_seconds=report.virtual_seconds,
+        wall_seconds=time.perf_counter() - wall_started,
+        cycle_times=report.cycle_times,
+        tasks=report.tasks,
+        pauses=report.pauses,
+    )
+
+
+def _format(report: SimulationReport) -> str:
+    lines = [
+        f"simulated {report.virtual_seconds:.3f}s in {report.wall_seconds:.3f}s wall ({report.speedup:.0f}x)"
+    ]
+    if report.cycle_times:
+        cycles = report.cycle_times
+        lines.append(
+            f"cycles: {len(cycles)}, mean {sum(cycles) / len(cycles):.3f}s, max {max(cycles):.3f}s"
+        )
+    lines.append(f"{'task':<24} {'hits':>8} {'interval mean':>14} {'interval max':>13} {'max to park':>12}")
+    for t in report.tasks:
+        lines.append(
+            f"{t.name:<24} {t.hits:>8} {t.mean_interval:>13.3f}s {t.max_interval:>12.3f}s"
+            f" {t.max_time_to_park:>11.3f}s"
+        )
+    if report.pauses:
+        failed = sum(1 for p in report.pauses if p.latency is None)
+        worst = report.worst_pause_latency
+        worst_text = f"{worst:.3f}s" if worst is not None else "n/a"
+        lines.append(f"pauses: {len(report.pauses)}, failed {failed}, worst-case latency {worst_text}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description="Simulate a user script on a virtual clock")
+    parser.add_argument("main", help="The script's async main as module:attribute, e.g. user_script:user_main")
+    parser.add_argument("--duration", type=float, default=60.0, help="Virtual seconds to simulate")
+    parser.add_argument("--cycles", type=int, default=None, help="Runs of main; default repeats until --duration")
+    parser.add_argument("--pause-every", type=float, default=None, help="Virtual seconds between pauses")
+    parser.add_argument("--pause-hold", type=float, default=1.0, help="Virtual seconds each pause is held")
+    parser.add_argument("--pause-timeout", type=float, default=None, help="Timeout sent with each pause")
+    parser.add_argument("--resume-concurrency", type=int, default=None)
+    parser.add_argument("--resume-rate", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    module_name, _, attribute = args.main.partition(":")
+    user_main = getattr(importlib.import_module(module_name), attribute or "user_main")
+    report = simulate(
+        user_main,
+        duration=args.duration,
+        cycles=args.cycles,
+        pause_every=args.pause_every,
+        pause_hold=args.pause_hold,
+        pause_timeout=args.pause_timeout,
+        resume_concurrency=args.resume_concurrency,
+        resume_rate=args.resume_rate,
+    )
+    print(_format(report))
+
+
+if __name__ == "__main__":
+    main()
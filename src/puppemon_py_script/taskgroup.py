@@ -0,0 +1,213 @@
+"""A bounded pool of pausable workers over a work queue, for fan-out workloads.
+
+```python
+async def inspect_part(p, part):
+    image = await camera.grab(part)
+    await p.maybe_pause()
+    return await classify(image)
+
+async with PausableTaskGroup(inspect_part, concurrency=8, name="inspect") as group:
+    for part in parts:
+        await group.put(part)
+# Every part was handled once the block exits
+```
+
+The group runs `concurrency` worker tasks, each with its own Pausable (`name-0`, `name-1`, ...) created and
+registered when the group is entered. Workers are therefore known to the controller before any pause can
+catch them and stay registered for the life of the group, however many items they handle. A worker takes the
+next item with `Pausable.queue_get`, which is a pause point, and calls `handler(p, item)` with its Pausable,
+so the handler can place pause points of its own. On a pause, dispatch stops first: idle workers park at
+once, and busy ones park at the handler's pause points or before they take their next item. No item is taken
+off the queue while the script is paused.
+
+Like `asyncio.TaskGroup`, the first handler error cancels the other workers and is raised when the block
+exits, and leaving the block on an exception or cancellation cancels the workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Iterable, List, Optional, TypeVar
+
+from .pausable import Pausable, _current_pausable
+
+_T = TypeVar("_T")
+
+
+class PausableTaskGroup(Generic[_T]):
+    """`concurrency` pausable workers running `handler(p, item)` for the items put on the group's queue."""
+
+    def __init__(
+        self,
+        handler: Callable[[Pausable, _T], Awaitable[Any]],
+        concurrency: int,
+        *,
+        name: Optional[str] = None,
+        tags: Iterable[str] = (),
+        priority: int = 0,
+        pause_cb: Optional[Callable[[], Awaitable[None]]] = None,
+        resume_cb: Optional[Callable[[], Awaitable[None]]] = None,
+        maxsize: int = 0,
+    ):
+        """
+        Args:
+            handler: Coroutine function called with the worker's Pausable and one item.
+            concurrency: Number of workers, i.e. items handled at the same time.
+            name: Prefix of the worker names; worker `i` is named `f"{name}-{i}"`. Defaults to "worker", but is
+                required when the controller keeps checkpoints: they are keyed by name, and a finished group
+                clears the checkpoints of its workers.
+            tags: Pause groups of every worker, see `Pausable`.
+            priority: Resume priority of every worker, see `Pausable`.
+            pause_cb: Called by each worker when it parks, see `Pausable`.
+            resume_cb: Called by each worker when it resumes, see `Pausable`.
+            maxsize: Bound of the work queue; `put` waits while it is full. 0 is unbounded.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self._handler = handler
+        self._concurrency = concurrency
+        self._name = name
+        self._tags = tuple(tags)
+        self._priority = priority
+        self._pause_cb = pause_cb
+        self._resume_cb = resume_cb
+        self._maxsize = maxsize
+        # Created on entry, on the running loop
+        self._queue: "Optional[asyncio.Queue[_T]]" = None
+        self._pausables: List[Pausable] = []
+        self._workers: List["asyncio.Task[None]"] = []
+        self._in_flight = 0
+        self._error: Optional[BaseException] = None
+        # Resolved by the first handler error, to stop `join` waiting for items that will never be handled
+        self._failed: Optional[asyncio.Future] = None
+        # Task running the `async with` body, cancelled on a handler error unless it is already exiting
+        self._parent: Optional[asyncio.Task] = None
+        self._parent_cancelled = False
+        self._exiting = False
+
+    @property
+    def pausables(self) -> List[Pausable]:
+        """The workers' Pausables, in worker order."""
+        return list(self._pausables)
+
+    @property
+    def in_flight(self) -> int:
+        """Items a handler is working on right now."""
+        return self._in_flight
+
+    @property
+    def pending(self) -> int:
+        """Items waiting in the queue."""
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def put(self, item: _T) -> None:
+        """Queue `item` for the next free worker; waits while a bounded queue is full."""
+        await self._open_queue().put(item)
+
+    def put_nowait(self, item: _T) -> None:
+        """Queue `item` for the next free worker; raises `asyncio.QueueFull` if a bounded queue is full."""
+        self._open_queue().put_nowait(item)
+
+    def _open_queue(self) -> "asyncio.Queue[_T]":
+        if self._queue is None or self._exiting:
+            raise RuntimeError("PausableTaskGroup only takes items inside its `async with` block")
+        if self._error is not None:
+            raise RuntimeError("PausableTaskGroup stopped after a handler error") from self._error
+        return self._queue
+
+    async def join(self) -> None:
+        """Wait until every item queued so far is handled; raises the first handler error, if any."""
+        if self._queue is None:
+            raise RuntimeError("PausableTaskGroup is not entered")
+        joined = asyncio.ensure_future(self._queue.join())
+        try:
+            await asyncio.wait((joined, self._failed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            joined.cancel()
+        if self._error is not None:
+            raise self._error
+
+    async def __aenter__(self) -> PausableTaskGroup[_T]:
+        if self._queue is not None:
+            raise RuntimeError("PausableTaskGroup can only be entered once")
+        name = self._name
+        if name is None:
+            ctrl = Pausable.current_controller()
+            if ctrl is not None and ctrl.checkpoints is not None:
+                raise ValueError("PausableTaskGroup needs a unique name when the controller keeps checkpoints")
+            name = "worker"
+        self._queue = asyncio.Queue(self._maxsize)
+        self._failed = asyncio.get_running_loop().create_future()
+        self._parent = asyncio.current_task()
+        # Register every worker before the first item is queued, so a pause can never miss one
+        self._pausables = [
+            Pausable(
+                pause_cb=self._pause_cb,
+                resume_cb=self._resume_cb,
+                name=f"{name}-{i}",
+                tags=self._tags,
+                priority=self._priority,
+            )
+            for i in range(self._concurrency)
+        ]
+        self._workers = [asyncio.ensure_future(self._work(p)) for p in self._pausables]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._exiting = True
+        if exc_type is asyncio.CancelledError and self._parent_cancelled:
+            # The body was cancelled by `_fail`, not from outside: raise the handler error instead
+            uncancel = getattr(self._parent, "uncancel", None)
+            if uncancel is not None:
+                uncancel()
+            exc_type = None
+        try:
+            if exc_type is None:
+                await self.join()
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            finished = exc_type is None and self._error is None
+            for p in self._pausables:
+                # Like leaving a `with Pausable()` block: only a group that handled everything forgets checkpoints
+                if finished:
+                    p.clear_checkpoint()
+                p.close()
+        return False
+
+    async def _work(self, p: Pausable) -> None:
+        queue = self._queue
+        assert queue is not None
+        # The worker task's own context: handlers calling `pause_points` functions pause through `p`
+        _current_pausable.set(p)
+        try:
+            while True:
+                item = await p.queue_get(queue)
+                self._in_flight += 1
+                try:
+                    await self._handler(p, item)
+                except Exception as e:
+                    self._fail(e)
+                    return
+                finally:
+                    self._in_flight -= 1
+                    queue.task_done()
+        finally:
+            # A worker that is gone must not hold up a pause until the group exits
+            p.close()
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is not None:
+            return
+        self._error = error
+        assert self._failed is not None
+        self._failed.set_result(None)
+        current = asyncio.current_task()
+        for worker in self._workers:
+            if worker is not current:
+                worker.cancel()
+        # A body blocked on `put` into a full queue would otherwise wait forever
+        if not self._exiting and self._parent is not None:
+            self._parent_cancelled = True
+            self._parent.cancel()
@@ -1,33 +1,280 @@
 import asyncio
 import argparse
+import functools
+import sys
 import grpc
-from typing import Callable
+from typing import Callable, Mapping, Optional, Tuple
 
-from puppemon_py_script import ScriptServicer, script_pb2_grpc
-from puppemon_py_script.pausable import Pausable, PausableController
+from .generated import script_pb2_grpc
+from .checkpoint import CheckpointLog
+from .journal import EventJournal
+from .metrics import serve_prometheus, write_prometheus_file
+from .pausable import Pausable, PausableController
+from .router import ScriptRouter
+from .script_servicer import ScriptServicer
 
+# Accept the keepalive pings sent by `ScriptClient` (every 30s by default) on idle connections
+SERVER_OPTIONS = [
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.min_ping_interval_without_data_ms", 10_000),
+]
 
-async def default_main(user_main: Callable, user_stop_cb: Callable):
+
+async def start_server(
+    servicer: script_pb2_grpc.ScriptServicer, address: str
+) -> Tuple[grpc.aio.Server, int]:
+    """Create, bind and start a control server for `servicer` (a `ScriptServicer` or a `ScriptRouter`).
+
+    `address` is any gRPC listen address: `localhost:51052`, `127.0.0.1:0`, or a Unix domain socket such as
+    `unix:/run/puppemon/script.sock` (same-host supervisors skip the TCP loopback stack entirely).
+
+    Returns:
+        The started server and the bound port (the chosen port for `:0`, non-zero for Unix sockets).
+    """
+    server = grpc.aio.server(options=SERVER_OPTIONS)
+    script_pb2_grpc.add_ScriptServicer_to_server(servicer, server)
+    port = server.add_insecure_port(address)
+    if port == 0:
+        raise RuntimeError(f"Failed to bind control server to {address}")
+    await server.start()
+    return server, port
+
+
+async def start_scripts(
+    scripts: Mapping[str, Tuple[Callable, Callable]], address: str
+) -> Tuple[grpc.aio.Server, int, ScriptRouter]:
+    """Start several scripts in this process behind one control server.
+
+    Every script gets its own `PausableController`, scoped to its main task with `Pausable.use_controller`,
+    and its own `ScriptServicer`; a `ScriptRouter` dispatches each RPC by script ID. Stopping one script
+    cancels its main task only, the process keeps serving the others.
+
+    Args:
+        scripts: Script ID -> (user_main, user_stop_cb), as passed to `default_main`.
+        address: Listen address, as for `start_server`.
+
+    Returns:
+        The started server, the bound port and the router, which maps script IDs to servicers.
+    """
+    router = ScriptRouter()
+    for script_id, (user_main, user_stop_cb) in scripts.items():
+        controller = PausableController()
+        with Pausable.use_controller(controller):
+            user_main_task = asyncio.create_task(user_main())
+        router.add(script_id, ScriptServicer(controller, user_main_task, user_stop_cb, kill_on_stop=False))
+    server, port = await start_server(router, address)
+    return server, port, router
+
+
+async def serve_scripts(
+    scripts: Mapping[str, Tuple[Callable, Callable]], address: str, *, sample_interval: float = 0.5
+) -> None:
+    """Run `start_scripts` and serve until the server terminates or this coroutine is cancelled.
+
+    ```python
+    scripts = {"left": (left_main, left_stop), "right": (right_main, right_stop)}
+    asyncio.run(serve_scripts(scripts, "localhost:51052"))
+    ```
+
+    Clients select a script with `ScriptClient(target, script_id="left")`.
+    """
+    server, _, router = await start_scripts(scripts, address)
+    print(f"Script server for {', '.join(router.script_ids)} started on {address}")
+    samplers = []
+    if sample_interval > 0:
+        samplers = [
+            asyncio.create_task(router.get(script_id).controller.run_interval_sampler(sample_interval))
+            for script_id in router.script_ids
+        ]
+    try:
+        await server.wait_for_termination()
+    except asyncio.CancelledError:
+        print("Server stopped by user")
+        await server.stop(0)
+    finally:
+        for sampler in samplers:
+            sampler.cancel()
+
+
+LOOP_CHOICES = ("asyncio", "uvloop", "auto")
+
+
+def new_event_loop(kind: str = "asyncio") -> asyncio.AbstractEventLoop:
+    """Create an event loop of the requested kind.
+
+    Args:
+        kind: "asyncio" for the stdlib loop, "uvloop" to require uvloop (the `uvloop` extra), or "auto" to
+            use uvloop when it is installed and fall back to the stdlib loop otherwise.
+    """
+    if kind not in LOOP_CHOICES:
+        raise ValueError(f"Unknown event loop {kind!r}, expected one of {LOOP_CHOICES}")
+    if kind != "asyncio":
+        try:
+            import uvloop
+        except ImportError:
+            if kind == "uvloop":
+                raise RuntimeError(
+                    "uvloop was requested but is not installed; pip install 'puppemon-py-script[uvloop]'"
+                ) from None
+        else:
+            return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
+
+
+def _arg_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--port", type=int, default=51052, help="Port for the gRPC server")
-    args = parser.parse_args()
+    parser.add_argument("--port", type=int, default=None, help="Port for the gRPC server (default 51052)")
+    parser.add_argument(
+        "--address",
+        default=None,
+        help="Listen address overriding --port, e.g. localhost:51052 or unix:/tmp/script.sock",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=None, help="Serve Prometheus metrics over HTTP on this port"
+    )
+    parser.add_argument(
+        "--metrics-file", default=None, help="Periodically write Prometheus metrics to this file"
+    )
+    parser.add_argument(
+        "--metrics-per-task",
+        action="store_true",
+        help="Also export metrics per task; only for scripts with a fixed set of tasks",
+    )
+    parser.add_argument(
+        "--journal",
+        default=None,
+        help="Memory-mapped event journal file, decode with `python -m puppemon_py_script.journal`",
+    )
+    parser.add_argument(
+        "--journal-capacity", type=int, default=65536, help="Journal ring size in records"
+    )
+    parser.add_argument(
+        "--journal-hits", action="store_true", help="Also journal every pause-point hit (slower)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Checkpoint log: tasks restore their last `Pausable.checkpoint` state from it on startup",
+    )
+    parser.add_argument(
+        "--checkpoint-persist",
+        choices=("pause_point", "pause"),
+        default="pause_point",
+        help="Write each checkpoint when it is taken, or only the latest one when its task parks",
+    )
+    parser.add_argument(
+        "--checkpoint-fsync", action="store_true", help="fsync every checkpoint, to survive a host crash"
+    )
+    parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.5,
+        help="Seconds between pause-point interval samples used to fail fast on hopeless pauses; 0 disables",
+    )
+    parser.add_argument(
+        "--resume-concurrency",
+        type=int,
+        default=None,
+        help="At most this many tasks run their resume callback at the same time after a resume",
+    )
+    parser.add_argument(
+        "--resume-rate", type=float, default=None, help="At most this many tasks resume per second"
+    )
+    parser.add_argument(
+        "--loop",
+        choices=LOOP_CHOICES,
+        default=None,
+        help="Event loop implementation, only honoured when started through `run_script`",
+    )
+    return parser
+
+
+async def default_main(user_main: Callable, user_stop_cb: Callable, *, address: Optional[str] = None):
+    args = _arg_parser().parse_args()
+    address = args.address or (f"localhost:{args.port}" if args.port is not None else address) or "localhost:51052"
 
     # Create and set the central controller
     pausable_controller = PausableController()
     Pausable.set_controller(pausable_controller)
+    pausable_controller.set_resume_policy(args.resume_concurrency, args.resume_rate)
+    journal = None
+    if args.journal:
+        journal = EventJournal(args.journal, capacity=args.journal_capacity)
+        pausable_controller.attach_journal(journal, record_hits=args.journal_hits)
+    checkpoints = None
+    if args.checkpoint:
+        # Attached before the user's main starts, so its tasks can restore from the previous run
+        checkpoints = CheckpointLog(args.checkpoint, fsync=args.checkpoint_fsync)
+        pausable_controller.attach_checkpoints(checkpoints, persist=args.checkpoint_persist)
 
     user_main_task = asyncio.create_task(user_main())
 
-    server = grpc.aio.server()
     servicer = ScriptServicer(pausable_controller, user_main_task, user_stop_cb)
-    script_pb2_grpc.add_ScriptServicer_to_server(servicer, server)
-    server.add_insecure_port(f"localhost:{args.port}")
+    server, _ = await start_server(servicer, address)
+    print(f"Script server started on {address}")
 
-    print(f"Script server started on localhost:{args.port}")
-    await server.start()
+    sampler = None
+    if args.sample_interval > 0:
+        sampler = asyncio.create_task(pausable_controller.run_interval_sampler(args.sample_interval))
+    metrics_http = None
+    metrics_writer = None
+    render_metrics = functools.partial(servicer.render_prometheus, per_task=args.metrics_per_task)
+    if args.metrics_port is not None:
+        metrics_http = await serve_prometheus(render_metrics, "localhost", args.metrics_port)
+        print(f"Metrics served on http://localhost:{args.metrics_port}/metrics")
+    if args.metrics_file:
+        metrics_writer = asyncio.create_task(write_prometheus_file(render_metrics, args.metrics_file))
 
     try:
         await server.wait_for_termination()
     except asyncio.CancelledError:
         print("Server stopped by user")
         await server.stop(0)
+    finally:
+        if sampler is not None:
+            sampler.cancel()
+        if metrics_writer is not None:
+            metrics_writer.cancel()
+        if metrics_http is not None:
+            metrics_http.close()
+        if journal is not None:
+            pausable_controller.attach_journal(None)
+            journal.close()
+        if checkpoints is not None:
+            pausable_controller.attach_checkpoints(None)
+            checkpoints.close()
+
+
+def run_script(
+    user_main: Callable,
+    user_stop_cb: Callable,
+    *,
+    loop: str = "asyncio",
+    address: Optional[str] = None,
+) -> None:
+    """Synchronous entry point: pick the event loop, then run `default_main` on it until it finishes.
+
+    `asyncio.run(default_main(...))` always uses the stdlib loop; this lets the loop be chosen with the `loop`
+    argument or the `--loop` command line flag (which wins).
+
+    ```python
+    if __name__ == "__main__":
+        run_script(user_main, user_stop_cb, loop="auto")
+    ```
+    """
+    kind = _arg_parser().parse_args().loop or loop
+    main = default_main(user_main, user_stop_cb, address=address)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=lambda: new_event_loop(kind)) as runner:
+            runner.run(main)
+        return
+    event_loop = new_event_loop(kind)
+    try:
+        asyncio.set_event_loop(event_loop)
+        event_loop.run_until_complete(main)
+    finally:
+        try:
+            event_loop.run_until_complete(event_loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            event_loop.close()